@@ -0,0 +1,120 @@
+"""
+Measures per-token cost of signing and verifying access tokens:
+PEM text passed to PyJWT on every call (key is parsed every time)
+against key ring's pre-parsed key objects, and verification of
+repeated token served by verified tokens cache. With --algorithms
+compares ops/sec of each supported algorithm on temporary keys
+"""
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter, time
+
+import jwt
+
+from config import settings
+from generate_env import JWT_ALGORITHMS, generate_jwt_keys
+
+from files.apps.user.utils import jwt_actions_util
+from files.apps.user.utils.jwt_actions_util import JWTActionsUtil, JWTKeyRing
+
+
+def measure(action, iterations: int) -> float:
+    """
+    Returns microseconds per call
+    """
+    started_at = perf_counter()
+    for _ in range(iterations):
+        action()
+
+    return (perf_counter() - started_at) / iterations * 1_000_000
+
+
+def get_access_token_payload() -> dict:
+    """
+    Payload of access token with status claims of stateless auth
+    """
+    timestamp = int(time())
+
+    return {
+        "sub": "benchmark",
+        "token_type": settings.auth_jwt.ACCESS_TOKEN_TYPE,
+        "iat": timestamp,
+        "exp": timestamp + settings.auth_jwt.ACCESS_TOKEN_EXPIRE_TIME,
+        "is_active": True,
+        "is_staff": False,
+    }
+
+
+def compare_algorithms(iterations: int) -> None:
+    payload = get_access_token_payload()
+
+    print(f"{iterations} iterations")
+    print(f"{'algorithm':<10} {'encode ops/s':>14} {'decode ops/s':>14}")
+    for algorithm in JWT_ALGORITHMS:
+        with TemporaryDirectory() as temporary_dir:
+            keys_dir = Path(temporary_dir)
+            generate_jwt_keys(algorithm=algorithm, kid="benchmark", keys_dir=keys_dir)
+            util = JWTActionsUtil(
+                key_ring=JWTKeyRing(keys_dir=keys_dir, algorithm=algorithm)
+            )
+            token = util.encode_jwt(payload)
+            encode = measure(lambda: util.encode_jwt(payload), iterations)
+            decode = measure(lambda: util.decode_jwt(token), iterations)
+
+        print(
+            f"{algorithm:<10} {1_000_000 / encode:14.0f} {1_000_000 / decode:14.0f}"
+        )
+
+
+def main(iterations: int) -> None:
+    key = jwt_actions_util.key_ring.get_signing_key()
+    keys_dir = settings.auth_jwt.KEYS_DIR
+    private_key_pem = (keys_dir / f"{key.kid}-private.pem").read_text()
+    public_key_pem = (keys_dir / f"{key.kid}-public.pem").read_text()
+    algorithm = key.algorithm
+
+    payload = get_access_token_payload()
+    token = jwt_actions_util.encode_jwt(payload)
+    uncached_jwt_actions_util = JWTActionsUtil(key_ring=jwt_actions_util.key_ring)
+
+    results = {
+        "encode, PEM text": measure(
+            lambda: jwt.encode(payload, private_key_pem, algorithm=algorithm),
+            iterations,
+        ),
+        "encode, key ring": measure(
+            lambda: jwt_actions_util.encode_jwt(payload), iterations
+        ),
+        "decode, PEM text": measure(
+            lambda: jwt.decode(token, public_key_pem, algorithms=[algorithm]),
+            iterations,
+        ),
+        "decode, key ring": measure(
+            lambda: uncached_jwt_actions_util.decode_jwt(token), iterations
+        ),
+        "decode, cached": measure(
+            lambda: jwt_actions_util.decode_jwt(token), iterations
+        ),
+    }
+
+    print(f"{algorithm}, kid {key.kid}, {iterations} iterations")
+    for name, microseconds in results.items():
+        print(f"{name:<20} {microseconds:10.1f} us/token")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark JWT signing and verification")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument(
+        "--algorithms",
+        action="store_true",
+        help=f"Compare {', '.join(JWT_ALGORITHMS)} on temporary keys",
+    )
+    args = parser.parse_args()
+
+    if args.algorithms:
+        compare_algorithms(iterations=args.iterations)
+    else:
+        main(iterations=args.iterations)
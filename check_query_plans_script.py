@@ -0,0 +1,309 @@
+"""
+Seeds large synthetic dataset into test database (TEST_DB_NAME)
+and checks plans of statements list repositories execute:
+no seq scans on large tables, expected indexes, cost budget.
+Exits with code 1 if any plan violates its expectations
+"""
+
+import os
+
+# Never seed working database, replica is not seeded either
+os.environ["TESTING"] = "True"
+os.environ["DB_REPLICA_HOST"] = ""
+
+from argparse import ArgumentParser
+from asyncio import run
+from dataclasses import dataclass, field
+from sys import exit
+
+import asyncpg
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import text
+
+from config import async_session, settings
+from config.settings import BASE_DIR
+from common import check_query_plan, encode_cursor, explain_query, iter_plan_nodes
+
+from files.apps.monitoring.query_plans import ListStatementEnum, build_list_statement
+
+
+LARGE_TABLES = {"users", "subdivisions", "projects", "employees"}
+
+
+@dataclass
+class QueryPlanCase:
+    name: str
+    statement: ListStatementEnum
+    params: dict
+    expected_indexes: set[str] = field(default_factory=set)
+    max_total_cost: float = 1000
+
+
+QUERY_PLAN_CASES = (
+    QueryPlanCase(
+        name="users first page",
+        statement=ListStatementEnum.LIST_USERS,
+        params={"limit": 20},
+        expected_indexes={"users_pkey"},
+    ),
+    QueryPlanCase(
+        name="users next page by cursor",
+        statement=ListStatementEnum.LIST_USERS,
+        params={"limit": 20, "cursor": encode_cursor({"username": "user100000"})},
+        expected_indexes={"users_pkey"},
+    ),
+    QueryPlanCase(
+        name="users filtered by names with total",
+        statement=ListStatementEnum.LIST_USERS,
+        params={"names": "name 1|name 2", "limit": 20, "with_total_count": True},
+        expected_indexes={"ix_users_name"},
+    ),
+    QueryPlanCase(
+        name="users filtered by usernames",
+        statement=ListStatementEnum.LIST_USERS,
+        params={"usernames": "user1|user2|user3", "limit": 20},
+        expected_indexes={"users_pkey"},
+    ),
+    QueryPlanCase(
+        name="subdivisions first page",
+        statement=ListStatementEnum.LIST_SUBDIVISIONS,
+        params={"limit": 20},
+        expected_indexes={"subdivisions_pkey"},
+    ),
+    QueryPlanCase(
+        name="subdivisions filtered by names with total",
+        statement=ListStatementEnum.LIST_SUBDIVISIONS,
+        params={
+            "names": "subdivision 1|subdivision 2",
+            "limit": 20,
+            "with_total_count": True,
+        },
+        expected_indexes={"ix_subdivisions_name"},
+    ),
+    QueryPlanCase(
+        name="subdivisions filtered by department",
+        statement=ListStatementEnum.LIST_SUBDIVISIONS,
+        params={"departments": "Education", "limit": 20, "with_total_count": True},
+        expected_indexes={"ix_subdivisions_department_subdivision_id"},
+    ),
+    QueryPlanCase(
+        name="subdivisions stats first page",
+        statement=ListStatementEnum.SUBDIVISIONS_STATS,
+        params={"limit": 20},
+        expected_indexes={
+            "ix_projects_subdivision_id_completed_project_id",
+            "ix_employees_subdivision_user",
+        },
+        max_total_cost=5000,
+    ),
+    QueryPlanCase(
+        name="projects of subdivision",
+        statement=ListStatementEnum.LIST_PROJECTS,
+        params={"subdivision_id": 7, "limit": 20, "with_total_count": True},
+        expected_indexes={"ix_projects_subdivision_id_project_id"},
+    ),
+    QueryPlanCase(
+        name="projects of subdivision filtered by completed",
+        statement=ListStatementEnum.LIST_PROJECTS,
+        params={"subdivision_id": 7, "completed": False, "limit": 20},
+        expected_indexes={"ix_projects_subdivision_id_completed_project_id"},
+    ),
+    QueryPlanCase(
+        name="employees of subdivision",
+        statement=ListStatementEnum.LIST_EMPLOYEES,
+        params={"subdivision_id": 7, "limit": 20},
+        expected_indexes={"ix_employees_subdivision_user", "users_pkey"},
+    ),
+    QueryPlanCase(
+        name="employees of subdivision by cursor with total",
+        statement=ListStatementEnum.LIST_EMPLOYEES,
+        params={
+            "subdivision_id": 7,
+            "fields": "username|name|email",
+            "cursor": encode_cursor({"username": "user1000"}),
+            "limit": 20,
+            "with_total_count": True,
+        },
+        expected_indexes={"ix_employees_subdivision_user", "users_pkey"},
+    ),
+    QueryPlanCase(
+        name="employees usernames only",
+        statement=ListStatementEnum.LIST_EMPLOYEES,
+        params={"subdivision_id": 7, "fields": "username", "limit": 20},
+        # Users are joined for the "users.deleted_at IS NULL" filter
+        expected_indexes={"ix_employees_subdivision_user", "users_pkey"},
+    ),
+)
+
+
+async def create_test_database() -> None:
+    connection = await asyncpg.connect(
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        user=settings.DB_USER,
+        password=settings.DB_PASS,
+        database="postgres",
+    )
+    try:
+        database_exists = await connection.fetchval(
+            "SELECT 1 FROM pg_database WHERE datname = $1", settings.TEST_DB_NAME
+        )
+        if not database_exists:
+            await connection.execute(f'CREATE DATABASE "{settings.TEST_DB_NAME}"')
+    finally:
+        await connection.close()
+
+
+async def seed(users_count: int, subdivisions_count: int, per_subdivision: int) -> None:
+    async with async_session() as session:
+        seeded_users_count = (
+            await session.execute(text("SELECT count(*) FROM users"))
+        ).scalar_one()
+        if seeded_users_count >= users_count:
+            print(f"Using existing dataset ({seeded_users_count} users)")
+            return
+
+        print("Seeding dataset...")
+        await session.execute(
+            text(
+                "TRUNCATE users, subdivisions, projects, employees "
+                "RESTART IDENTITY CASCADE"
+            )
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO users
+                    (username, email, password, name, is_staff, is_active, is_superuser)
+                SELECT 'user' || i, 'user' || i || '@example.com', '\\x00'::bytea,
+                       'name ' || (i % 10000), i % 50 = 0, i % 20 <> 0, false
+                FROM generate_series(1, :users_count) AS i
+                """
+            ),
+            {"users_count": users_count},
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO subdivisions (name, department)
+                SELECT 'subdivision ' || i,
+                       (enum_range(NULL::departmentenum))[1 + i % 15]
+                FROM generate_series(1, :subdivisions_count) AS i
+                """
+            ),
+            {"subdivisions_count": subdivisions_count},
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO projects
+                    (name, completed, start_time, complete_time, subdivision_id)
+                SELECT 'project ' || j, j % 3 = 0, now(), now(), s
+                FROM generate_series(1, :subdivisions_count) AS s,
+                     generate_series(1, :per_subdivision) AS j
+                """
+            ),
+            {
+                "subdivisions_count": subdivisions_count,
+                "per_subdivision": per_subdivision,
+            },
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO employees ("user", subdivision)
+                SELECT 'user' || (1 + (s * :per_subdivision + j) % :users_count), s
+                FROM generate_series(1, :subdivisions_count) AS s,
+                     generate_series(1, :per_subdivision) AS j
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            {
+                "users_count": users_count,
+                "subdivisions_count": subdivisions_count,
+                "per_subdivision": per_subdivision,
+            },
+        )
+        await session.execute(text("ANALYZE users, subdivisions, projects, employees"))
+
+
+async def check_query_plans(verbose: bool) -> int:
+    failed_cases_count = 0
+    async with async_session() as session:
+        for case in QUERY_PLAN_CASES:
+            query = build_list_statement(statement=case.statement, params=case.params)
+            plan = await explain_query(session=session, statement=query)
+            violations = check_query_plan(
+                plan=plan,
+                seq_scan_forbidden_tables=LARGE_TABLES,
+                expected_indexes=case.expected_indexes,
+                max_total_cost=case.max_total_cost,
+            )
+
+            status = "FAIL" if violations else "ok"
+            print(
+                f"[{status}] {case.statement.value}: {case.name} "
+                f"(cost {plan['Plan']['Total Cost']})"
+            )
+            for violation in violations:
+                print(f"       {violation}")
+            if violations or verbose:
+                for node in iter_plan_nodes(plan):
+                    node_description = " ".join(
+                        (
+                            node["Node Type"],
+                            node.get("Relation Name", ""),
+                            node.get("Index Name", ""),
+                        )
+                    )
+                    print(f"       - {node_description.rstrip()}")
+
+            failed_cases_count += bool(violations)
+
+    return failed_cases_count
+
+
+async def main(
+    users_count: int,
+    subdivisions_count: int,
+    per_subdivision: int,
+    verbose: bool,
+) -> int:
+    await seed(
+        users_count=users_count,
+        subdivisions_count=subdivisions_count,
+        per_subdivision=per_subdivision,
+    )
+    failed_cases_count = await check_query_plans(verbose=verbose)
+    ok_cases_count = len(QUERY_PLAN_CASES) - failed_cases_count
+    print(f"{ok_cases_count}/{len(QUERY_PLAN_CASES)} plans are ok")
+
+    return failed_cases_count
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Check query plans of list statements")
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--subdivisions", type=int, default=2_000)
+    parser.add_argument(
+        "--per-subdivision",
+        type=int,
+        default=100,
+        help="Projects and employees of every subdivision",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    run(create_test_database())
+    command.upgrade(Config(BASE_DIR / "alembic.ini"), "head")
+
+    failed_cases_count = run(
+        main(
+            users_count=args.users,
+            subdivisions_count=args.subdivisions,
+            per_subdivision=args.per_subdivision,
+            verbose=args.verbose,
+        )
+    )
+    exit(1 if failed_cases_count else 0)
@@ -1,5 +1,12 @@
 __all__ = (
     "Paginator",
+    "PageSchema",
+    "create_page",
+    "encode_cursor",
+    "decode_cursor",
+    "CountStrategyEnum",
+    "add_total_count_column",
+    "get_estimated_rows_count",
     #
     "check_string_is_not_empty",
     "generate_image_url",
@@ -7,6 +14,20 @@ __all__ = (
     "generate_uuid_using_uuid_and_time",
     "save_base64_image_to_fs",
     "generate_url",
+    "DataFormatEnum",
+    "STREAM_CHUNK_SIZE",
+    "STREAM_MEDIA_TYPES",
+    "stream_rows",
+    "Explain",
+    "explain_query",
+    "iter_plan_nodes",
+    "check_query_plan",
+    "BatchLoader",
+    "batch_loader_middleware",
+    "TTLCache",
+    "BoundedExecutor",
+    "ExecutorKindEnum",
+    "ExecutorIsSaturatedError",
     #
     "validate_email",
     "validate_phone_number",
@@ -14,7 +35,16 @@ __all__ = (
     "validate_date_is_today_or_earlier",
 )
 
-from common.paginators.paginator import Paginator
+from common.paginators import (
+    Paginator,
+    PageSchema,
+    create_page,
+    encode_cursor,
+    decode_cursor,
+    CountStrategyEnum,
+    add_total_count_column,
+    get_estimated_rows_count,
+)
 
 from common.utils import (
     check_string_is_not_empty,
@@ -23,6 +53,20 @@ from common.utils import (
     generate_uuid_using_uuid_and_time,
     save_base64_image_to_fs,
     generate_url,
+    DataFormatEnum,
+    STREAM_CHUNK_SIZE,
+    STREAM_MEDIA_TYPES,
+    stream_rows,
+    Explain,
+    explain_query,
+    iter_plan_nodes,
+    check_query_plan,
+    BatchLoader,
+    batch_loader_middleware,
+    TTLCache,
+    BoundedExecutor,
+    ExecutorKindEnum,
+    ExecutorIsSaturatedError,
 )
 
 from common.validators import (
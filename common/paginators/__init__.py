@@ -1,3 +1,19 @@
-__all__ = ("Paginator",)
+__all__ = (
+    "Paginator",
+    "PageSchema",
+    "create_page",
+    "encode_cursor",
+    "decode_cursor",
+    "CountStrategyEnum",
+    "add_total_count_column",
+    "get_estimated_rows_count",
+)
 
 from .paginator import Paginator
+from .page_schema import PageSchema, create_page
+from .cursor import encode_cursor, decode_cursor
+from .total_count import (
+    CountStrategyEnum,
+    add_total_count_column,
+    get_estimated_rows_count,
+)
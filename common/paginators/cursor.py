@@ -0,0 +1,30 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from json import dumps, loads
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Packs keyset values of the last row of the page
+    into opaque url-safe cursor string
+    """
+    cursor_bytes = dumps(values, separators=(",", ":"), default=str).encode()
+
+    return urlsafe_b64encode(cursor_bytes).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: tuple[str, ...]) -> dict:
+    """
+    Unpacks cursor created by encode_cursor.
+    Raises ValueError if cursor is malformed or doesn't contain required keys
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = loads(urlsafe_b64decode(cursor + padding))
+    except (BinasciiError, UnicodeDecodeError, ValueError) as error:
+        raise ValueError("Cursor is not valid") from error
+
+    if not isinstance(values, dict) or any(key not in values for key in keys):
+        raise ValueError("Cursor is not valid")
+
+    return values
@@ -0,0 +1,60 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+from .paginator import Paginator
+
+
+T = TypeVar("T")
+
+
+class PageSchema(BaseModel, Generic[T]):
+    """
+    Page of list query result.
+    total is None if count has not been requested or can't be estimated
+    """
+
+    items: list[T]
+    total: int | None = None
+    has_next: bool = False
+    has_prev: bool = False
+    next_cursor: str | None = None
+
+
+def create_page(
+    items: list[T],
+    limit: int | None,
+    offset: int | None,
+    cursor: str | None,
+    next_cursor: str | None,
+    total: int | None = None,
+    total_is_exact: bool = False,
+) -> PageSchema[T]:
+    """
+    Builds page envelope. For offset pages with exact total, has_next/has_prev
+    come from Paginator, otherwise from the extra fetched row and cursor/offset
+    """
+    has_next = next_cursor is not None
+    has_prev = cursor is not None or bool(offset)
+
+    if cursor is None and limit and total is not None and total_is_exact:
+        offset = offset or 0
+        paginator = Paginator(
+            limit=limit,
+            objects_count=total,
+            current_page_num=offset // limit + 1,
+        )
+        try:
+            has_next = paginator.has_next
+        except ValueError:
+            # Page is beyond the last one
+            has_next = False
+        has_prev = paginator.has_prev or bool(offset)
+
+    return PageSchema[T](
+        items=items,
+        total=total,
+        has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=next_cursor,
+    )
@@ -1,11 +1,10 @@
 from math import ceil
-from pydantic import ValidationError
 
 
 class Paginator:
     def __init__(self, limit: int, objects_count: int, current_page_num: int):
         if current_page_num < 1:
-            raise ValidationError("Current_page_num must be more or equal 1")
+            raise ValueError("Current_page_num must be more or equal 1")
         self._limit = limit
         self._objects_count = objects_count
         self._current_page_num = current_page_num
@@ -39,7 +38,7 @@ class Paginator:
     @property
     def has_next(self):
         if self.pages_count != 0 and self._current_page_num > self.pages_count:
-            raise ValidationError("Invalid page number")
+            raise ValueError("Invalid page number")
         return True if self._current_page_num < self.pages_count else False
 
     @has_next.setter
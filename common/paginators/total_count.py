@@ -0,0 +1,63 @@
+from enum import Enum
+from time import monotonic
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+ESTIMATED_COUNT_CACHE_TTL = 60
+
+_estimated_counts_cache: dict[str, tuple[float, int]] = {}
+
+
+class CountStrategyEnum(str, Enum):
+    """
+    How list endpoints compute total count of filtered rows
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+def add_total_count_column(
+    query: Select,
+    table,
+    conditions: list,
+    seek_conditions: list,
+) -> Select:
+    """
+    Adds "total_count" column with number of rows matching conditions,
+    so page and total come from one statement. count(*) OVER() is used
+    for offset pages. With keyset seek window would count only rows after
+    the cursor, so uncorrelated count subquery (computed once) is used
+    """
+    if not seek_conditions:
+        return query.add_columns(func.count().over().label("total_count"))
+
+    total_count = select(func.count()).select_from(table).where(*conditions)
+
+    return query.add_columns(total_count.scalar_subquery().label("total_count"))
+
+
+async def get_estimated_rows_count(session: AsyncSession, table_name: str) -> int | None:
+    """
+    Returns planner's rows estimate (pg_class.reltuples) of the table,
+    cached for ESTIMATED_COUNT_CACHE_TTL seconds.
+    Returns None if table has never been analyzed
+    """
+    cached = _estimated_counts_cache.get(table_name)
+    if cached is not None and monotonic() - cached[0] < ESTIMATED_COUNT_CACHE_TTL:
+        return cached[1]
+
+    query_result = await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name},
+    )
+    estimated_count = query_result.scalar_one_or_none()
+    if estimated_count is None or estimated_count < 0:
+        return None
+
+    _estimated_counts_cache[table_name] = (monotonic(), estimated_count)
+
+    return estimated_count
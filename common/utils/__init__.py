@@ -5,6 +5,20 @@ __all__ = (
     "generate_uuid_using_uuid_and_time",
     "save_base64_image_to_fs",
     "generate_url",
+    "DataFormatEnum",
+    "STREAM_CHUNK_SIZE",
+    "STREAM_MEDIA_TYPES",
+    "stream_rows",
+    "Explain",
+    "explain_query",
+    "iter_plan_nodes",
+    "check_query_plan",
+    "BatchLoader",
+    "batch_loader_middleware",
+    "TTLCache",
+    "BoundedExecutor",
+    "ExecutorKindEnum",
+    "ExecutorIsSaturatedError",
 )
 
 
@@ -14,3 +28,17 @@ from .generate_image_uuid_name import generate_image_uuid_name
 from .generate_uuid_using_timestamp import generate_uuid_using_uuid_and_time
 from .save_base64_image_to_fs import save_base64_image_to_fs
 from .generate_url import generate_url
+from .stream_rows import (
+    DataFormatEnum,
+    STREAM_CHUNK_SIZE,
+    STREAM_MEDIA_TYPES,
+    stream_rows,
+)
+from .query_plan import Explain, explain_query, iter_plan_nodes, check_query_plan
+from .batch_loader import BatchLoader, batch_loader_middleware
+from .ttl_cache import TTLCache
+from .bounded_executor import (
+    BoundedExecutor,
+    ExecutorKindEnum,
+    ExecutorIsSaturatedError,
+)
@@ -0,0 +1,152 @@
+from abc import ABC, abstractmethod
+from asyncio import Lock, Task, get_running_loop
+from contextvars import ContextVar
+from typing import Generic, Hashable, TypeVar
+
+from fastapi import Request
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class _LoaderState:
+    """
+    Loader's data of one request: memoized futures by key
+    and (key, future) pairs waiting for the next batch
+    """
+
+    def __init__(self):
+        self.futures: dict = {}
+        self.pending: list = []
+        self.dispatch_task: Task | None = None
+
+
+class BatchLoaderScope:
+    """
+    States of all loaders of one request. Loaders of one request share
+    request's read session, so their batches are executed one at a time
+    """
+
+    def __init__(self):
+        self.states: dict["BatchLoader", _LoaderState] = {}
+        self.lock = Lock()
+
+
+request_batch_loader_scope: ContextVar[BatchLoaderScope | None] = ContextVar(
+    "request_batch_loader_scope", default=None
+)
+
+
+class BatchLoader(ABC, Generic[K, V]):
+    """
+    Base of per-request batching loaders. All load(key) calls made
+    in the same event loop tick are coalesced into one batch_load(keys)
+    call, results are memoized till the end of request.
+    Outside of request every load is executed on its own and not memoized.
+    Subclasses implement batch_load, returning found values by key
+    """
+
+    @abstractmethod
+    async def batch_load(self, keys: list[K]) -> dict[K, V]:
+        pass
+
+    def _get_state(self) -> tuple[_LoaderState, Lock | None]:
+        scope = request_batch_loader_scope.get()
+        if scope is None:
+            return _LoaderState(), None
+
+        state = scope.states.get(self)
+        if state is None:
+            state = _LoaderState()
+            scope.states[self] = state
+
+        return state, scope.lock
+
+    async def load(self, key: K) -> V | None:
+        """
+        Returns value of key or None if it doesn't exist
+        """
+        state, lock = self._get_state()
+
+        future = state.futures.get(key)
+        if future is None:
+            future = get_running_loop().create_future()
+            state.futures[key] = future
+            state.pending.append((key, future))
+            # Task starts on the next loop iteration, after every
+            # coroutine scheduled in this tick has called load
+            if state.dispatch_task is None:
+                state.dispatch_task = get_running_loop().create_task(
+                    self._dispatch(state=state, lock=lock)
+                )
+
+        return await future
+
+    async def load_many(self, keys: list[K]) -> list[V | None]:
+        """
+        Returns values of keys in keys order (None for missing keys)
+        with at most one batch_load call
+        """
+        state, lock = self._get_state()
+        for key in keys:
+            if key not in state.futures:
+                future = get_running_loop().create_future()
+                state.futures[key] = future
+                state.pending.append((key, future))
+
+        futures = [state.futures[key] for key in keys]
+        if state.pending and state.dispatch_task is None:
+            state.dispatch_task = get_running_loop().create_task(
+                self._dispatch(state=state, lock=lock)
+            )
+
+        return [await future for future in futures]
+
+    def clear(self, key: K) -> None:
+        """
+        Drops memoized value of key, so next load fetches it again.
+        Loads waiting for a batch still get its result.
+        Must be called after key's entity is changed in current request
+        """
+        state, _ = self._get_state()
+        state.futures.pop(key, None)
+
+    async def _dispatch(self, state: _LoaderState, lock: Lock | None) -> None:
+        pending, state.pending = state.pending, []
+        state.dispatch_task = None
+        # Key cleared and loaded again before dispatch is pending twice
+        keys = list(dict.fromkeys(key for key, _ in pending))
+
+        try:
+            if lock is None:
+                values = await self.batch_load(keys)
+            else:
+                async with lock:
+                    values = await self.batch_load(keys)
+        except Exception as error:
+            for key, future in pending:
+                # Failed keys are not memoized
+                if state.futures.get(key) is future:
+                    del state.futures[key]
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for key, future in pending:
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+async def batch_loader_middleware(request: Request, call_next):
+    """
+    Opens batch loaders scope for request, so loaded
+    entities are memoized till the end of request
+    """
+    context_token = request_batch_loader_scope.set(BatchLoaderScope())
+    try:
+        response = await call_next(request)
+    finally:
+        request_batch_loader_scope.reset(context_token)
+
+    return response
@@ -0,0 +1,166 @@
+from asyncio import CancelledError, Future, get_running_loop
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from time import time
+from typing import Callable, TypeVar
+
+
+T = TypeVar("T")
+
+# Recent wait times the wait percentile is computed over
+WAIT_TIMES_WINDOW = 1000
+
+
+class ExecutorKindEnum(str, Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ExecutorIsSaturatedError(Exception):
+    pass
+
+
+def _run_timed(func: Callable[..., T], *args) -> tuple[float, T]:
+    """
+    Runs func in worker, returns its start (wall clock,
+    comparable between processes) and result
+    """
+    started_at = time()
+
+    return started_at, func(*args)
+
+
+class BoundedExecutor:
+    """
+    Runs blocking calls in a pool of worker threads or processes without
+    blocking event loop. At most max_queue_size calls wait for a free
+    worker, further calls fail at once with ExecutorIsSaturatedError
+    instead of queueing behind the others. Bulk operations use
+    run_when_worker_is_free, which waits for a free worker instead.
+    Counts queue depth and time calls wait for a worker.
+    Pool is started by first call
+    """
+
+    def __init__(
+        self,
+        kind: ExecutorKindEnum,
+        max_workers: int,
+        max_queue_size: int,
+    ):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor: Executor | None = None
+
+        # Submitted and not finished calls, running and waiting
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self._wait_times: deque[float] = deque(maxlen=WAIT_TIMES_WINDOW)
+        self._worker_waiters: deque[Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.in_flight - self.max_workers, 0)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == ExecutorKindEnum.PROCESS:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="bounded_executor",
+                )
+
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Returns result of func(*args) run by a worker.
+        func and args must be picklable for process pool
+        """
+        if self.in_flight >= self.max_workers + self.max_queue_size:
+            self.rejected += 1
+            raise ExecutorIsSaturatedError(
+                f"{self.max_queue_size} calls are already waiting for a worker"
+            )
+
+        executor = self._get_executor()
+        self.in_flight += 1
+        self.submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        submitted_at = time()
+        try:
+            started_at, result = await get_running_loop().run_in_executor(
+                executor, _run_timed, func, *args
+            )
+        finally:
+            self.in_flight -= 1
+            self._wake_worker_waiter()
+
+        wait_time = max(started_at - submitted_at, 0.0)
+        self.completed += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+        self._wait_times.append(wait_time)
+
+        return result
+
+    async def run_when_worker_is_free(self, func: Callable[..., T], *args) -> T:
+        """
+        Like run, but first waits till a worker is free, so the call
+        is neither queued nor rejected. Waiting calls take no queue
+        slots, which stay for calls of request handlers
+        """
+        while self.in_flight >= self.max_workers:
+            waiter = get_running_loop().create_future()
+            self._worker_waiters.append(waiter)
+            try:
+                await waiter
+            except CancelledError:
+                # Wake taken by cancelled call goes to the next waiter
+                if not waiter.cancelled():
+                    self._wake_worker_waiter()
+                raise
+
+        return await self.run(func, *args)
+
+    def _wake_worker_waiter(self) -> None:
+        while self._worker_waiters:
+            waiter = self._worker_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        wait_times = sorted(self._wait_times)
+
+        return {
+            "kind": self.kind.value,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_time_avg": (
+                self.wait_time_total / self.completed if self.completed else 0.0
+            ),
+            "wait_time_p95": (
+                wait_times[int(len(wait_times) * 0.95)] if wait_times else 0.0
+            ),
+            "wait_time_max": self.wait_time_max,
+        }
@@ -0,0 +1,83 @@
+from json import loads
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) of statement, compiled with statement's own
+    bind parameters, so plan is built for exactly the same query
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Executable, analyze: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    options = "ANALYZE, BUFFERS, " if element.analyze else ""
+    return f"EXPLAIN ({options}FORMAT JSON) " + compiler.process(
+        element.statement, **kwargs
+    )
+
+
+async def explain_query(
+    session: AsyncSession,
+    statement: Executable,
+    analyze: bool = False,
+) -> dict:
+    """
+    Returns root of statement's JSON plan ({"Plan": ..., ...}).
+    analyze=True executes statement
+    """
+    query_result = await session.execute(Explain(statement=statement, analyze=analyze))
+    plan = query_result.scalar_one()
+    if isinstance(plan, str):
+        plan = loads(plan)
+
+    return plan[0]
+
+
+def iter_plan_nodes(plan: dict):
+    """
+    Yields every node of plan tree, root first
+    """
+    node = plan.get("Plan", plan)
+    yield node
+    for child in node.get("Plans", ()):
+        yield from iter_plan_nodes(child)
+
+
+def check_query_plan(
+    plan: dict,
+    seq_scan_forbidden_tables: set[str] = frozenset(),
+    expected_indexes: set[str] = frozenset(),
+    max_total_cost: float | None = None,
+) -> list[str]:
+    """
+    Checks plan properties and returns list of violations (empty if plan is fine)
+    """
+    violations = []
+    nodes = list(iter_plan_nodes(plan))
+
+    for node in nodes:
+        if (
+            node.get("Node Type") == "Seq Scan"
+            and node.get("Relation Name") in seq_scan_forbidden_tables
+        ):
+            violations.append(f'Seq Scan on "{node["Relation Name"]}"')
+
+    used_indexes = {node["Index Name"] for node in nodes if "Index Name" in node}
+    for index_name in sorted(expected_indexes - used_indexes):
+        violations.append(f'Index "{index_name}" is not used')
+
+    total_cost = plan["Plan"]["Total Cost"]
+    if max_total_cost is not None and total_cost > max_total_cost:
+        violations.append(f"Total cost {total_cost} exceeds budget {max_total_cost}")
+
+    return violations
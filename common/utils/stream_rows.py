@@ -0,0 +1,66 @@
+import csv
+from datetime import date, datetime
+from enum import Enum
+from io import StringIO
+from json import dumps
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+
+STREAM_CHUNK_SIZE = 1000
+
+
+class DataFormatEnum(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+STREAM_MEDIA_TYPES = {
+    DataFormatEnum.CSV: "text/csv",
+    DataFormatEnum.NDJSON: "application/x-ndjson",
+}
+
+
+def _to_primitive(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+async def stream_rows(
+    partitions: AsyncIterable[Sequence],
+    columns: Sequence[str],
+    format: DataFormatEnum,
+) -> AsyncIterator[str]:
+    """
+    Serializes partitions of rows (named tuples) into CSV or NDJSON text,
+    one chunk per partition. CSV header is yielded before first partition
+    is fetched, so response starts right away
+    """
+    if format == DataFormatEnum.CSV:
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+        async for rows in partitions:
+            buffer.seek(0)
+            buffer.truncate()
+            for row in rows:
+                writer.writerow(
+                    _to_primitive(value) if isinstance(value, (Enum, date)) else value
+                    for value in (getattr(row, column) for column in columns)
+                )
+            yield buffer.getvalue()
+        return
+
+    async for rows in partitions:
+        yield "".join(
+            dumps(
+                {column: getattr(row, column) for column in columns},
+                default=_to_primitive,
+            )
+            + "\n"
+            for row in rows
+        )
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Generic, Hashable, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU cache which entries expire after ttl seconds.
+    Holds at most maxsize entries, least recently used one is evicted
+    first. Counts hits, misses, evictions, expirations and invalidations.
+    Not shared between processes, so ttl bounds staleness of entries
+    changed by other processes
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        # Changed by every invalidation, see set
+        self.version = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: K) -> V | None:
+        """
+        Returns value of key or None if it is missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(
+        self,
+        key: K,
+        value: V,
+        version: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Stores value of key for ttl seconds (cache's ttl at most).
+        If version (taken before value was fetched) is provided and cache
+        was invalidated since, value may be stale and is not stored
+        """
+        if version is not None and version != self.version:
+            return
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self.version += 1
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.version += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        requests_count = self.hits + self.misses
+
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests_count if requests_count else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
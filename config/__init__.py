@@ -1,9 +1,27 @@
 __all__ = (
     "async_session",
+    "async_read_session",
+    "async_stream_session",
+    "async_batch_session",
+    "get_db_pools_status",
+    "consistency_token_middleware",
+    "CONSISTENCY_TOKEN_HEADER",
+    "unit_of_work_middleware",
     "settings",
     "Base",
 )
 
-from .db_config.session import async_session
+from .db_config.session import (
+    async_session,
+    async_read_session,
+    async_stream_session,
+    async_batch_session,
+    get_db_pools_status,
+)
+from .db_config.consistency import (
+    consistency_token_middleware,
+    CONSISTENCY_TOKEN_HEADER,
+)
+from .db_config.unit_of_work import unit_of_work_middleware
 from .settings import settings
 from .db_config.base import Base
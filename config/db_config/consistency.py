@@ -0,0 +1,138 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from logging import getLogger
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..settings import settings
+
+
+logger = getLogger("common.base_logger")
+
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+CONSISTENCY_TOKEN_COOKIE = "consistency_token"
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# WAL position the current request must observe (set from client's token)
+required_lsn: ContextVar[int | None] = ContextVar("required_lsn", default=None)
+
+
+def parse_lsn(lsn: str | None) -> int | None:
+    """
+    Converts postgres LSN text ("16/B374D848") to comparable int.
+    Returns None for missing or malformed value
+    """
+    if not lsn:
+        return None
+    try:
+        high, low = lsn.split("/")
+        return (int(high, 16) << 32) + int(low, 16)
+    except ValueError:
+        return None
+
+
+class ReplicaLagAwareSessionmaker:
+    """
+    Session factory for read paths. Opens replica session only if replica
+    has replayed WAL past the LSN required by current request, otherwise
+    opens primary session. Used the same way as async_sessionmaker:
+    "async with async_read_session() as session"
+    """
+
+    def __init__(
+        self,
+        primary_session: async_sessionmaker[AsyncSession],
+        replica_session: async_sessionmaker[AsyncSession],
+    ):
+        self.primary_session = primary_session
+        self.replica_session = replica_session
+        # Highest replay position seen on replica, replay is monotonic
+        self._replayed_lsn = 0
+
+    async def _replica_has_replayed(self, session: AsyncSession, lsn: int) -> bool:
+        if self._replayed_lsn >= lsn:
+            return True
+
+        query_result = await session.execute(
+            text("SELECT pg_last_wal_replay_lsn()::text")
+        )
+        replayed_lsn = parse_lsn(query_result.scalar_one_or_none())
+        if replayed_lsn is None:
+            return False
+
+        self._replayed_lsn = max(self._replayed_lsn, replayed_lsn)
+
+        return self._replayed_lsn >= lsn
+
+    @asynccontextmanager
+    async def __call__(self):
+        lsn = required_lsn.get()
+
+        async with self.replica_session() as session:
+            if lsn is None or await self._replica_has_replayed(session, lsn):
+                yield session
+                return
+
+        async with self.primary_session() as session:
+            yield session
+
+
+async def get_primary_wal_lsn(
+    async_session: async_sessionmaker[AsyncSession],
+) -> str:
+    async with async_session() as session:
+        query_result = await session.execute(text("SELECT pg_current_wal_lsn()::text"))
+
+        return query_result.scalar_one()
+
+
+def get_consistency_token_from_request(request: Request) -> int | None:
+    token = request.headers.get(CONSISTENCY_TOKEN_HEADER) or request.cookies.get(
+        CONSISTENCY_TOKEN_COOKIE
+    )
+
+    return parse_lsn(token)
+
+
+async def consistency_token_middleware(
+    request: Request,
+    call_next,
+    async_session: async_sessionmaker[AsyncSession],
+):
+    """
+    Provides read-your-writes consistency when read replica is in use.
+    Requires reads of this request to observe client's consistency token
+    and returns primary's WAL LSN as new token after successful writes
+    """
+    if settings.replica_database_url is None:
+        response = await call_next(request)
+        return response
+
+    context_token = required_lsn.set(get_consistency_token_from_request(request))
+    try:
+        response = await call_next(request)
+    finally:
+        required_lsn.reset(context_token)
+
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        # Captured by unit of work right after commit, if it wrote anything
+        lsn = getattr(request.state, "consistency_lsn", None)
+        if lsn is None:
+            try:
+                lsn = await get_primary_wal_lsn(async_session=async_session)
+            except Exception as error:
+                logger.error(f"Can't get primary WAL LSN: {error}")
+                return response
+
+        response.headers[CONSISTENCY_TOKEN_HEADER] = lsn
+        response.set_cookie(
+            key=CONSISTENCY_TOKEN_COOKIE,
+            value=lsn,
+            max_age=settings.CONSISTENCY_TOKEN_MAX_AGE,
+            httponly=True,
+            samesite="lax",
+        )
+
+    return response
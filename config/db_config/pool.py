@@ -0,0 +1,55 @@
+from time import perf_counter
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that counts checkouts and
+    measures how long callers wait for a connection
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts_count = 0
+        self.checkout_timeouts_count = 0
+        self.checkout_wait_time_total = 0.0
+        self.checkout_wait_time_max = 0.0
+
+    def _do_get(self):
+        start_time = perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts_count += 1
+            raise
+        finally:
+            wait_time = perf_counter() - start_time
+            self.checkouts_count += 1
+            self.checkout_wait_time_total += wait_time
+            self.checkout_wait_time_max = max(self.checkout_wait_time_max, wait_time)
+
+    def get_status(self) -> dict:
+        """
+        Returns current pool occupancy and
+        accumulated checkout wait statistics
+        """
+        checkout_wait_time_avg = (
+            self.checkout_wait_time_total / self.checkouts_count
+            if self.checkouts_count
+            else 0.0
+        )
+
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts_count": self.checkouts_count,
+            "checkout_timeouts_count": self.checkout_timeouts_count,
+            "checkout_wait_time_total": self.checkout_wait_time_total,
+            "checkout_wait_time_avg": checkout_wait_time_avg,
+            "checkout_wait_time_max": self.checkout_wait_time_max,
+        }
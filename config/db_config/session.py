@@ -1,8 +1,75 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from ..settings import settings
+from .pool import InstrumentedAsyncAdaptedQueuePool
+from .consistency import ReplicaLagAwareSessionmaker
+from .unit_of_work import RequestScopedSessionmaker
 
 
-async_engine = create_async_engine(url=settings.database_url, echo=True)
+def create_instrumented_async_engine(url: str) -> AsyncEngine:
+    """
+    Creates async engine with pool parameters
+    taken from settings and checkout telemetry
+    """
+    return create_async_engine(
+        url=url,
+        echo=settings.database_echo,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
 
-async_session = async_sessionmaker(async_engine)
+
+async_engine = create_instrumented_async_engine(url=settings.database_url)
+
+# Sessions are shared by all repositories within request (unit of work)
+async_session = RequestScopedSessionmaker(
+    session_factory=async_sessionmaker(async_engine)
+)
+
+# Read-only engine for list/get queries. Falls back to primary if replica
+# is not configured or lags behind client's consistency token
+async_read_engine = (
+    create_instrumented_async_engine(url=settings.replica_database_url)
+    if settings.replica_database_url is not None
+    else None
+)
+
+async_read_session = (
+    ReplicaLagAwareSessionmaker(
+        primary_session=async_session,
+        replica_session=RequestScopedSessionmaker(
+            session_factory=async_sessionmaker(async_read_engine)
+        ),
+    )
+    if async_read_engine is not None
+    else async_session
+)
+
+# Sessions not bound to request's unit of work, for responses streamed
+# after endpoint returns (request's sessions are closed by then)
+async_stream_session = async_sessionmaker(async_read_engine or async_engine)
+
+# Primary sessions not bound to request's unit of work, for bulk writes
+# committed batch by batch instead of once at the end of request
+async_batch_session = async_sessionmaker(async_engine)
+
+
+def get_db_pools_status() -> dict[str, dict]:
+    """
+    Returns pool telemetry for every engine, keyed by engine role
+    """
+    pools_status = {
+        "primary": async_engine.pool.get_status(),
+    }
+    if async_read_engine is not None:
+        pools_status["replica"] = async_read_engine.pool.get_status()
+
+    return pools_status
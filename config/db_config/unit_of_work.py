@@ -0,0 +1,119 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..settings import settings
+from .consistency import WRITE_METHODS
+
+
+class UnitOfWork:
+    """
+    Request scoped set of sessions. Session for every sessionmaker is
+    created lazily on first use and shared by middleware and repositories
+    till the end of request. Shared session must not be used concurrently
+    (no asyncio.gather over repository calls inside one request)
+    """
+
+    def __init__(self):
+        self._sessions: dict[async_sessionmaker[AsyncSession], AsyncSession] = {}
+
+    def get_session(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> AsyncSession:
+        session = self._sessions.get(session_factory)
+        if session is None:
+            session = session_factory()
+            self._sessions[session_factory] = session
+
+        return session
+
+    def get_opened_session(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> AsyncSession | None:
+        return self._sessions.get(session_factory)
+
+    async def commit(self) -> None:
+        for session in self._sessions.values():
+            await session.commit()
+
+    async def rollback(self) -> None:
+        for session in self._sessions.values():
+            await session.rollback()
+
+    async def close(self) -> None:
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+
+request_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar(
+    "request_unit_of_work", default=None
+)
+
+
+class RequestScopedSessionmaker:
+    """
+    Drop-in replacement of async_sessionmaker for repositories:
+    "async with async_session() as session". Inside request yields session
+    of request's unit of work, which is committed once at the end of request.
+    Outside of request (scripts) opens own session and commits it on exit
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    @asynccontextmanager
+    async def __call__(self):
+        unit_of_work = request_unit_of_work.get()
+        if unit_of_work is not None:
+            yield unit_of_work.get_session(self.session_factory)
+            return
+
+        async with self.session_factory() as session:
+            yield session
+            await session.commit()
+
+
+async def unit_of_work_middleware(
+    request: Request,
+    call_next,
+    async_session: RequestScopedSessionmaker,
+):
+    """
+    Opens unit of work for request, commits it if response is successful
+    and rolls it back otherwise. After committed writes stores primary's
+    WAL LSN in request.state for consistency token middleware
+    """
+    unit_of_work = UnitOfWork()
+    context_token = request_unit_of_work.set(unit_of_work)
+    try:
+        response = await call_next(request)
+
+        if response.status_code >= 400:
+            await unit_of_work.rollback()
+            return response
+
+        await unit_of_work.commit()
+
+        primary_session = unit_of_work.get_opened_session(async_session.session_factory)
+        if (
+            primary_session is not None
+            and settings.replica_database_url is not None
+            and request.method in WRITE_METHODS
+        ):
+            query_result = await primary_session.execute(
+                text("SELECT pg_current_wal_lsn()::text")
+            )
+            request.state.consistency_lsn = query_result.scalar_one()
+            await primary_session.commit()
+
+        return response
+    except Exception:
+        await unit_of_work.rollback()
+        raise
+    finally:
+        await unit_of_work.close()
+        request_unit_of_work.reset(context_token)
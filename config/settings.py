@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import BaseModel
 from datetime import datetime, UTC, timedelta
@@ -9,9 +10,17 @@ BASE_DIR = Path(__file__).parent.parent
 
 
 class AuthJWT(BaseModel):
-    PRIVATE_KEY_PATH: Path = BASE_DIR / "config" / "certs" / "jwt-private.pem"
-    PUBLIC_KEY_PATH: Path = BASE_DIR / "config" / "certs" / "jwt-public.pem"
-    ALGORITHM: str = "RS256"
+    # Key ring: "<kid>-private.pem"/"<kid>-public.pem" pairs of KEYS_DIR.
+    # Tokens are signed with SIGNING_KEY_ID (newest private key of ALGORITHM
+    # if None) and verified with public key of their kid, in key's own
+    # algorithm. Directory is rescanned every KEYS_RELOAD_INTERVAL seconds,
+    # JWKS is cached as long. Keys are generated by generate_env.py
+    KEYS_DIR: Path = BASE_DIR / "config" / "certs"
+    SIGNING_KEY_ID: str | None = None
+    KEYS_RELOAD_INTERVAL: int = 30
+    ALGORITHM: Literal["RS256", "ES256", "EdDSA"] = "RS256"
+    # Max entries of per-process cache of verified tokens' payloads
+    VERIFIED_TOKENS_CACHE_SIZE: int = 10000
 
     ACCESS_TOKEN_TYPE: str = "access"
     REFRESH_TOKEN_TYPE: str = "refresh"
@@ -24,6 +33,7 @@ class AuthJWT(BaseModel):
     ALLOW_ANY_ROUTES: list[str] = (
         "/api/v1/auth/login",
         "/api/v1/auth/refresh",
+        "/api/v1/auth/jwks",
         "/api/v1/healthcheck",
         "/docs",
         "/favicon.ico",
@@ -39,6 +49,13 @@ class AuthJWT(BaseModel):
         "/api/v1/position/create",
         "/api/v1/position/update/{position_id}",
         "/api/v1/position/update/{position_id}",
+        "/api/v1/monitoring/db-pools",
+        "/api/v1/monitoring/caches",
+        "/api/v1/monitoring/query-plan",
+        "/api/v1/monitoring/purges",
+        "/api/v1/monitoring/executors",
+        "/api/v1/users:import",
+        "/api/v1/users:export",
     )
 
 
@@ -72,8 +89,59 @@ class Setting(BaseSettings):
 
     TEST_DB_NAME: str = None
 
+    # Read replica. Reads fall back to primary if DB_REPLICA_HOST is not set
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: int | None = None
+    DB_REPLICA_USER: str | None = None
+    DB_REPLICA_PASS: str | None = None
+    # Seconds the read-your-writes cookie lives after a write
+    CONSISTENCY_TOKEN_MAX_AGE: int = 60
+
+    # Connection pool. DB_ECHO=None means "echo SQL everywhere but production"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_ECHO: bool | None = None
+
+    # Seconds between dirty checks of department summary view
+    # and max age of the view regardless of local writes
+    DEPARTMENT_SUMMARY_REFRESH_INTERVAL: int = 30
+    DEPARTMENT_SUMMARY_MAX_AGE: int = 600
+
+    # Purger of soft deleted subdivisions and users: seconds between runs,
+    # rows deleted per transaction and seconds of pause between batches
+    PURGE_INTERVAL: int = 60
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_BATCH_PAUSE: float = 0.1
+
+    # Per-process cache of authenticated users' status: max entries and
+    # seconds an entry lives (bounds staleness after other process' writes)
+    AUTH_STATUS_CACHE_SIZE: int = 10000
+    AUTH_STATUS_CACHE_TTL: int = 30
+
+    # Executor of bcrypt hashing and checks: "thread" or "process" pool,
+    # workers count and max calls waiting for a worker. Calls beyond the
+    # queue get 503 with Retry-After of PASSWORD_HASHING_RETRY_AFTER seconds
+    PASSWORD_HASHING_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASHING_WORKERS: int = max((os.cpu_count() or 1) - 1, 1)
+    PASSWORD_HASHING_QUEUE_SIZE: int = 32
+    PASSWORD_HASHING_RETRY_AFTER: int = 1
+
     auth_jwt: AuthJWT = AuthJWT()
     REQUIRE_AUTH: bool = False
+    # Local development only: opens ADMIN_ROUTES to anonymous callers
+    # while REQUIRE_AUTH is off. Admin routes are denied otherwise
+    DEBUG_ADMIN_ROUTES_WITHOUT_AUTH: bool = False
+    # Stateless auth: access tokens carry is_active/is_staff claims, which
+    # are trusted without db lookup. Deletion revokes user's earlier tokens
+    # (status isn't updatable through API), revocations are reloaded every
+    # TOKEN_REVOCATIONS_REFRESH_INTERVAL seconds. Status is read from db
+    # while revocations are older than TOKEN_REVOCATIONS_MAX_AGE
+    STATELESS_AUTH: bool = False
+    TOKEN_REVOCATIONS_REFRESH_INTERVAL: int = 5
+    TOKEN_REVOCATIONS_MAX_AGE: int = 60
 
     API_VERSION: str = "v1"
     BASE_URL = "localhost:8000/api" + "/" + API_VERSION
@@ -85,15 +153,36 @@ class Setting(BaseSettings):
 
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}/{self.DB_NAME}"
 
+    @property
+    def replica_database_url(self) -> str | None:
+        if not self.DB_REPLICA_HOST:
+            return None
+
+        user = self.DB_REPLICA_USER or self.DB_USER
+        password = self.DB_REPLICA_PASS or self.DB_PASS
+        port = self.DB_REPLICA_PORT or self.DB_PORT
+        db_name = self.TEST_DB_NAME if self.TESTING else self.DB_NAME
+
+        return f"postgresql+asyncpg://{user}:{password}@{self.DB_REPLICA_HOST}:{port}/{db_name}"
+
+    @property
+    def database_echo(self) -> bool:
+        if self.DB_ECHO is not None:
+            return self.DB_ECHO
+
+        return not self.PRODUCTION
+
     model_config = (
         SettingsConfigDict(
             extra="allow",
             env_file=os.path.abspath(os.path.join(BASE_DIR, ".env_local")),
+            env_nested_delimiter="__",
         )
         if not DOKERIZED
         else SettingsConfigDict(
             extra="allow",
             env_file=os.path.abspath(os.path.join(BASE_DIR, ".env_docker")),
+            env_nested_delimiter="__",
         )
     )
 
@@ -1,3 +1,5 @@
+from asyncio import CancelledError, create_task
+from contextlib import asynccontextmanager, suppress
 from logging import getLogger
 
 from fastapi import FastAPI, status
@@ -5,10 +7,30 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.requests import Request
 
+from config import (
+    settings,
+    async_session,
+    consistency_token_middleware,
+    CONSISTENCY_TOKEN_HEADER,
+    unit_of_work_middleware,
+)
+from common import batch_loader_middleware
+
 from files import api_v1_router
-from files.exceptions import JWTTokenHasNotBeenProvidedError
+from files.exceptions import (
+    DoesNotExistError,
+    JWTTokenHasNotBeenProvidedError,
+    UnprocessableEntityError,
+    ServiceIsOverloadedError,
+)
 
+from files.apps.subdivision import (
+    refresh_department_summary_periodically,
+    purge_soft_deleted_periodically,
+)
 from files.apps.user import (
+    password_hashing_executor,
+    refresh_token_revocations_periodically,
     verify_jwt_access_token,
     check_user_is_authorized_to_use_route,
 )
@@ -17,12 +39,32 @@ from files.apps.user import (
 logger = getLogger("common.base_logger")
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs background tasks while app is running
+    """
+    tasks = [
+        create_task(refresh_department_summary_periodically()),
+        create_task(purge_soft_deleted_periodically()),
+    ]
+    if settings.STATELESS_AUTH:
+        tasks.append(create_task(refresh_token_revocations_periodically()))
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(CancelledError):
+            await task
+    password_hashing_executor.shutdown()
+
+
 def create_app():
     """
     App initialization.
     Register middleware, includes routers
     """
-    app = FastAPI(title="Itrum_task")
+    app = FastAPI(title="Itrum_task", lifespan=lifespan)
 
     logger.info("REGISTER MIDDLEWARE")
 
@@ -47,12 +89,45 @@ def create_app():
             call_next=call_next,
         )
 
+    @app.middleware("http")
+    async def request_unit_of_work_middleware(
+        request: Request,
+        call_next,
+    ):
+        return await unit_of_work_middleware(
+            request=request,
+            call_next=call_next,
+            async_session=async_session,
+        )
+
+    @app.middleware("http")
+    async def request_batch_loader_middleware(
+        request: Request,
+        call_next,
+    ):
+        return await batch_loader_middleware(
+            request=request,
+            call_next=call_next,
+        )
+
+    @app.middleware("http")
+    async def replica_consistency_middleware(
+        request: Request,
+        call_next,
+    ):
+        return await consistency_token_middleware(
+            request=request,
+            call_next=call_next,
+            async_session=async_session,
+        )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[CONSISTENCY_TOKEN_HEADER],
     )
 
     logger.info("REGISTER ROUTES")
@@ -74,4 +149,41 @@ def create_app():
             },
         )
 
+    @app.exception_handler(UnprocessableEntityError)
+    async def register_unprocessable_entity_error(
+        request: Request,
+        error: UnprocessableEntityError,
+    ):
+        logger.error(str(error))
+
+        return JSONResponse(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            content={"error": error.message or "Incoming data is not valid"},
+        )
+
+    @app.exception_handler(DoesNotExistError)
+    async def register_does_not_exist_error(
+        request: Request,
+        error: DoesNotExistError,
+    ):
+        logger.error(str(error))
+
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"error": error.message or "Data does not exist"},
+        )
+
+    @app.exception_handler(ServiceIsOverloadedError)
+    async def register_service_is_overloaded_error(
+        request: Request,
+        error: ServiceIsOverloadedError,
+    ):
+        logger.error(str(error))
+
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"error": "Service is overloaded. Please try again later."},
+            headers={"Retry-After": str(settings.PASSWORD_HASHING_RETRY_AFTER)},
+        )
+
     return app
@@ -15,6 +15,8 @@ __all__ = (
     "subdivision_router",
     "project_router",
     "employee_router",
+    # monitoring
+    "monitoring_router",
 )
 
 from files.apps.user import (
@@ -36,3 +38,5 @@ from files.apps.subdivision import (
     project_router,
     employee_router,
 )
+
+from files.apps.monitoring import monitoring_router
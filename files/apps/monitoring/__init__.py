@@ -0,0 +1,3 @@
+__all__ = ("monitoring_router",)
+
+from .router import monitoring_router
@@ -0,0 +1,84 @@
+from fastapi import Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from files.apps.monitoring.query_plans import ListStatementEnum
+from files.apps.monitoring.services import MonitoringService, monitoring_service
+
+
+class MonitoringEndpoints:
+    def __init__(self, services: MonitoringService):
+        self.services = services
+
+    async def get_db_pools_status(self):
+        """
+        Returns connection pools telemetry
+        """
+        pools_status_dto = await self.services.get_db_pools_status()
+
+        return JSONResponse(
+            content=jsonable_encoder(pools_status_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
+    async def get_caches_stats(self):
+        """
+        Returns in-memory caches telemetry
+        """
+        caches_stats_dto = await self.services.get_caches_stats()
+
+        return JSONResponse(
+            content=jsonable_encoder(caches_stats_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
+    async def get_executors_stats(self):
+        """
+        Returns executors of blocking calls telemetry
+        """
+        executors_stats_dto = await self.services.get_executors_stats()
+
+        return JSONResponse(
+            content=jsonable_encoder(executors_stats_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
+    async def get_query_plan(
+        self,
+        request: Request,
+        statement: ListStatementEnum,
+        analyze: bool = Query(default=False),
+    ):
+        """
+        Returns EXPLAIN (FORMAT JSON) of list statement. Other query params
+        are passed to statement's builder, e.g. names=a|b&limit=20
+        """
+        params = {
+            name: value
+            for name, value in request.query_params.items()
+            if name not in ("statement", "analyze")
+        }
+        query_plan_dto = await self.services.explain_list_statement(
+            statement=statement,
+            params=params,
+            analyze=analyze,
+        )
+
+        return JSONResponse(
+            content=jsonable_encoder(query_plan_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
+    async def get_purge_progress(self):
+        """
+        Returns progress of soft deleted entities purger
+        """
+        purge_progress_dto = await self.services.get_purge_progress()
+
+        return JSONResponse(
+            content=jsonable_encoder(purge_progress_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
+
+monitoring_endpoints = MonitoringEndpoints(services=monitoring_service)
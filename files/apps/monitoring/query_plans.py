@@ -0,0 +1,62 @@
+from enum import Enum
+from typing import Callable, get_args, get_origin, get_type_hints
+
+from pydantic import validate_call
+from sqlalchemy import Select
+
+from files.apps.user import user_repository_adapter
+from files.apps.subdivision.repository import (
+    employee_repository,
+    subdivision_repository,
+    project_repository,
+)
+
+
+class ListStatementEnum(str, Enum):
+    LIST_USERS = "list_users"
+    LIST_SUBDIVISIONS = "list_subdivisions"
+    SUBDIVISIONS_STATS = "subdivisions_stats"
+    LIST_PROJECTS = "list_projects"
+    LIST_EMPLOYEES = "list_employees"
+
+
+# Same builders list_* repository methods execute
+LIST_STATEMENT_BUILDERS: dict[ListStatementEnum, Callable[..., Select]] = {
+    ListStatementEnum.LIST_USERS: (
+        user_repository_adapter.repository.build_list_users_query
+    ),
+    ListStatementEnum.LIST_SUBDIVISIONS: (
+        subdivision_repository.build_list_subdivisions_query
+    ),
+    ListStatementEnum.SUBDIVISIONS_STATS: (
+        subdivision_repository.build_subdivisions_stats_query
+    ),
+    ListStatementEnum.LIST_PROJECTS: project_repository.build_list_projects_query,
+    ListStatementEnum.LIST_EMPLOYEES: employee_repository.build_list_employees_query,
+}
+
+
+def build_list_statement(
+    statement: ListStatementEnum,
+    params: dict[str, str | list],
+) -> Select:
+    """
+    Builds list statement from raw (query string) params of its builder.
+    String values of list params are splitted by "|" like list endpoints do.
+    Raises pydantic ValidationError for unknown or invalid params
+    """
+    builder = LIST_STATEMENT_BUILDERS[statement]
+    type_hints = get_type_hints(builder)
+
+    builder_params = {}
+    for name, value in params.items():
+        annotation = type_hints.get(name)
+        # list[...] or list[...] | None
+        annotations = (annotation, *get_args(annotation))
+        if isinstance(value, str) and any(
+            get_origin(item) is list for item in annotations
+        ):
+            value = value.split("|")
+        builder_params[name] = value
+
+    return validate_call(builder)(**builder_params)
@@ -0,0 +1,29 @@
+from sqlalchemy import Select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from config import async_read_session
+from common import explain_query
+
+
+class QueryPlanRepository:
+    def __init__(self, async_session: async_sessionmaker[AsyncSession]):
+        self.async_session = async_session
+
+    async def explain(self, statement: Select, analyze: bool = False) -> dict:
+        async with self.async_session() as session:
+            plan = await explain_query(
+                session=session,
+                statement=statement,
+                analyze=analyze,
+            )
+
+            return plan
+
+    @staticmethod
+    def compile(statement: Select) -> str:
+        return str(statement.compile(dialect=postgresql.dialect()))
+
+
+# Plans are built where list queries run
+query_plan_repository = QueryPlanRepository(async_session=async_read_session)
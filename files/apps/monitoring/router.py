@@ -0,0 +1,67 @@
+from fastapi import APIRouter
+
+from files.apps.monitoring.endpoints import monitoring_endpoints
+from files.apps.monitoring.schemas import (
+    CacheStatsSchema,
+    DBPoolStatusSchema,
+    ExecutorStatsSchema,
+    QueryPlanSchema,
+)
+from files.apps.subdivision.schemas import PurgeProgressSchema
+
+
+monitoring_router = APIRouter(
+    prefix="/monitoring",
+    tags=["monitoring"],
+)
+
+
+monitoring_router.add_api_route(
+    path="/db-pools",
+    methods=["GET"],
+    endpoint=monitoring_endpoints.get_db_pools_status,
+    response_model=dict[str, DBPoolStatusSchema],
+    summary="DB pools status",
+    description="Returns checked out, idle and overflow connections "
+    "and checkout wait time for every connection pool",
+)
+
+monitoring_router.add_api_route(
+    path="/caches",
+    methods=["GET"],
+    endpoint=monitoring_endpoints.get_caches_stats,
+    response_model=dict[str, CacheStatsSchema],
+    summary="Caches stats",
+    description="Returns size, hits, misses, evictions and invalidations "
+    "of every in-memory cache of the process",
+)
+
+monitoring_router.add_api_route(
+    path="/executors",
+    methods=["GET"],
+    endpoint=monitoring_endpoints.get_executors_stats,
+    response_model=dict[str, ExecutorStatsSchema],
+    summary="Executors stats",
+    description="Returns queue depth, rejected calls and wait time for a worker "
+    "of every executor of blocking calls (e.g. password hashing)",
+)
+
+monitoring_router.add_api_route(
+    path="/query-plan",
+    methods=["GET"],
+    endpoint=monitoring_endpoints.get_query_plan,
+    response_model=QueryPlanSchema,
+    summary="List query plan",
+    description="Returns plan of list statement built with given params "
+    "(params of repository's build_list_*_query, lists splitted by \"|\")",
+)
+
+monitoring_router.add_api_route(
+    path="/purges",
+    methods=["GET"],
+    endpoint=monitoring_endpoints.get_purge_progress,
+    response_model=PurgeProgressSchema,
+    summary="Purge progress",
+    description="Returns progress of background removal of soft deleted "
+    "subdivisions and users: pending entities and deleted rows by table",
+)
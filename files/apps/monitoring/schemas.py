@@ -0,0 +1,49 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class DBPoolStatusSchema(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    checkouts_count: int
+    checkout_timeouts_count: int
+    checkout_wait_time_total: float
+    checkout_wait_time_avg: float
+    checkout_wait_time_max: float
+
+
+class CacheStatsSchema(BaseModel):
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_rate: float | None = None
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class ExecutorStatsSchema(BaseModel):
+    kind: str
+    max_workers: int
+    max_queue_size: int
+    in_flight: int
+    queue_depth: int
+    max_queue_depth: int
+    submitted: int
+    completed: int
+    rejected: int
+    wait_time_avg: float
+    wait_time_p95: float
+    wait_time_max: float
+
+
+class QueryPlanSchema(BaseModel):
+    statement: str
+    sql: str
+    plan: dict[str, Any]
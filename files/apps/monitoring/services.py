@@ -0,0 +1,111 @@
+from pydantic import ValidationError as PydanticValidationError
+
+from config import get_db_pools_status
+
+from files.apps.monitoring.query_plans import ListStatementEnum, build_list_statement
+from files.apps.monitoring.repository import QueryPlanRepository, query_plan_repository
+from files.apps.monitoring.schemas import (
+    CacheStatsSchema,
+    DBPoolStatusSchema,
+    ExecutorStatsSchema,
+    QueryPlanSchema,
+)
+from files.apps.subdivision import purge_progress
+from files.apps.subdivision.schemas import PurgeProgressSchema
+from files.apps.user import (
+    auth_status_cache,
+    verified_tokens_cache,
+    password_hashing_executor,
+)
+from files.exceptions import UnprocessableEntityError
+
+
+class MonitoringService:
+    def __init__(self, query_plan_repository: QueryPlanRepository):
+        self.query_plan_repository = query_plan_repository
+
+    async def get_db_pools_status(self) -> dict[str, DBPoolStatusSchema]:
+        """
+        Get connection pools occupancy
+        and checkout wait statistics
+        """
+        pools_status = {
+            pool_role: DBPoolStatusSchema(**pool_status)
+            for pool_role, pool_status in get_db_pools_status().items()
+        }
+
+        return pools_status
+
+    async def get_caches_stats(self) -> dict[str, CacheStatsSchema]:
+        """
+        Get size and hit/miss statistics
+        of this process' in-memory caches
+        """
+        caches = {
+            "auth_status": auth_status_cache,
+            "verified_tokens": verified_tokens_cache,
+        }
+
+        return {
+            cache_name: CacheStatsSchema(**cache.get_stats())
+            for cache_name, cache in caches.items()
+        }
+
+    async def get_executors_stats(self) -> dict[str, ExecutorStatsSchema]:
+        """
+        Get queue depth, rejections and wait time
+        of this process' executors of blocking calls
+        """
+        executors = {
+            "password_hashing": password_hashing_executor,
+        }
+
+        return {
+            executor_name: ExecutorStatsSchema(**executor.get_stats())
+            for executor_name, executor in executors.items()
+        }
+
+    async def explain_list_statement(
+        self,
+        statement: ListStatementEnum,
+        params: dict[str, str],
+        analyze: bool = False,
+    ) -> QueryPlanSchema:
+        """
+        Returns plan of the statement list request with
+        given params executes. analyze=True executes it
+        """
+        try:
+            query = build_list_statement(statement=statement, params=params)
+        except PydanticValidationError as error:
+            raise UnprocessableEntityError(
+                message=f"Invalid params of {statement.value}: "
+                + "; ".join(
+                    f'{".".join(map(str, details["loc"]))} {details["msg"]}'
+                    for details in error.errors()
+                ),
+                class_name=self.__class__.__name__,
+                method_name=self.explain_list_statement.__name__,
+                error_text=str(error),
+            )
+
+        plan = await self.query_plan_repository.explain(
+            statement=query,
+            analyze=analyze,
+        )
+
+        return QueryPlanSchema(
+            statement=statement.value,
+            sql=self.query_plan_repository.compile(statement=query),
+            plan=plan,
+        )
+
+    async def get_purge_progress(self) -> PurgeProgressSchema:
+        """
+        Get progress of this process' purger
+        of soft deleted subdivisions and users
+        """
+        return purge_progress.model_copy(deep=True)
+
+
+monitoring_service = MonitoringService(query_plan_repository=query_plan_repository)
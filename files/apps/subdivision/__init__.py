@@ -6,8 +6,16 @@ __all__ = (
     "subdivision_router",
     "project_router",
     "employee_router",
+    "refresh_department_summary_periodically",
+    "purge_soft_deleted_periodically",
+    "purge_progress",
 )
 
 from .models import Employee, Subdivision, Project
 from .enums import DepartmentEnum
 from .router import subdivision_router, project_router, employee_router
+from .tasks import (
+    refresh_department_summary_periodically,
+    purge_soft_deleted_periodically,
+    purge_progress,
+)
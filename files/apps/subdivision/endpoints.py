@@ -1,9 +1,14 @@
 from fastapi import Response, status, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.encoders import jsonable_encoder
 
 from config import settings
-from common import generate_url
+from common import (
+    generate_url,
+    CountStrategyEnum,
+    DataFormatEnum,
+    STREAM_MEDIA_TYPES,
+)
 
 from files.apps.subdivision.services import (
     EmployeeService,
@@ -16,10 +21,16 @@ from files.apps.subdivision.services import (
 from files.apps.subdivision.schemas import (
     BaseSubdivisionSchema,
     BaseProjectSchema,
+    BulkEmployeesSchema,
     SubdivisionSchema,
 )
 
-from files.apps.subdivision.enums import DepartmentEnum
+from files.apps.subdivision.enums import (
+    DepartmentEnum,
+    EmployeeFieldEnum,
+    SubdivisionIncludeEnum,
+)
+from files.exceptions import UnprocessableEntityError
 
 
 class EmployeeEndpoints:
@@ -29,28 +40,85 @@ class EmployeeEndpoints:
     async def list_employees(
         self,
         subdivision_id: int,
+        fields: str | None = Query(
+            default=None,
+            description='string of employee fields splitted by "|". '
+            "All fields are returned if not provided, username is always returned",
+            example="username|name|email",
+        ),
+        limit: int | None = Query(default=20),
+        cursor: str | None = Query(
+            default=None,
+            description='Opaque "next_cursor" of previous page',
+        ),
+        count: CountStrategyEnum = Query(
+            default=CountStrategyEnum.EXACT,
+            description='"exact" and "estimated" count subdivision\'s employees '
+            'in the page query, "none" skips total',
+        ),
     ):
-        employees_dto = await self.services.list_employees(
-            subdivision_id=subdivision_id
+        if fields:
+            try:
+                fields = [EmployeeFieldEnum(field) for field in fields.split("|")]
+            except ValueError as error:
+                available_fields = [field.value for field in EmployeeFieldEnum]
+                raise UnprocessableEntityError(
+                    message=f"Available fields: {available_fields}",
+                    class_name=self.__class__.__name__,
+                    method_name=self.list_employees.__name__,
+                    error_text=str(error),
+                )
+
+        employees_page_dto = await self.services.list_employees(
+            subdivision_id=subdivision_id,
+            fields=fields,
+            limit=limit,
+            cursor=cursor,
+            count=count,
         )
+
+        # Not selected fields are left unset and omitted from response
         return JSONResponse(
-            content=jsonable_encoder(employees_dto), status_code=status.HTTP_200_OK
+            content=jsonable_encoder(employees_page_dto, exclude_unset=True),
+            status_code=status.HTTP_200_OK,
         )
 
-    async def create_employee(self, subdivision: int, user: str):
+    async def create_employee(self, subdivision_id: int, user: str):
         await self.services.create_employee(
-            subdivision=subdivision,
+            subdivision=subdivision_id,
             user=user,
         )
         return Response(status_code=status.HTTP_201_CREATED)
 
+    async def create_employees(self, subdivision_id: int, data: BulkEmployeesSchema):
+        result_dto = await self.services.create_employees(
+            subdivision=subdivision_id,
+            users=data.usernames,
+        )
+
+        return JSONResponse(
+            content=jsonable_encoder(result_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
+    async def sync_employees(self, subdivision_id: int, data: BulkEmployeesSchema):
+        result_dto = await self.services.sync_employees(
+            subdivision=subdivision_id,
+            users=data.usernames,
+        )
+
+        return JSONResponse(
+            content=jsonable_encoder(result_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
     async def delete_employee(
         self,
-        subdivision: int,
+        subdivision_id: int,
         user: str,
     ):
         await self.services.delete_employee(
-            subdivision=subdivision,
+            subdivision=subdivision_id,
             user=user,
         )
         return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -86,6 +154,23 @@ class SubdivisionEndpoints:
             "employees_url": employees_url,
         }
 
+    def _parse_departments(
+        self, departments: str, method_name: str
+    ) -> list[DepartmentEnum]:
+        """
+        Parses string of departments splitted by "|"
+        """
+        try:
+            return [DepartmentEnum(department) for department in departments.split("|")]
+        except ValueError as error:
+            raise UnprocessableEntityError(
+                message="Department is not valid. "
+                f"Get departments {settings.BASE_URL}/subdivisions/departments",
+                class_name=self.__class__.__name__,
+                method_name=method_name,
+                error_text=str(error),
+            )
+
     @staticmethod
     async def list_departments():
         """
@@ -96,6 +181,18 @@ class SubdivisionEndpoints:
             status_code=status.HTTP_200_OK,
         )
 
+    async def get_departments_summary(self):
+        """
+        Returns headcount and projects completion of every department
+        with time of summary's last refresh
+        """
+        summary_dto = await self.services.get_departments_summary()
+
+        return JSONResponse(
+            content=jsonable_encoder(summary_dto),
+            status_code=status.HTTP_200_OK,
+        )
+
     async def list_subdivisions(
         self,
         names: str | None = Query(
@@ -103,13 +200,37 @@ class SubdivisionEndpoints:
             description='string of names splitted by "|"',
             example="name|name",
         ),
-        departments: DepartmentEnum | None = Query(
+        departments: str | None = Query(
             default=None,
-            description=f'string of available departments splitted by "|". Get departments {settings.BASE_URL}/subdivisions/departments',
+            description='string of available departments splitted by "|". '
+            f"Get departments {settings.BASE_URL}/subdivisions/departments",
             example="Public Safety|Transportation",
         ),
         limit: int | None = Query(default=20),
         offset: int | None = Query(default=0),
+        cursor: str | None = Query(
+            default=None,
+            description='Opaque "next_cursor" of previous page. '
+            "Offset is ignored if cursor is provided",
+        ),
+        count: CountStrategyEnum = Query(
+            default=CountStrategyEnum.EXACT,
+            description='"exact" counts filtered rows in the page query, '
+            '"estimated" uses planner statistics for unfiltered list, '
+            '"none" skips total',
+        ),
+        include: str | None = Query(
+            default=None,
+            description='string of optional data splitted by "|". '
+            '"employees_preview" adds first employees (username and name)',
+            example="employees_preview",
+        ),
+        preview_size: int = Query(
+            default=5,
+            ge=1,
+            le=100,
+            description="Number of employees in employees_preview",
+        ),
     ):
         """
         Get list of subdivisions and generates
@@ -119,31 +240,138 @@ class SubdivisionEndpoints:
         if names:
             names = names.split("|")
         if departments:
-            departments = departments.split("|")
-
-        subdivisions_list_dto = await self.services.list_subdivisions(
+            departments = self._parse_departments(
+                departments=departments,
+                method_name=self.list_subdivisions.__name__,
+            )
+        if include:
+            try:
+                include = [
+                    SubdivisionIncludeEnum(item) for item in include.split("|")
+                ]
+            except ValueError as error:
+                available_include = [item.value for item in SubdivisionIncludeEnum]
+                raise UnprocessableEntityError(
+                    message=f"Available include values: {available_include}",
+                    class_name=self.__class__.__name__,
+                    method_name=self.list_subdivisions.__name__,
+                    error_text=str(error),
+                )
+
+        subdivisions_page_dto = await self.services.list_subdivisions(
             names=names,
             departments=departments,
             offset=offset,
             limit=limit,
+            cursor=cursor,
+            count=count,
+            include=include,
+            preview_size=preview_size,
         )
 
         subdivisions_list_response = []
 
-        for subdivision in subdivisions_list_dto:
+        for subdivision in subdivisions_page_dto.items:
             urls = self._generate_urls(subdivision_id=subdivision.subdivision_id)
             subdivisions_list_response.append(
                 {
-                    **subdivision.model_dump(),
+                    # employees_preview is set only if it has been requested
+                    **subdivision.model_dump(exclude_unset=True),
                     "urls": urls,
                 }
             )
 
         return JSONResponse(
-            content=jsonable_encoder(subdivisions_list_response),
+            content=jsonable_encoder(
+                {
+                    **subdivisions_page_dto.model_dump(exclude={"items"}),
+                    "items": subdivisions_list_response,
+                }
+            ),
+            status_code=status.HTTP_200_OK,
+        )
+
+    async def get_subdivisions_stats(
+        self,
+        names: str | None = Query(
+            default=None,
+            description='string of names splitted by "|"',
+            example="name|name",
+        ),
+        departments: str | None = Query(
+            default=None,
+            description='string of available departments splitted by "|". '
+            f"Get departments {settings.BASE_URL}/subdivisions/departments",
+            example="Public Safety|Transportation",
+        ),
+        limit: int | None = Query(default=20),
+        offset: int | None = Query(default=0),
+        cursor: str | None = Query(
+            default=None,
+            description='Opaque "next_cursor" of previous page. '
+            "Offset is ignored if cursor is provided",
+        ),
+    ):
+        """
+        Get employee and project counts of subdivisions
+        filtered the same way as subdivisions list
+        """
+        if names:
+            names = names.split("|")
+        if departments:
+            departments = self._parse_departments(
+                departments=departments,
+                method_name=self.get_subdivisions_stats.__name__,
+            )
+
+        subdivisions_stats_dto = await self.services.get_subdivisions_stats(
+            names=names,
+            departments=departments,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+
+        return JSONResponse(
+            content=jsonable_encoder(subdivisions_stats_dto),
             status_code=status.HTTP_200_OK,
         )
 
+    async def export_subdivisions(
+        self,
+        format: DataFormatEnum = Query(default=DataFormatEnum.NDJSON),
+        names: str | None = Query(
+            default=None,
+            description='string of names splitted by "|"',
+            example="name|name",
+        ),
+        departments: str | None = Query(
+            default=None,
+            description='string of available departments splitted by "|". '
+            f"Get departments {settings.BASE_URL}/subdivisions/departments",
+            example="Public Safety|Transportation",
+        ),
+    ):
+        if names:
+            names = names.split("|")
+        if departments:
+            departments = self._parse_departments(
+                departments=departments,
+                method_name=self.export_subdivisions.__name__,
+            )
+
+        return StreamingResponse(
+            content=self.services.export_subdivisions(
+                format=format,
+                names=names,
+                departments=departments,
+            ),
+            media_type=STREAM_MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="subdivisions.{format.value}"'
+            },
+        )
+
     async def get_subdivision(
         self,
         subdivision_id: int,
@@ -238,6 +466,17 @@ class ProjectEndpoints:
         completed: bool | None = Query(default=None),
         limit: int | None = Query(default=20),
         offset: int | None = Query(default=0),
+        cursor: str | None = Query(
+            default=None,
+            description='Opaque "next_cursor" of previous page. '
+            "Offset is ignored if cursor is provided",
+        ),
+        count: CountStrategyEnum = Query(
+            default=CountStrategyEnum.EXACT,
+            description='"exact" counts filtered rows in the page query, '
+            '"estimated" uses planner statistics for unfiltered list, '
+            '"none" skips total',
+        ),
     ):
         """
         Get list of project and
@@ -247,25 +486,60 @@ class ProjectEndpoints:
         if names:
             names = names.split("|")
 
-        projects_list_dto = await self.services.list_projects(
+        projects_page_dto = await self.services.list_projects(
             subdivision_id=subdivision_id,
             names=names,
             completed=completed,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count=count,
         )
         projects_list_response = []
-        for project in projects_list_dto:
+        for project in projects_page_dto.items:
             urls = self._generate_urls(
                 subdivision_id=subdivision_id,
                 project_id=project.project_id,
             )
             projects_list_response.append({**project.model_dump(), "urls": urls})
+
         return JSONResponse(
-            content=jsonable_encoder(projects_list_response),
+            content=jsonable_encoder(
+                {
+                    **projects_page_dto.model_dump(exclude={"items"}),
+                    "items": projects_list_response,
+                }
+            ),
             status_code=status.HTTP_200_OK,
         )
 
+    async def export_projects(
+        self,
+        subdivision_id: int,
+        format: DataFormatEnum = Query(default=DataFormatEnum.NDJSON),
+        names: str | None = Query(
+            default=None,
+            description='string of names splitted by "|"',
+            example="name|name",
+        ),
+        completed: bool | None = Query(default=None),
+    ):
+        if names:
+            names = names.split("|")
+
+        return StreamingResponse(
+            content=self.services.export_projects(
+                format=format,
+                subdivision_id=subdivision_id,
+                names=names,
+                completed=completed,
+            ),
+            media_type=STREAM_MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="projects.{format.value}"'
+            },
+        )
+
     async def get_project(
         self,
         subdivision_id: int,
@@ -25,3 +25,27 @@ class DepartmentEnum(str, Enum):
     @classmethod
     def to_dict(cls):
         return {member.name: member.value for member in cls}
+
+
+class EmployeeFieldEnum(str, Enum):
+    """
+    Fields of employee that can be selected in employees list
+    """
+
+    USERNAME = "username"
+    EMAIL = "email"
+    NAME = "name"
+    PHONE_NUMBER = "phone_number"
+    AVATAR = "avatar"
+    ABOUT = "about"
+    IS_STAFF = "is_staff"
+    IS_ACTIVE = "is_active"
+    IS_SUPERUSER = "is_superuser"
+
+
+class SubdivisionIncludeEnum(str, Enum):
+    """
+    Optional data that can be included into subdivisions list
+    """
+
+    EMPLOYEES_PREVIEW = "employees_preview"
@@ -0,0 +1,43 @@
+from common import BatchLoader
+
+from files.apps.subdivision.repository import (
+    ProjectRepository,
+    SubdivisionRepository,
+    project_repository,
+    subdivision_repository,
+)
+from files.apps.subdivision.schemas import ProjectSchema, SubdivisionSchema
+
+
+class SubdivisionLoader(BatchLoader[int, SubdivisionSchema]):
+    """
+    Loads subdivisions by id, batched and memoized per request
+    """
+
+    def __init__(self, repository: SubdivisionRepository):
+        self.repository = repository
+
+    async def batch_load(self, keys: list[int]) -> dict[int, SubdivisionSchema]:
+        subdivisions = await self.repository.get_subdivisions(subdivision_ids=keys)
+
+        return {
+            subdivision.subdivision_id: subdivision for subdivision in subdivisions
+        }
+
+
+class ProjectLoader(BatchLoader[int, ProjectSchema]):
+    """
+    Loads projects by id, batched and memoized per request
+    """
+
+    def __init__(self, repository: ProjectRepository):
+        self.repository = repository
+
+    async def batch_load(self, keys: list[int]) -> dict[int, ProjectSchema]:
+        projects = await self.repository.get_projects(project_ids=keys)
+
+        return {project.project_id: project for project in projects}
+
+
+subdivision_loader = SubdivisionLoader(repository=subdivision_repository)
+project_loader = ProjectLoader(repository=project_repository)
@@ -12,6 +12,7 @@ from sqlalchemy import (
     DateTime,
     Numeric,
     ForeignKey,
+    Index,
     UniqueConstraint,
     CheckConstraint,
 )
@@ -41,11 +42,8 @@ class Employee(Base):
     )
 
     __table_args__ = (
-        UniqueConstraint(
-            "user",
-            "subdivision",
-            name="uq_user_subdivision",
-        ),
+        # Primary key (user, subdivision) serves lookups by user
+        Index("ix_employees_subdivision_user", "subdivision", "user"),
     )
 
 
@@ -58,7 +56,7 @@ class Subdivision(Base):
     __tablename__ = "subdivisions"
 
     subdivision_id: Mapped[int] = mapped_column(primary_key=True)
-    name: Mapped[str] = mapped_column(String(256))
+    name: Mapped[str] = mapped_column(String(256), index=True)
     description: Mapped[str | None] = mapped_column(
         String(4086),
         default=None,
@@ -72,6 +70,9 @@ class Subdivision(Base):
     department: Mapped[DepartmentEnum] = mapped_column(
         default=DepartmentEnum.ADMINISTRATIVE
     )
+    # Soft delete: subdivision is hidden once set,
+    # purger removes its projects, employees and row in batches
+    deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True))
 
     projects: Mapped[list["Project"]] = relationship(back_populates="subdivision")
     employees: Mapped[list[user_models_adapter.User]] = relationship(
@@ -80,6 +81,20 @@ class Subdivision(Base):
         viewonly=True,
     )
 
+    __table_args__ = (
+        Index(
+            "ix_subdivisions_department_subdivision_id",
+            "department",
+            "subdivision_id",
+        ),
+        # Purger's queue, only deleted rows are indexed
+        Index(
+            "ix_subdivisions_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
 
 class Project(Base):
     __tablename__ = "projects"
@@ -103,3 +118,13 @@ class Project(Base):
         )
     )
     subdivision: Mapped["Subdivision"] = relationship(back_populates="projects")
+
+    __table_args__ = (
+        Index("ix_projects_subdivision_id_project_id", "subdivision_id", "project_id"),
+        Index(
+            "ix_projects_subdivision_id_completed_project_id",
+            "subdivision_id",
+            "completed",
+            "project_id",
+        ),
+    )
@@ -1,18 +1,61 @@
-from sqlalchemy import select, insert, update, delete, and_
-from sqlalchemy.orm import load_only, defer, joinedload, selectinload
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Select,
+    String,
+    select,
+    insert,
+    update,
+    delete,
+    exists,
+    func,
+    literal,
+    and_,
+    any_,
+    all_,
+    bindparam,
+    true,
+    table,
+    column,
+    text,
+    Exists,
+    event,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, load_only, defer, joinedload, selectinload
 from sqlalchemy.exc import NoResultFound, MultipleResultsFound
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
-from config import async_session
+from config import async_session, async_read_session, async_stream_session
+from common import (
+    STREAM_CHUNK_SIZE,
+    PageSchema,
+    CountStrategyEnum,
+    create_page,
+    encode_cursor,
+    decode_cursor,
+    add_total_count_column,
+    get_estimated_rows_count,
+)
 
-from files.apps.subdivision.enums import DepartmentEnum
-from files.exceptions.does_not_exist_exception import DoesNotExistError
+from files.apps.subdivision.enums import DepartmentEnum, EmployeeFieldEnum
+from files.exceptions import DoesNotExistError, UnprocessableEntityError
 
 from files.apps.subdivision.models import Subdivision, Project, Employee
 from files.apps.subdivision.schemas import (
     BaseProjectSchema,
     BaseSubdivisionSchema,
+    BulkEmployeesResultSchema,
+    DepartmentSummarySchema,
+    DepartmentsSummarySchema,
+    SyncEmployeesResultSchema,
+    EmployeePreviewSchema,
     EmployeeSchema,
+    SubdivisionListItemSchema,
     SubdivisionSchema,
+    SubdivisionStatsSchema,
     ProjectSchema,
 )
 
@@ -22,62 +65,501 @@ from files.apps.user import user_models_adapter
 User = user_models_adapter.User
 
 
+SUBDIVISIONS_EXPORT_COLUMNS = (
+    "subdivision_id",
+    "name",
+    "description",
+    "creation_time",
+    "department",
+)
+PROJECTS_EXPORT_COLUMNS = (
+    "project_id",
+    "name",
+    "completed",
+    "start_time",
+    "complete_time",
+    "description",
+    "subdivision_id",
+)
+
+
+# Session.info key of session which marks view dirty on commit
+DEPARTMENT_SUMMARY_DIRTY_LISTENER_KEY = "department_summary_dirty_listener"
+
+department_summary_table = table(
+    "department_summary",
+    column("department", Subdivision.department.type),
+    column("subdivisions_count"),
+    column("headcount"),
+    column("projects_count"),
+    column("completed_projects_count"),
+    column("refreshed_at"),
+)
+
+
+def subdivision_is_visible(subdivision_id) -> Exists:
+    """
+    EXISTS of not soft deleted subdivision. Correlated to outer row
+    if subdivision_id is column, evaluated once if it is value
+    """
+    return exists().where(
+        Subdivision.subdivision_id == subdivision_id,
+        Subdivision.deleted_at.is_(None),
+    )
+
+
+def employee_user_is_visible():
+    """
+    Employee's user is not soft deleted. Compares username with array of
+    soft deleted ones (few rows of ix_users_deleted_at), so employees
+    are counted by index only scans without joining users
+    """
+    deleted_usernames = select(User.username).where(User.deleted_at.is_not(None))
+
+    return Employee.user != all_(func.array(deleted_usernames.scalar_subquery()))
+
+
+class DepartmentSummaryRepository:
+    """
+    Reads and refreshes department_summary materialized view.
+    Commits of writes of subdivisions, projects and employees mark
+    it dirty, refresh task refreshes dirty view
+    """
+
+    def __init__(
+        self,
+        async_session: async_sessionmaker[AsyncSession],
+        async_read_session: async_sessionmaker[AsyncSession] | None = None,
+    ):
+        self.async_session = async_session
+        self.async_read_session = async_read_session or async_session
+        self.is_dirty = False
+
+    def mark_dirty(self) -> None:
+        self.is_dirty = True
+
+    def mark_dirty_after_commit(self, session: AsyncSession) -> None:
+        """
+        Marks view dirty when session's transaction is committed.
+        Refresh running between write and commit doesn't see the write,
+        so flag set before commit would be reset with view left stale
+        """
+        if session.info.get(DEPARTMENT_SUMMARY_DIRTY_LISTENER_KEY):
+            return
+
+        session.info[DEPARTMENT_SUMMARY_DIRTY_LISTENER_KEY] = True
+
+        def mark_dirty_on_commit(sync_session: Session) -> None:
+            sync_session.info.pop(DEPARTMENT_SUMMARY_DIRTY_LISTENER_KEY, None)
+            self.mark_dirty()
+
+        # Rolled back session is closed unused, its listener never fires
+        event.listen(
+            session.sync_session, "after_commit", mark_dirty_on_commit, once=True
+        )
+
+    async def refresh(self) -> None:
+        """
+        Refreshes view without blocking its readers.
+        Flag is reset before refresh, so writes made during refresh
+        mark view dirty again
+        """
+        self.is_dirty = False
+        async with self.async_session() as session:
+            await session.execute(
+                text("REFRESH MATERIALIZED VIEW CONCURRENTLY department_summary")
+            )
+
+    async def get_departments_summary(self) -> DepartmentsSummarySchema:
+        """
+        Returns summary of every department, departments
+        without subdivisions have zero counts
+        """
+        async with self.async_read_session() as session:
+            query = select(department_summary_table)
+            query_result = await session.execute(statement=query)
+            rows = {row.department: row for row in query_result.all()}
+
+        departments = []
+        refreshed_at = None
+        for department in DepartmentEnum:
+            row = rows.get(department)
+            if row is None:
+                departments.append(DepartmentSummarySchema(department=department))
+                continue
+
+            refreshed_at = row.refreshed_at
+            departments.append(
+                DepartmentSummarySchema(
+                    department=department,
+                    subdivisions_count=row.subdivisions_count,
+                    headcount=row.headcount,
+                    projects_count=row.projects_count,
+                    completed_projects_count=row.completed_projects_count,
+                    completion_rate=(
+                        row.completed_projects_count / row.projects_count
+                        if row.projects_count
+                        else None
+                    ),
+                )
+            )
+
+        return DepartmentsSummarySchema(
+            refreshed_at=refreshed_at,
+            departments=departments,
+        )
+
+
 class EmployeeRepository:
-    def __init__(self, async_session: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        async_session: async_sessionmaker[AsyncSession],
+        async_read_session: async_sessionmaker[AsyncSession] | None = None,
+        async_stream_session: async_sessionmaker[AsyncSession] | None = None,
+        department_summary_repository: "DepartmentSummaryRepository | None" = None,
+    ):
         self.async_session = async_session
+        self.async_read_session = async_read_session or async_session
+        self.async_stream_session = async_stream_session
+        self.department_summary_repository = department_summary_repository
+
+    def _mark_department_summary_dirty(self, session: AsyncSession) -> None:
+        if self.department_summary_repository is not None:
+            self.department_summary_repository.mark_dirty_after_commit(
+                session=session
+            )
 
-    async def list_employees(self, subdivision_id) -> EmployeeSchema:
-        async with async_session() as session:
-            query = (
-                select(
-                    User.username,
-                    User.email,
-                    User.name,
-                    User.phone_number,
-                    User.avatar,
-                    User.about,
-                    User.is_staff,
-                    User.is_active,
-                    User.is_superuser,
-                )
-                .join(Employee, User.username == Employee.user)
-                .where(Subdivision.subdivision_id == subdivision_id)
+    def build_list_employees_query(
+        self,
+        subdivision_id: int,
+        fields: list[EmployeeFieldEnum] | None = None,
+        cursor: str | None = None,
+        with_total_count: bool = False,
+        limit: int | None = None,
+    ) -> Select:
+        """
+        Builds subdivision's employees query ordered by username.
+        Rows are read from ix_employees_subdivision_user in username order,
+        users are joined to hide soft deleted ones, employees of soft
+        deleted subdivision are hidden too.
+        If cursor is provided, seeks to rows after cursor's username.
+        with_total_count adds "total_count" column of subdivision's employees.
+        limit fetches one extra row, which tells if there is a next page
+        """
+        if not fields:
+            fields = list(EmployeeFieldEnum)
+        user_columns = [
+            getattr(User, field.value)
+            for field in fields
+            if field != EmployeeFieldEnum.USERNAME
+        ]
+
+        query = (
+            select(Employee.user.label("username"), *user_columns)
+            .join(User, User.username == Employee.user)
+            .order_by(Employee.user)
+        )
+
+        conditions = [
+            Employee.subdivision == subdivision_id,
+            subdivision_is_visible(subdivision_id),
+            User.deleted_at.is_(None),
+        ]
+
+        seek_conditions = []
+        if cursor is not None:
+            try:
+                cursor_values = decode_cursor(cursor=cursor, keys=("username",))
+            except ValueError as error:
+                raise UnprocessableEntityError(
+                    message="Cursor is not valid",
+                    class_name=self.__class__.__name__,
+                    method_name=self.build_list_employees_query.__name__,
+                    error_text=str(error),
+                )
+            seek_conditions.append(Employee.user > cursor_values["username"])
+
+        if with_total_count:
+            # Employees have no offset pages, and count(*) OVER() would join
+            # every employee with users before limit. Count subquery is
+            # an index only scan of ix_employees_subdivision_user, which
+            # skips soft deleted users like pages do
+            total_count = (
+                select(func.count())
+                .select_from(Employee)
+                .where(
+                    Employee.subdivision == subdivision_id,
+                    subdivision_is_visible(subdivision_id),
+                    employee_user_is_visible(),
+                )
             )
+            query = query.add_columns(
+                total_count.scalar_subquery().label("total_count")
+            )
+        query = query.where(*conditions, *seek_conditions)
+        if limit:
+            query = query.limit(limit=limit + 1)
+
+        return query
+
+    async def list_employees(
+        self,
+        subdivision_id: int,
+        fields: list[EmployeeFieldEnum] | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> PageSchema[EmployeeSchema]:
+        """
+        Returns page of subdivision's employees. Items have only
+        selected fields set (username is always selected).
+        Employees are always filtered by subdivision, so "estimated"
+        count is computed exactly
+        """
+        async with self.async_read_session() as session:
+            with_total_count = count != CountStrategyEnum.NONE
+
+            query = self.build_list_employees_query(
+                subdivision_id=subdivision_id,
+                fields=fields,
+                cursor=cursor,
+                with_total_count=with_total_count,
+                limit=limit,
+            )
+
             query_result = await session.execute(query)
 
             employees = query_result.all()
 
-            employee_dto = [
-                EmployeeSchema(
-                    username=employee.username,
-                    email=employee.email,
-                    name=employee.name,
-                    phone_number=employee.phone_number,
-                    avatar=employee.avatar,
-                    about=employee.about,
-                    is_staff=employee.is_staff,
-                    is_active=employee.is_active,
-                    is_superuser=employee.is_superuser,
-                )
-                for employee in employees
-            ]
-            return employee_dto
+            total = None
+            if with_total_count:
+                if len(employees) > 0:
+                    total = employees[0].total_count
+                elif cursor is None:
+                    total = 0
+
+            next_cursor = None
+            if limit and len(employees) > limit:
+                employees = employees[:limit]
+                next_cursor = encode_cursor({"username": employees[-1].username})
+
+            employee_dto = []
+            for employee in employees:
+                employee_fields = employee._asdict()
+                employee_fields.pop("total_count", None)
+                employee_dto.append(EmployeeSchema(**employee_fields))
+
+            return create_page(
+                items=employee_dto,
+                limit=limit,
+                offset=None,
+                cursor=cursor,
+                next_cursor=next_cursor,
+                total=total,
+                total_is_exact=with_total_count,
+            )
 
     async def create_employee(
         self,
         subdivision: int,
         user: str,
     ) -> None:
+        """
+        Adds user to subdivision in one statement: insert selects
+        from both referenced rows, so nothing is inserted if either
+        is missing, and existence of both is returned with it.
+        Raises DoesNotExistError naming the missing side
+        """
         async with self.async_session() as session:
-            try:
-                stmt = insert(Employee).values(
-                    user=user,
-                    subdivision=subdivision,
+            self._mark_department_summary_dirty(session=session)
+            subdivision_cte = (
+                select(Subdivision.subdivision_id)
+                .where(
+                    Subdivision.subdivision_id == subdivision,
+                    Subdivision.deleted_at.is_(None),
+                )
+                .cte("subdivision")
+            )
+            user_cte = (
+                select(User.username)
+                .where(User.username == user, User.deleted_at.is_(None))
+                .cte("user")
+            )
+            inserted_cte = (
+                pg_insert(Employee)
+                .from_select(
+                    ["user", "subdivision"],
+                    # Both CTEs have at most one row
+                    select(user_cte.c.username, subdivision_cte.c.subdivision_id)
+                    .select_from(user_cte)
+                    .join(subdivision_cte, true()),
+                )
+                .on_conflict_do_nothing()
+                .returning(Employee.user)
+                .cte("inserted")
+            )
+            stmt = select(
+                select(subdivision_cte).exists().label("subdivision_exists"),
+                select(user_cte).exists().label("user_exists"),
+                select(inserted_cte).exists().label("inserted"),
+            )
+            stmt_result = await session.execute(statement=stmt)
+            result = stmt_result.one()
+
+            if not result.subdivision_exists:
+                raise DoesNotExistError(
+                    message=f"Subdivision with id: {subdivision} does not exist",
+                    class_name=self.__class__.__name__,
+                    method_name=self.create_employee.__name__,
+                )
+            if not result.user_exists:
+                raise DoesNotExistError(
+                    message=f"User with username: {user} does not exist",
+                    class_name=self.__class__.__name__,
+                    method_name=self.create_employee.__name__,
+                )
+
+    async def create_employees(
+        self,
+        subdivision: int,
+        users: list[str],
+    ) -> BulkEmployeesResultSchema:
+        """
+        Adds many users to subdivision with one multi-row insert.
+        Unknown users are resolved with single "= ANY" lookup,
+        which also checks that subdivision exists, and skipped.
+        Already present pairs are left as is.
+        Raises DoesNotExistError if subdivision doesn't exist
+        """
+        # Keeps request's order, drops duplicates
+        users = list(dict.fromkeys(users))
+
+        async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
+            known_users = (
+                select(func.array_agg(User.username))
+                .where(
+                    User.username
+                    == any_(bindparam("usernames", value=users, type_=ARRAY(String))),
+                    User.deleted_at.is_(None),
+                )
+                .scalar_subquery()
+            )
+            query = select(
+                subdivision_is_visible(subdivision).label("subdivision_exists"),
+                known_users.label("known_users"),
+            )
+            query_result = await session.execute(statement=query)
+            lookup_result = query_result.one()
+
+            if not lookup_result.subdivision_exists:
+                raise DoesNotExistError(
+                    message=f"Subdivision with id: {subdivision} does not exist",
+                    class_name=self.__class__.__name__,
+                    method_name=self.create_employees.__name__,
+                )
+            known_users = set(lookup_result.known_users or ())
+
+            added_users = set()
+            if len(known_users) > 0:
+                stmt = (
+                    pg_insert(Employee)
+                    .values(
+                        [
+                            {"user": user, "subdivision": subdivision}
+                            for user in users
+                            if user in known_users
+                        ]
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(Employee.user)
+                )
+                stmt_result = await session.execute(statement=stmt)
+                added_users = set(stmt_result.scalars().all())
+
+            return BulkEmployeesResultSchema(
+                added=[user for user in users if user in added_users],
+                already_present=[
+                    user
+                    for user in users
+                    if user in known_users and user not in added_users
+                ],
+                unknown=[user for user in users if user not in known_users],
+            )
+
+    async def sync_employees(
+        self,
+        subdivision: int,
+        users: list[str],
+    ) -> SyncEmployeesResultSchema:
+        """
+        Makes users the exact set of subdivision's employees in one
+        statement: deletes extra pairs, inserts missing pairs of known
+        users and counts unknown users.
+        Raises DoesNotExistError if subdivision doesn't exist
+        """
+        users = list(dict.fromkeys(users))
+        usernames = bindparam("usernames", value=users, type_=ARRAY(String))
+
+        async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
+            # Deleted and inserted pairs never overlap, so both
+            # data-modifying CTEs are safe in one statement
+            deleted = (
+                delete(Employee)
+                .where(
+                    Employee.subdivision == subdivision,
+                    Employee.user != all_(usernames),
+                )
+                .returning(Employee.user)
+                .cte("deleted")
+            )
+            subdivision_exists = subdivision_is_visible(subdivision)
+            inserted = (
+                pg_insert(Employee)
+                .from_select(
+                    ["user", "subdivision"],
+                    select(User.username, literal(subdivision)).where(
+                        User.username == any_(usernames),
+                        User.deleted_at.is_(None),
+                        subdivision_exists,
+                    ),
+                )
+                .on_conflict_do_nothing()
+                .returning(Employee.user)
+                .cte("inserted")
+            )
+            known_count = select(func.count()).where(
+                User.username == any_(usernames), User.deleted_at.is_(None)
+            )
+
+            stmt = select(
+                select(func.count())
+                .select_from(inserted)
+                .scalar_subquery()
+                .label("added"),
+                select(func.count())
+                .select_from(deleted)
+                .scalar_subquery()
+                .label("removed"),
+                known_count.scalar_subquery().label("known"),
+                subdivision_exists.label("subdivision_exists"),
+            )
+            stmt_result = await session.execute(statement=stmt)
+            counts = stmt_result.one()
+
+            if not counts.subdivision_exists:
+                raise DoesNotExistError(
+                    message=f"Subdivision with id: {subdivision} does not exist",
+                    class_name=self.__class__.__name__,
+                    method_name=self.sync_employees.__name__,
                 )
-                await session.execute(statement=stmt)
-                await session.commit()
-            except:
-                pass
+
+            return SyncEmployeesResultSchema(
+                added=counts.added,
+                removed=counts.removed,
+                unknown=len(users) - counts.known,
+            )
 
     async def delete_employee(
         self,
@@ -85,32 +567,57 @@ class EmployeeRepository:
         user: str,
     ) -> None:
         async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
             try:
-                stmt = delete(Employee).where(
-                    and_(
-                        Employee.user == user,
-                        Employee.subdivision == subdivision,
+                async with session.begin_nested():
+                    stmt = delete(Employee).where(
+                        and_(
+                            Employee.user == user,
+                            Employee.subdivision == subdivision,
+                        )
                     )
-                )
-                await session.execute(stmt)
-                await session.commit()
+                    await session.execute(stmt)
             except:
                 pass
 
 
 class SubdivisionRepository:
-    def __init__(self, async_session: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        async_session: async_sessionmaker[AsyncSession],
+        async_read_session: async_sessionmaker[AsyncSession] | None = None,
+        async_stream_session: async_sessionmaker[AsyncSession] | None = None,
+        department_summary_repository: "DepartmentSummaryRepository | None" = None,
+    ):
         self.async_session = async_session
+        self.async_read_session = async_read_session or async_session
+        self.async_stream_session = async_stream_session
+        self.department_summary_repository = department_summary_repository
+
+    def _mark_department_summary_dirty(self, session: AsyncSession) -> None:
+        if self.department_summary_repository is not None:
+            self.department_summary_repository.mark_dirty_after_commit(
+                session=session
+            )
 
-    async def list_subdivisions(
+    def build_list_subdivisions_query(
         self,
-        names: list[str] | None,
-        departments: list[DepartmentEnum] | None,
-        limit: int | None = 20,
-        offset: int | None = 0,
-    ) -> list[SubdivisionSchema]:
-        async with self.async_session() as session:
-            query = select(Subdivision).options(
+        names: list[str] | None = None,
+        departments: list[DepartmentEnum] | None = None,
+        cursor: str | None = None,
+        with_total_count: bool = False,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Select:
+        """
+        Builds filtered subdivisions query ordered by subdivision_id.
+        If cursor is provided, seeks to rows after cursor's subdivision_id.
+        with_total_count adds "total_count" column of all filtered rows.
+        limit fetches one extra row, which tells if there is a next page
+        """
+        query = (
+            select(Subdivision)
+            .options(
                 load_only(
                     Subdivision.subdivision_id,
                     Subdivision.name,
@@ -118,42 +625,390 @@ class SubdivisionRepository:
                     Subdivision.creation_time,
                     Subdivision.department,
                     raiseload=True,
-                ).selectinload(Subdivision.employees)
+                )
+            )
+            .order_by(Subdivision.subdivision_id)
+        )
+
+        conditions = [Subdivision.deleted_at.is_(None)]
+        if names:
+            conditions.append(Subdivision.name.in_(names))
+        if departments:
+            conditions.append(Subdivision.department.in_(departments))
+
+        seek_conditions = []
+        if cursor is not None:
+            try:
+                cursor_values = decode_cursor(cursor=cursor, keys=("subdivision_id",))
+            except ValueError as error:
+                raise UnprocessableEntityError(
+                    message="Cursor is not valid",
+                    class_name=self.__class__.__name__,
+                    method_name=self.build_list_subdivisions_query.__name__,
+                    error_text=str(error),
+                )
+            seek_conditions.append(
+                Subdivision.subdivision_id > cursor_values["subdivision_id"]
             )
 
-            conditions = []
-            if names:
-                conditions.append(Subdivision.name.in_(names))
-            if departments:
-                conditions.append(Subdivision.department.in_(departments))
-            query = query.where(*conditions)
+        if with_total_count:
+            query = add_total_count_column(
+                query=query,
+                table=Subdivision,
+                conditions=conditions,
+                seek_conditions=seek_conditions,
+            )
+        query = query.where(*conditions, *seek_conditions)
+        if limit:
+            query = query.limit(limit=limit + 1)
+        if offset:
+            query = query.offset(offset=offset)
 
-            if limit:
-                query = query.limit(limit=limit)
-            if offset:
-                query = query.offset(offset=offset)
+        return query
+
+    async def list_subdivisions(
+        self,
+        names: list[str] | None,
+        departments: list[DepartmentEnum] | None,
+        limit: int | None = 20,
+        offset: int | None = 0,
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+        employees_preview_size: int | None = None,
+    ) -> PageSchema[SubdivisionListItemSchema]:
+        """
+        Returns page of subdivisions with employee_count.
+        If employees_preview_size is provided, every subdivision also
+        gets first employees_preview_size employees (username and name)
+        """
+        async with self.async_read_session() as session:
+            if cursor is not None:
+                offset = None
+
+            # Estimate is only meaningful for the whole table
+            total = None
+            if count == CountStrategyEnum.ESTIMATED and not names and not departments:
+                total = await get_estimated_rows_count(
+                    session=session, table_name=Subdivision.__tablename__
+                )
+            with_total_count = count == CountStrategyEnum.EXACT or (
+                count == CountStrategyEnum.ESTIMATED and total is None
+            )
+
+            query = self.build_list_subdivisions_query(
+                names=names,
+                departments=departments,
+                cursor=cursor,
+                with_total_count=with_total_count,
+                limit=limit,
+                offset=offset,
+            )
 
             query_result = await session.execute(query)
-            subdivisions = query_result.scalars().all()
+            subdivisions_rows = query_result.all()
+
+            if with_total_count:
+                if len(subdivisions_rows) > 0:
+                    total = subdivisions_rows[0].total_count
+                elif not offset and cursor is None:
+                    total = 0
+
+            subdivisions = [row.Subdivision for row in subdivisions_rows]
+
+            next_cursor = None
+            if limit and len(subdivisions) > limit:
+                subdivisions = subdivisions[:limit]
+                next_cursor = encode_cursor(
+                    {"subdivision_id": subdivisions[-1].subdivision_id}
+                )
+
+            subdivision_ids = [
+                subdivision.subdivision_id for subdivision in subdivisions
+            ]
+            employee_counts = await self._count_employees(
+                session=session,
+                subdivision_ids=subdivision_ids,
+            )
+            employees_previews = None
+            if employees_preview_size:
+                employees_previews = await self._get_employees_previews(
+                    session=session,
+                    subdivision_ids=subdivision_ids,
+                    preview_size=employees_preview_size,
+                )
 
             subdivisions_list_dto = []
 
             for subdivision in subdivisions:
-                subdivision_dto = SubdivisionSchema(
+                subdivision_dto = SubdivisionListItemSchema(
                     subdivision_id=subdivision.subdivision_id,
                     name=subdivision.name,
                     description=subdivision.description,
                     creation_time=subdivision.creation_time,
                     department=subdivision.department,
-                    employees=subdivision.employees,
+                    employee_count=employee_counts.get(
+                        subdivision.subdivision_id, 0
+                    ),
                 )
+                if employees_previews is not None:
+                    subdivision_dto.employees_preview = employees_previews.get(
+                        subdivision.subdivision_id, []
+                    )
 
                 subdivisions_list_dto.append(subdivision_dto)
 
-            return subdivisions_list_dto
+            return create_page(
+                items=subdivisions_list_dto,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                next_cursor=next_cursor,
+                total=total,
+                total_is_exact=with_total_count,
+            )
+
+    def build_subdivisions_stats_query(
+        self,
+        names: list[str] | None = None,
+        departments: list[DepartmentEnum] | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Select:
+        """
+        Builds statistics query of filtered subdivisions page.
+        Projects and employees of page's subdivisions are aggregated
+        with GROUP BY subdivision and joined to the page, so counts
+        are not multiplied by each other
+        """
+        page = (
+            self.build_list_subdivisions_query(
+                names=names,
+                departments=departments,
+                cursor=cursor,
+                limit=limit,
+                offset=offset,
+            )
+            .with_only_columns(
+                Subdivision.subdivision_id,
+                Subdivision.name,
+                Subdivision.department,
+            )
+            .cte("page")
+        )
+        # "= ANY(ARRAY(...))" keeps planner on subdivision_id indexes,
+        # IN (subquery) is planned as hash join over whole table
+        page_ids = any_(func.array(select(page.c.subdivision_id).scalar_subquery()))
+
+        projects_stats = (
+            select(
+                Project.subdivision_id,
+                func.count().label("projects_count"),
+                func.count()
+                .filter(Project.completed.is_(True))
+                .label("completed_projects_count"),
+                func.max(Project.start_time).label("latest_project_start_time"),
+            )
+            .where(Project.subdivision_id == page_ids)
+            .group_by(Project.subdivision_id)
+            .subquery("projects_stats")
+        )
+        employees_stats = (
+            select(
+                Employee.subdivision,
+                func.count().label("employee_count"),
+            )
+            .where(Employee.subdivision == page_ids, employee_user_is_visible())
+            .group_by(Employee.subdivision)
+            .subquery("employees_stats")
+        )
+
+        projects_count = func.coalesce(projects_stats.c.projects_count, 0)
+        completed_projects_count = func.coalesce(
+            projects_stats.c.completed_projects_count, 0
+        )
+
+        return (
+            select(
+                page.c.subdivision_id,
+                page.c.name,
+                page.c.department,
+                func.coalesce(employees_stats.c.employee_count, 0).label(
+                    "employee_count"
+                ),
+                projects_count.label("projects_count"),
+                completed_projects_count.label("completed_projects_count"),
+                (projects_count - completed_projects_count).label(
+                    "open_projects_count"
+                ),
+                projects_stats.c.latest_project_start_time,
+            )
+            .select_from(page)
+            .outerjoin(
+                projects_stats,
+                projects_stats.c.subdivision_id == page.c.subdivision_id,
+            )
+            .outerjoin(
+                employees_stats,
+                employees_stats.c.subdivision == page.c.subdivision_id,
+            )
+            .order_by(page.c.subdivision_id)
+        )
+
+    async def get_subdivisions_stats(
+        self,
+        names: list[str] | None = None,
+        departments: list[DepartmentEnum] | None = None,
+        limit: int | None = 20,
+        offset: int | None = 0,
+        cursor: str | None = None,
+    ) -> PageSchema[SubdivisionStatsSchema]:
+        """
+        Returns page of filtered subdivisions with employee
+        and project counts, computed in one statement
+        """
+        async with self.async_read_session() as session:
+            if cursor is not None:
+                offset = None
+
+            query = self.build_subdivisions_stats_query(
+                names=names,
+                departments=departments,
+                cursor=cursor,
+                limit=limit,
+                offset=offset,
+            )
+            query_result = await session.execute(statement=query)
+            subdivisions_stats = query_result.all()
+
+            next_cursor = None
+            if limit and len(subdivisions_stats) > limit:
+                subdivisions_stats = subdivisions_stats[:limit]
+                next_cursor = encode_cursor(
+                    {"subdivision_id": subdivisions_stats[-1].subdivision_id}
+                )
+
+            return create_page(
+                items=[
+                    SubdivisionStatsSchema(**subdivision_stats._asdict())
+                    for subdivision_stats in subdivisions_stats
+                ],
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                next_cursor=next_cursor,
+            )
+
+    @staticmethod
+    async def _count_employees(
+        session: AsyncSession,
+        subdivision_ids: list[int],
+    ) -> dict[int, int]:
+        """
+        Counts employees of page's subdivisions with one grouped
+        index only scan of ix_employees_subdivision_user,
+        soft deleted users are not counted
+        """
+        if len(subdivision_ids) == 0:
+            return {}
+
+        query = (
+            select(Employee.subdivision, func.count())
+            .where(
+                Employee.subdivision
+                == any_(
+                    bindparam(
+                        "subdivision_ids",
+                        value=subdivision_ids,
+                        type_=ARRAY(Integer),
+                    )
+                ),
+                employee_user_is_visible(),
+            )
+            .group_by(Employee.subdivision)
+        )
+        query_result = await session.execute(statement=query)
+
+        return dict(query_result.tuples().all())
+
+    @staticmethod
+    async def _get_employees_previews(
+        session: AsyncSession,
+        subdivision_ids: list[int],
+        preview_size: int,
+    ) -> dict[int, list[EmployeePreviewSchema]]:
+        """
+        Fetches usernames and names of first preview_size employees
+        (by username) with not deleted users of every subdivision.
+        Lateral subquery reads at most preview_size visible index entries
+        per subdivision, however large it is
+        """
+        if len(subdivision_ids) == 0:
+            return {}
+
+        employees_preview = (
+            select(Employee.user)
+            .where(
+                Employee.subdivision == Subdivision.subdivision_id,
+                employee_user_is_visible(),
+            )
+            .order_by(Employee.user)
+            .limit(preview_size)
+            .lateral("employees_preview")
+        )
+        query = (
+            select(Subdivision.subdivision_id, User.username, User.name)
+            .select_from(Subdivision)
+            .join(employees_preview, true())
+            .join(User, User.username == employees_preview.c.user)
+            .where(
+                Subdivision.subdivision_id
+                == any_(
+                    bindparam(
+                        "subdivision_ids",
+                        value=subdivision_ids,
+                        type_=ARRAY(Integer),
+                    )
+                )
+            )
+            .order_by(Subdivision.subdivision_id, User.username)
+        )
+        query_result = await session.execute(statement=query)
+
+        employees_previews = {}
+        for subdivision_id, username, name in query_result.tuples():
+            employees_previews.setdefault(subdivision_id, []).append(
+                EmployeePreviewSchema(username=username, name=name)
+            )
+
+        return employees_previews
+
+    async def stream_subdivisions(
+        self,
+        names: list[str] | None = None,
+        departments: list[DepartmentEnum] | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yields filtered subdivisions (SUBDIVISIONS_EXPORT_COLUMNS) in chunks
+        fetched from server-side cursor. Uses own session, so it can be
+        consumed after request's unit of work is closed
+        """
+        async with self.async_stream_session() as session:
+            query = self.build_list_subdivisions_query(
+                names=names,
+                departments=departments,
+            ).with_only_columns(
+                *(getattr(Subdivision, column) for column in SUBDIVISIONS_EXPORT_COLUMNS)
+            )
+            query_result = await session.stream(
+                statement=query.execution_options(yield_per=chunk_size)
+            )
+            async for rows in query_result.partitions(chunk_size):
+                yield rows
 
     async def get_subdivision(self, subdivision_id: int) -> SubdivisionSchema:
-        async with self.async_session() as session:
+        async with self.async_read_session() as session:
             try:
                 query = (
                     select(Subdivision)
@@ -166,7 +1021,10 @@ class SubdivisionRepository:
                         )
                         # .selectinload(Subdivision.employees)
                     )
-                    .where(Subdivision.subdivision_id == subdivision_id)
+                    .where(
+                        Subdivision.subdivision_id == subdivision_id,
+                        Subdivision.deleted_at.is_(None),
+                    )
                 )
 
                 query_result = await session.execute(statement=query)
@@ -183,17 +1041,50 @@ class SubdivisionRepository:
 
                 return subdivision_dto
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required subdivision doesn't exist",
                     class_name=self.__class__.__name__,
                     method_name=self.get_subdivision.__name__,
                     error_text=str(error),
                 )
 
+    async def get_subdivisions(
+        self, subdivision_ids: list[int]
+    ) -> list[SubdivisionSchema]:
+        """
+        Fetches subdivisions by ids with one "= ANY" query.
+        Missing subdivisions are skipped
+        """
+        async with self.async_read_session() as session:
+            query = select(
+                Subdivision.subdivision_id,
+                Subdivision.name,
+                Subdivision.description,
+                Subdivision.creation_time,
+                Subdivision.department,
+            ).where(
+                Subdivision.subdivision_id
+                == any_(
+                    bindparam(
+                        "subdivision_ids",
+                        value=subdivision_ids,
+                        type_=ARRAY(Integer),
+                    )
+                ),
+                Subdivision.deleted_at.is_(None),
+            )
+            query_result = await session.execute(statement=query)
+
+            return [
+                SubdivisionSchema(**subdivision._asdict())
+                for subdivision in query_result.all()
+            ]
+
     async def create_subdivision(
         self, data: BaseSubdivisionSchema
     ) -> SubdivisionSchema:
         async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
             stmt = (
                 insert(Subdivision)
                 .values(**data.model_dump())
@@ -218,12 +1109,11 @@ class SubdivisionRepository:
                 department=subdivision.department,
             )
 
-            await session.commit()
-
             return subdivision_dto
 
     async def update_subdivision(self, data: SubdivisionSchema) -> SubdivisionSchema:
         async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
             try:
                 update_dict = {}
 
@@ -237,7 +1127,10 @@ class SubdivisionRepository:
                 stmt = (
                     update(Subdivision)
                     .values(**update_dict)
-                    .where(Subdivision.subdivision_id == data.subdivision_id)
+                    .where(
+                        Subdivision.subdivision_id == data.subdivision_id,
+                        Subdivision.deleted_at.is_(None),
+                    )
                     .returning(Subdivision)
                     .options(
                         load_only(
@@ -261,32 +1154,47 @@ class SubdivisionRepository:
                     department=subdivision.department,
                 )
 
-                await session.commit()
-
                 return subdivision_dto
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required subdivision doesn't exist",
                     class_name=self.__class__.__name__,
                     method_name=self.update_subdivision.__name__,
                     error_text=str(error),
                 )
 
-    async def delete_subdivision(self, subdivision_id: int) -> None:
+    async def delete_subdivision(self, subdivision_id: int) -> SubdivisionSchema:
+        """
+        Soft deletes subdivision: it is hidden at once, its projects
+        and employees are removed in batches by purger
+        """
         async with self.async_session() as session:
-            stmt = (
-                delete(Subdivision)
-                .where(Subdivision.subdivision_id == subdivision_id)
-                .returning(
-                    Subdivision.subdivision_id,
-                    Subdivision.name,
-                    Subdivision.description,
-                    Subdivision.creation_time,
-                    Subdivision.department,
+            self._mark_department_summary_dirty(session=session)
+            try:
+                stmt = (
+                    update(Subdivision)
+                    .values(deleted_at=func.now())
+                    .where(
+                        Subdivision.subdivision_id == subdivision_id,
+                        Subdivision.deleted_at.is_(None),
+                    )
+                    .returning(
+                        Subdivision.subdivision_id,
+                        Subdivision.name,
+                        Subdivision.description,
+                        Subdivision.creation_time,
+                        Subdivision.department,
+                    )
+                )
+                stmt_result = await session.execute(statement=stmt)
+                subdivision: Subdivision = stmt_result.one()
+            except NoResultFound as error:
+                raise DoesNotExistError(
+                    message="Required subdivision doesn't exist",
+                    class_name=self.__class__.__name__,
+                    method_name=self.delete_subdivision.__name__,
+                    error_text=str(error),
                 )
-            )
-            stmt_result = await session.execute(statement=stmt)
-            subdivision: Subdivision = stmt_result.one()
 
             subdivision_dto = SubdivisionSchema(
                 subdivision_id=subdivision.subdivision_id,
@@ -296,36 +1204,54 @@ class SubdivisionRepository:
                 department=subdivision.department,
             )
 
-            await session.commit()
-
             return subdivision_dto
 
     async def check_subdivision_exist(self, subdivision_id: int) -> bool:
         async with self.async_session() as session:
-            query = (
-                select(Subdivision.subdivision_id)
-                .where(subdivision_id == subdivision_id)
-                .exists()
-            )
-            exists = await session.execute(statement=query)
+            query = select(subdivision_is_visible(subdivision_id))
+            query_result = await session.execute(statement=query)
 
-            return exists
+            return query_result.scalar_one()
 
 
 class ProjectRepository:
-    def __init__(self, async_session: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        async_session: async_sessionmaker[AsyncSession],
+        async_read_session: async_sessionmaker[AsyncSession] | None = None,
+        async_stream_session: async_sessionmaker[AsyncSession] | None = None,
+        department_summary_repository: "DepartmentSummaryRepository | None" = None,
+    ):
         self.async_session = async_session
+        self.async_read_session = async_read_session or async_session
+        self.async_stream_session = async_stream_session
+        self.department_summary_repository = department_summary_repository
+
+    def _mark_department_summary_dirty(self, session: AsyncSession) -> None:
+        if self.department_summary_repository is not None:
+            self.department_summary_repository.mark_dirty_after_commit(
+                session=session
+            )
 
-    async def list_projects(
+    def build_list_projects_query(
         self,
         subdivision_id: int,
         names: list[str] | None = None,
         completed: bool | None = None,
-        limit: int | None = 20,
-        offset: int | None = 0,
-    ) -> list[ProjectSchema]:
-        async with self.async_session() as session:
-            query = select(Project).options(
+        cursor: str | None = None,
+        with_total_count: bool = False,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Select:
+        """
+        Builds filtered subdivision's projects query ordered by project_id.
+        If cursor is provided, seeks to rows after cursor's project_id.
+        with_total_count adds "total_count" column of all filtered rows.
+        limit fetches one extra row, which tells if there is a next page
+        """
+        query = (
+            select(Project)
+            .options(
                 load_only(
                     Project.project_id,
                     Project.name,
@@ -337,21 +1263,90 @@ class ProjectRepository:
                     raiseload=True,
                 )
             )
+            .order_by(Project.project_id)
+        )
+
+        conditions = [
+            Project.subdivision_id == subdivision_id,
+            subdivision_is_visible(subdivision_id),
+        ]
+        if names:
+            conditions.append(Project.name.in_(names))
+        if completed is not None:
+            conditions.append(Project.completed == completed)
+
+        seek_conditions = []
+        if cursor is not None:
+            try:
+                cursor_values = decode_cursor(cursor=cursor, keys=("project_id",))
+            except ValueError as error:
+                raise UnprocessableEntityError(
+                    message="Cursor is not valid",
+                    class_name=self.__class__.__name__,
+                    method_name=self.build_list_projects_query.__name__,
+                    error_text=str(error),
+                )
+            seek_conditions.append(Project.project_id > cursor_values["project_id"])
+
+        if with_total_count:
+            query = add_total_count_column(
+                query=query,
+                table=Project,
+                conditions=conditions,
+                seek_conditions=seek_conditions,
+            )
+        query = query.where(and_(*conditions, *seek_conditions))
+        if limit:
+            query = query.limit(limit=limit + 1)
+        if offset:
+            query = query.offset(offset=offset)
 
-            conditions = [Project.subdivision_id == subdivision_id]
-            if names:
-                conditions.append(Project.name.in_(names))
-            if completed is not None:
-                conditions.append(Project.completed == completed)
-            query = query.where(and_(*conditions))
+        return query
 
-            if limit:
-                query = query.limit(limit=limit)
-            if offset:
-                query = query.offset(offset=offset)
+    async def list_projects(
+        self,
+        subdivision_id: int,
+        names: list[str] | None = None,
+        completed: bool | None = None,
+        limit: int | None = 20,
+        offset: int | None = 0,
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> PageSchema[ProjectSchema]:
+        async with self.async_read_session() as session:
+            if cursor is not None:
+                offset = None
+
+            # Projects are always filtered by subdivision, estimate of
+            # the whole table doesn't apply, so it's counted exactly
+            with_total_count = count != CountStrategyEnum.NONE
+
+            query = self.build_list_projects_query(
+                subdivision_id=subdivision_id,
+                names=names,
+                completed=completed,
+                cursor=cursor,
+                with_total_count=with_total_count,
+                limit=limit,
+                offset=offset,
+            )
 
             query_result = await session.execute(query)
-            projects = query_result.scalars().all()
+            projects_rows = query_result.all()
+
+            total = None
+            if with_total_count:
+                if len(projects_rows) > 0:
+                    total = projects_rows[0].total_count
+                elif not offset and cursor is None:
+                    total = 0
+
+            projects = [row.Project for row in projects_rows]
+
+            next_cursor = None
+            if limit and len(projects) > limit:
+                projects = projects[:limit]
+                next_cursor = encode_cursor({"project_id": projects[-1].project_id})
 
             projects_dto = [
                 ProjectSchema(
@@ -366,11 +1361,45 @@ class ProjectRepository:
                 for project in projects
             ]
 
-            return projects_dto
+            return create_page(
+                items=projects_dto,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                next_cursor=next_cursor,
+                total=total,
+                total_is_exact=with_total_count,
+            )
+
+    async def stream_projects(
+        self,
+        subdivision_id: int,
+        names: list[str] | None = None,
+        completed: bool | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yields filtered subdivision's projects (PROJECTS_EXPORT_COLUMNS) in
+        chunks fetched from server-side cursor. Uses own session, so it can
+        be consumed after request's unit of work is closed
+        """
+        async with self.async_stream_session() as session:
+            query = self.build_list_projects_query(
+                subdivision_id=subdivision_id,
+                names=names,
+                completed=completed,
+            ).with_only_columns(
+                *(getattr(Project, column) for column in PROJECTS_EXPORT_COLUMNS)
+            )
+            query_result = await session.stream(
+                statement=query.execution_options(yield_per=chunk_size)
+            )
+            async for rows in query_result.partitions(chunk_size):
+                yield rows
 
     async def get_project(self, project_id) -> ProjectSchema:
         try:
-            async with self.async_session() as session:
+            async with self.async_read_session() as session:
                 query = (
                     select(Project)
                     .options(
@@ -385,7 +1414,10 @@ class ProjectRepository:
                             raiseload=True,
                         )
                     )
-                    .where(Project.project_id == project_id)
+                    .where(
+                        Project.project_id == project_id,
+                        subdivision_is_visible(Project.subdivision_id),
+                    )
                 )
 
                 query_result = await session.execute(query)
@@ -403,8 +1435,8 @@ class ProjectRepository:
 
                 return project_dto
         except NoResultFound as error:
-            DoesNotExistError(
-                message="Required user doesn't exits",
+            raise DoesNotExistError(
+                message="Required project doesn't exist",
                 class_name=self.__class__.__name__,
                 method_name=self.get_project.__name__,
                 error_text=str(error),
@@ -412,13 +1444,54 @@ class ProjectRepository:
         except MultipleResultsFound as error:
             pass
 
+    async def get_projects(self, project_ids: list[int]) -> list[ProjectSchema]:
+        """
+        Fetches projects by ids with one "= ANY" query.
+        Missing projects are skipped
+        """
+        async with self.async_read_session() as session:
+            query = select(
+                Project.project_id,
+                Project.name,
+                Project.completed,
+                Project.start_time,
+                Project.complete_time,
+                Project.description,
+                Project.subdivision_id,
+            ).where(
+                Project.project_id
+                == any_(
+                    bindparam("project_ids", value=project_ids, type_=ARRAY(Integer))
+                ),
+                subdivision_is_visible(Project.subdivision_id),
+            )
+            query_result = await session.execute(statement=query)
+
+            return [
+                ProjectSchema(**project._asdict()) for project in query_result.all()
+            ]
+
     async def create_project(self, subdivision_id: int, data: BaseProjectSchema):
+        """
+        Inserts project selecting its values only if subdivision
+        is not soft deleted. Raises DoesNotExistError otherwise
+        """
         async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
+            values = {
+                **data.model_dump(exclude_none=True),
+                "subdivision_id": subdivision_id,
+            }
             stmt = (
                 insert(Project)
-                .values(
-                    **data.model_dump(exclude_none=True),
-                    subdivision_id=subdivision_id,
+                .from_select(
+                    list(values),
+                    select(
+                        *(
+                            literal(value, type_=Project.__table__.c[key].type)
+                            for key, value in values.items()
+                        )
+                    ).where(subdivision_is_visible(subdivision_id)),
                 )
                 .returning(
                     Project.project_id,
@@ -432,7 +1505,13 @@ class ProjectRepository:
             )
 
             stmt_result = await session.execute(stmt)
-            project: Project = stmt_result.one()
+            project: Project = stmt_result.one_or_none()
+            if project is None:
+                raise DoesNotExistError(
+                    message=f"Subdivision with id: {subdivision_id} does not exist",
+                    class_name=self.__class__.__name__,
+                    method_name=self.create_project.__name__,
+                )
 
             project_dto = ProjectSchema(
                 project_id=project.project_id,
@@ -443,18 +1522,21 @@ class ProjectRepository:
                 description=project.description,
                 subdivision_id=project.subdivision_id,
             )
-            await session.commit()
 
             return project_dto
 
     async def update_project(self, project_id: int, data: BaseProjectSchema):
         async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
             try:
 
                 stmt = (
                     update(Project)
                     .values(**data.model_dump())
-                    .where(Project.project_id == project_id)
+                    .where(
+                        Project.project_id == project_id,
+                        subdivision_is_visible(Project.subdivision_id),
+                    )
                     .returning(
                         Project.project_id,
                         Project.name,
@@ -478,24 +1560,179 @@ class ProjectRepository:
                     description=project.description,
                     subdivision_id=project.subdivision_id,
                 )
-                await session.commit()
 
                 return project_dto
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required project doesn't exist",
                     class_name=self.__class__.__name__,
-                    method_name=self.update_subdivision.__name__,
+                    method_name=self.update_project.__name__,
                     error_text=str(error),
                 )
 
     async def delete_project(self, project_id: int) -> None:
         async with self.async_session() as session:
+            self._mark_department_summary_dirty(session=session)
             stmt = delete(Project).where(Project.project_id == project_id)
             await session.execute(stmt)
-            await session.commit()
 
 
-employee_repository = EmployeeRepository(async_session=async_session)
-subdivision_repository = SubdivisionRepository(async_session=async_session)
-project_repository = ProjectRepository(async_session=async_session)
+class PurgeRepository:
+    """
+    Removes soft deleted subdivisions and users with their dependent rows.
+    Every method is one short transaction (own session outside of request),
+    so locks are held and WAL is generated for one batch at a time
+    """
+
+    def __init__(self, async_session: async_sessionmaker[AsyncSession]):
+        self.async_session = async_session
+
+    async def count_pending(self) -> tuple[int, int]:
+        """
+        Counts soft deleted subdivisions and users
+        with index only scans of partial deleted_at indexes
+        """
+        async with self.async_session() as session:
+            query = select(
+                select(func.count())
+                .where(Subdivision.deleted_at.is_not(None))
+                .scalar_subquery(),
+                select(func.count())
+                .where(User.deleted_at.is_not(None))
+                .scalar_subquery(),
+            )
+            query_result = await session.execute(statement=query)
+
+            return query_result.tuples().one()
+
+    async def get_deleted_subdivision_ids(self, limit: int) -> list[int]:
+        async with self.async_session() as session:
+            query = (
+                select(Subdivision.subdivision_id)
+                .where(Subdivision.deleted_at.is_not(None))
+                .order_by(Subdivision.deleted_at)
+                .limit(limit)
+            )
+            query_result = await session.execute(statement=query)
+
+            return list(query_result.scalars().all())
+
+    async def get_deleted_usernames(self, limit: int) -> list[str]:
+        async with self.async_session() as session:
+            query = (
+                select(User.username)
+                .where(User.deleted_at.is_not(None))
+                .order_by(User.deleted_at)
+                .limit(limit)
+            )
+            query_result = await session.execute(statement=query)
+
+            return list(query_result.scalars().all())
+
+    async def delete_projects_batch(self, subdivision_id: int, batch_size: int) -> int:
+        """
+        Deletes at most batch_size projects of subdivision,
+        returns number of deleted rows
+        """
+        async with self.async_session() as session:
+            batch = (
+                select(Project.project_id)
+                .where(Project.subdivision_id == subdivision_id)
+                .limit(batch_size)
+            )
+            stmt = delete(Project).where(
+                Project.project_id == any_(func.array(batch.scalar_subquery()))
+            )
+            stmt_result = await session.execute(statement=stmt)
+
+            return stmt_result.rowcount
+
+    async def delete_employees_batch(self, subdivision_id: int, batch_size: int) -> int:
+        """
+        Deletes at most batch_size memberships of subdivision,
+        returns number of deleted rows
+        """
+        async with self.async_session() as session:
+            batch = (
+                select(Employee.user)
+                .where(Employee.subdivision == subdivision_id)
+                .limit(batch_size)
+            )
+            stmt = delete(Employee).where(
+                Employee.subdivision == subdivision_id,
+                Employee.user == any_(func.array(batch.scalar_subquery())),
+            )
+            stmt_result = await session.execute(statement=stmt)
+
+            return stmt_result.rowcount
+
+    async def delete_memberships_batch(self, username: str, batch_size: int) -> int:
+        """
+        Deletes at most batch_size memberships of user,
+        returns number of deleted rows
+        """
+        async with self.async_session() as session:
+            batch = (
+                select(Employee.subdivision)
+                .where(Employee.user == username)
+                .limit(batch_size)
+            )
+            stmt = delete(Employee).where(
+                Employee.user == username,
+                Employee.subdivision == any_(func.array(batch.scalar_subquery())),
+            )
+            stmt_result = await session.execute(statement=stmt)
+
+            return stmt_result.rowcount
+
+    async def delete_subdivision(self, subdivision_id: int) -> bool:
+        """
+        Deletes soft deleted subdivision row. Rows added after
+        its batches are removed by ON DELETE CASCADE
+        """
+        async with self.async_session() as session:
+            stmt = delete(Subdivision).where(
+                Subdivision.subdivision_id == subdivision_id,
+                Subdivision.deleted_at.is_not(None),
+            )
+            stmt_result = await session.execute(statement=stmt)
+
+            return stmt_result.rowcount > 0
+
+    async def delete_user(self, username: str) -> bool:
+        """
+        Deletes soft deleted user row
+        """
+        async with self.async_session() as session:
+            stmt = delete(User).where(
+                User.username == username,
+                User.deleted_at.is_not(None),
+            )
+            stmt_result = await session.execute(statement=stmt)
+
+            return stmt_result.rowcount > 0
+
+
+department_summary_repository = DepartmentSummaryRepository(
+    async_session=async_session,
+    async_read_session=async_read_session,
+)
+employee_repository = EmployeeRepository(
+    async_session=async_session,
+    async_read_session=async_read_session,
+    async_stream_session=async_stream_session,
+    department_summary_repository=department_summary_repository,
+)
+subdivision_repository = SubdivisionRepository(
+    async_session=async_session,
+    async_read_session=async_read_session,
+    async_stream_session=async_stream_session,
+    department_summary_repository=department_summary_repository,
+)
+project_repository = ProjectRepository(
+    async_session=async_session,
+    async_read_session=async_read_session,
+    async_stream_session=async_stream_session,
+    department_summary_repository=department_summary_repository,
+)
+purge_repository = PurgeRepository(async_session=async_session)
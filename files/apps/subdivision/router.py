@@ -1,5 +1,7 @@
 from fastapi import APIRouter, status
 
+from common import PageSchema
+
 from files.apps.subdivision.endpoints import (
     employee_endpoints,
     subdivision_endpoints,
@@ -7,10 +9,16 @@ from files.apps.subdivision.endpoints import (
 )
 from files.apps.subdivision.enums import DepartmentEnum
 from files.apps.subdivision.schemas import (
+    BulkEmployeesResultSchema,
+    DepartmentsSummarySchema,
+    SyncEmployeesResultSchema,
+    EmployeeSchema,
     ProjectResponseSchema,
     ProjectSchema,
+    SubdivisionListItemResponseSchema,
     SubdivisionResponseSchema,
     SubdivisionSchema,
+    SubdivisionStatsSchema,
 )
 
 employee_router = APIRouter(
@@ -32,10 +40,19 @@ employee_router.add_api_route(
     path="",
     methods=["GET"],
     endpoint=employee_endpoints.list_employees,
-    response_model=None,
+    response_model=PageSchema[EmployeeSchema],
     summary="List employees",
     description="Get employees(users) of concrete subdivision",
 )
+employee_router.add_api_route(
+    path="",
+    methods=["PUT"],
+    endpoint=employee_endpoints.sync_employees,
+    response_model=SyncEmployeesResultSchema,
+    summary="Sync employees",
+    description="Replaces subdivision's employees with complete list of usernames "
+    "in one transaction, unknown usernames are skipped",
+)
 employee_router.add_api_route(
     path="/{user}",
     methods=["POST"],
@@ -45,6 +62,15 @@ employee_router.add_api_route(
     summary="Create employee",
     description="Creates many-to-many relationship between user and subdivision",
 )
+employee_router.add_api_route(
+    path=":bulk",
+    methods=["POST"],
+    endpoint=employee_endpoints.create_employees,
+    response_model=BulkEmployeesResultSchema,
+    summary="Create employees in bulk",
+    description="Adds list of users to subdivision with one insert and reports "
+    "added, already present and unknown users",
+)
 employee_router.add_api_route(
     path="/{user}",
     methods=["DELETE"],
@@ -64,15 +90,45 @@ subdivision_router.add_api_route(
     description="List available departments",
 )
 
+subdivision_router.add_api_route(
+    path="/departments/summary",
+    methods=["GET"],
+    endpoint=subdivision_endpoints.get_departments_summary,
+    response_model=DepartmentsSummarySchema,
+    summary="Departments summary",
+    description="Headcount and projects completion rate of every department. "
+    "Summary is refreshed periodically and after writes, "
+    '"refreshed_at" is time of its last refresh',
+)
+
 subdivision_router.add_api_route(
     path="",
     methods=["GET"],
     endpoint=subdivision_endpoints.list_subdivisions,
-    response_model=list[SubdivisionResponseSchema],
+    response_model=PageSchema[SubdivisionListItemResponseSchema],
     summary="List subdivisions",
     description="List subdivisions",
 )
 
+subdivision_router.add_api_route(
+    path="/stats",
+    methods=["GET"],
+    endpoint=subdivision_endpoints.get_subdivisions_stats,
+    response_model=PageSchema[SubdivisionStatsSchema],
+    summary="Subdivisions statistics",
+    description="Employee count, total/completed/open project counts and latest "
+    "project start of every subdivision, filtered like subdivisions list",
+)
+
+subdivision_router.add_api_route(
+    path=":export",
+    methods=["GET"],
+    endpoint=subdivision_endpoints.export_subdivisions,
+    response_model=None,
+    summary="Export subdivisions",
+    description="Streams filtered subdivisions as NDJSON or CSV",
+)
+
 subdivision_router.add_api_route(
     path="/{subdivision_id}",
     methods=["GET"],
@@ -118,11 +174,20 @@ project_router.add_api_route(
     path="",
     methods=["GET"],
     endpoint=project_endpoints.list_projects,
-    response_model=list[ProjectResponseSchema],
+    response_model=PageSchema[ProjectResponseSchema],
     summary="List projects",
     description="List subdivisions and returns projectdata and HATEOAS urls",
 )
 
+project_router.add_api_route(
+    path=":export",
+    methods=["GET"],
+    endpoint=project_endpoints.export_projects,
+    response_model=None,
+    summary="Export projects",
+    description="Streams filtered subdivision's projects as NDJSON or CSV",
+)
+
 project_router.add_api_route(
     path="/{project_id}",
     methods=["GET"],
@@ -1,7 +1,7 @@
 from typing import Any
 from typing_extensions import Annotated
 from datetime import datetime, UTC
-from pydantic import BaseModel, AfterValidator, ConfigDict
+from pydantic import BaseModel, AfterValidator, ConfigDict, Field
 
 from files.apps.subdivision.enums import DepartmentEnum
 from files.apps.user.validators import validate_string_is_not_empty
@@ -14,11 +14,28 @@ class EmployeeSchema(BaseModel):
     avatar: str | None = None
     about: str | None = None
     phone_number: str | None = None
-    is_supeuser: bool | None = None
+    is_superuser: bool | None = None
     is_staff: bool | None = None
     is_active: bool | None = None
 
 
+class BulkEmployeesSchema(BaseModel):
+    # Two bind params per row, keeps insert under asyncpg's 32767 limit
+    usernames: list[str] = Field(max_length=10000)
+
+
+class BulkEmployeesResultSchema(BaseModel):
+    added: list[str] = []
+    already_present: list[str] = []
+    unknown: list[str] = []
+
+
+class SyncEmployeesResultSchema(BaseModel):
+    added: int = 0
+    removed: int = 0
+    unknown: int = 0
+
+
 class BaseSubdivisionSchema(BaseModel):
     name: Annotated[str, AfterValidator(validate_string_is_not_empty)]
     description: Annotated[str | None, AfterValidator(validate_string_is_not_empty)] = (
@@ -32,6 +49,60 @@ class SubdivisionSchema(BaseSubdivisionSchema):
     creation_time: datetime | None = None
 
 
+class EmployeePreviewSchema(BaseModel):
+    username: str
+    name: str | None = None
+
+
+class SubdivisionListItemSchema(SubdivisionSchema):
+    employee_count: int = 0
+    # Set only if preview has been requested
+    employees_preview: list[EmployeePreviewSchema] | None = None
+
+
+class SubdivisionStatsSchema(BaseModel):
+    subdivision_id: int
+    name: str
+    department: DepartmentEnum
+    employee_count: int = 0
+    projects_count: int = 0
+    completed_projects_count: int = 0
+    open_projects_count: int = 0
+    latest_project_start_time: datetime | None = None
+
+
+class DepartmentSummarySchema(BaseModel):
+    department: DepartmentEnum
+    subdivisions_count: int = 0
+    # Distinct users employed in department's subdivisions
+    headcount: int = 0
+    projects_count: int = 0
+    completed_projects_count: int = 0
+    completion_rate: float | None = None
+
+
+class DepartmentsSummarySchema(BaseModel):
+    # None if no department has subdivisions yet
+    refreshed_at: datetime | None = None
+    departments: list[DepartmentSummarySchema] = []
+
+
+class PurgeProgressSchema(BaseModel):
+    is_running: bool = False
+    # "subdivision <id>" or "user <username>" being purged
+    current_entity: str | None = None
+    # Soft deleted entities left at the start of current (or last) run
+    pending_subdivisions: int = 0
+    pending_users: int = 0
+    purged_subdivisions: int = 0
+    purged_users: int = 0
+    # Dependent rows deleted since start, by table
+    deleted_rows: dict[str, int] = {}
+    last_run_started_at: datetime | None = None
+    last_batch_at: datetime | None = None
+    last_error: str | None = None
+
+
 class BaseProjectSchema(BaseModel):
     name: Annotated[str, AfterValidator(validate_string_is_not_empty)]
     completed: bool = False
@@ -58,6 +129,10 @@ class SubdivisionResponseSchema(SubdivisionSchema):
     urls: SubdivisionUrlsSchema
 
 
+class SubdivisionListItemResponseSchema(SubdivisionListItemSchema):
+    urls: SubdivisionUrlsSchema
+
+
 class ProjectUrlsSchema(BaseModel):
     project_url: str
 
@@ -1,18 +1,41 @@
-from files.apps.subdivision.enums import DepartmentEnum
+from typing import AsyncIterator
+
+from common import PageSchema, CountStrategyEnum, DataFormatEnum, stream_rows
+
+from files.apps.subdivision.enums import (
+    DepartmentEnum,
+    EmployeeFieldEnum,
+    SubdivisionIncludeEnum,
+)
 from files.apps.subdivision.repository import (
+    PROJECTS_EXPORT_COLUMNS,
+    SUBDIVISIONS_EXPORT_COLUMNS,
+    DepartmentSummaryRepository,
     EmployeeRepository,
     ProjectRepository,
     SubdivisionRepository,
+    department_summary_repository,
     employee_repository,
     subdivision_repository,
     project_repository,
 )
+from files.apps.subdivision.loaders import (
+    ProjectLoader,
+    SubdivisionLoader,
+    project_loader,
+    subdivision_loader,
+)
 from files.apps.subdivision.schemas import (
     BaseSubdivisionSchema,
     BaseProjectSchema,
+    BulkEmployeesResultSchema,
+    DepartmentsSummarySchema,
+    SyncEmployeesResultSchema,
     EmployeeSchema,
     ProjectSchema,
+    SubdivisionListItemSchema,
     SubdivisionSchema,
+    SubdivisionStatsSchema,
 )
 
 from files.apps.user import UserRepositoryAdapter, user_repository_adapter
@@ -30,8 +53,21 @@ class EmployeeService:
         self.subdivision_repository = subdivision_repository
         self.user_repository_adapter = user_repository_adapter
 
-    async def list_employees(self, subdivision_id: int) -> EmployeeSchema:
-        result = await self.repository.list_employees(subdivision_id=subdivision_id)
+    async def list_employees(
+        self,
+        subdivision_id: int,
+        fields: list[EmployeeFieldEnum] | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> PageSchema[EmployeeSchema]:
+        result = await self.repository.list_employees(
+            subdivision_id=subdivision_id,
+            fields=fields,
+            limit=limit,
+            cursor=cursor,
+            count=count,
+        )
         return result
 
     async def create_employee(
@@ -39,30 +75,47 @@ class EmployeeService:
         subdivision: int,
         user: str,
     ) -> None:
+        """
+        Adds user to subdivision. Existence of both is checked
+        by the insert statement itself
+        """
+        await self.repository.create_employee(
+            subdivision=subdivision,
+            user=user,
+        )
 
-        subdivision_exists = self.subdivision_repository.check_subdivision_exist(subdivision_id=subdivision)
-        user_exists = self.user_repository_adapter.check_user_exists(username=user)
+    async def create_employees(
+        self,
+        subdivision: int,
+        users: list[str],
+    ) -> BulkEmployeesResultSchema:
+        """
+        Adds users to subdivision in bulk and reports
+        added, already present and unknown users
+        """
+        result = await self.repository.create_employees(
+            subdivision=subdivision,
+            users=users,
+        )
 
-        if not subdivision_exists:
-            raise DoesNotExistError(
-                message=f"Subdivision with id: {subdivision} does not exist",
-                class_name=self.__class__.__name__,
-                method_name=self.get_user.__name__,
-                error_text=f"Subdivision with id: {subdivision} does not exist",
-            )
-        if not user_exists:
-            raise DoesNotExistError(
-                message=f"User with username: {user} does not exist",
-                class_name=self.__class__.__name__,
-                method_name=self.get_user.__name__,
-                error_text=f"User with username: {user} does not exist",
-            )
+        return result
 
-        await self.repository.create_employee(
+    async def sync_employees(
+        self,
+        subdivision: int,
+        users: list[str],
+    ) -> SyncEmployeesResultSchema:
+        """
+        Replaces subdivision's employees with provided roster
+        and returns counts of added and removed employees
+        """
+        result = await self.repository.sync_employees(
             subdivision=subdivision,
-            user=user,
+            users=users,
         )
 
+        return result
+
     async def delete_employee(
         self,
         subdivision: int,
@@ -75,8 +128,15 @@ class EmployeeService:
 
 
 class SubdivisionService:
-    def __init__(self, repository: SubdivisionRepository):
+    def __init__(
+        self,
+        repository: SubdivisionRepository,
+        loader: SubdivisionLoader,
+        department_summary_repository: DepartmentSummaryRepository,
+    ):
         self.repository = repository
+        self.loader = loader
+        self.department_summary_repository = department_summary_repository
 
     async def list_subdivisions(
         self,
@@ -84,29 +144,92 @@ class SubdivisionService:
         departments: list[DepartmentEnum] | None,
         limit: int | None = 20,
         offset: int | None = 0,
-    ) -> list[SubdivisionSchema]:
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+        include: list[SubdivisionIncludeEnum] | None = None,
+        preview_size: int = 5,
+    ) -> PageSchema[SubdivisionListItemSchema]:
         """
         Get subdivisions list with pagination
         add link for every subdivision
         """
+        employees_preview_size = None
+        if include and SubdivisionIncludeEnum.EMPLOYEES_PREVIEW in include:
+            employees_preview_size = preview_size
+
         subdivisions_dto = await self.repository.list_subdivisions(
             names=names,
             departments=departments,
             offset=offset,
             limit=limit,
+            cursor=cursor,
+            count=count,
+            employees_preview_size=employees_preview_size,
         )
 
         return subdivisions_dto
 
+    async def get_subdivisions_stats(
+        self,
+        names: list[str] | None,
+        departments: list[DepartmentEnum] | None,
+        limit: int | None = 20,
+        offset: int | None = 0,
+        cursor: str | None = None,
+    ) -> PageSchema[SubdivisionStatsSchema]:
+        """
+        Get employee and project counts of filtered subdivisions page
+        """
+        subdivisions_stats_dto = await self.repository.get_subdivisions_stats(
+            names=names,
+            departments=departments,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+
+        return subdivisions_stats_dto
+
+    async def get_departments_summary(self) -> DepartmentsSummarySchema:
+        """
+        Get headcount and projects completion of every department
+        from periodically refreshed summary
+        """
+        summary_dto = await self.department_summary_repository.get_departments_summary()
+
+        return summary_dto
+
+    def export_subdivisions(
+        self,
+        format: DataFormatEnum,
+        names: list[str] | None = None,
+        departments: list[DepartmentEnum] | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Returns lazy stream of filtered subdivisions serialized to format
+        """
+        return stream_rows(
+            partitions=self.repository.stream_subdivisions(
+                names=names,
+                departments=departments,
+            ),
+            columns=SUBDIVISIONS_EXPORT_COLUMNS,
+            format=format,
+        )
+
     async def get_subdivision(self, subdivision_id: int) -> SubdivisionSchema:
         """
         get subdivision data from db
         generate link to projects
         generate links for subdivision actions
         """
-        subdivision_dto = await self.repository.get_subdivision(
-            subdivision_id=subdivision_id
-        )
+        subdivision_dto = await self.loader.load(subdivision_id)
+        if subdivision_dto is None:
+            raise DoesNotExistError(
+                message=f"Subdivision with id: {subdivision_id} does not exist",
+                class_name=self.__class__.__name__,
+                method_name=self.get_subdivision.__name__,
+            )
 
         return subdivision_dto
 
@@ -127,6 +250,7 @@ class SubdivisionService:
         returns updated result
         """
         subdivision_dto = await self.repository.update_subdivision(data=data)
+        self.loader.clear(data.subdivision_id)
 
         return subdivision_dto
 
@@ -135,6 +259,7 @@ class SubdivisionService:
         Deletes selected subdivision
         """
         await self.repository.delete_subdivision(subdivision_id=subdivision_id)
+        self.loader.clear(subdivision_id)
 
     # async def list_employees(self, subdivision_id: int) -> UserSchema:
     #     """
@@ -148,8 +273,13 @@ class SubdivisionService:
 
 
 class ProjectService:
-    def __init__(self, repository: ProjectRepository):
+    def __init__(
+        self,
+        repository: ProjectRepository,
+        loader: ProjectLoader,
+    ):
         self.repository = repository
+        self.loader = loader
 
     async def list_projects(
         self,
@@ -158,7 +288,9 @@ class ProjectService:
         completed: bool | None = None,
         limit: int | None = 20,
         offset: int | None = 0,
-    ) -> list[ProjectSchema]:
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> PageSchema[ProjectSchema]:
         """
         Get projects list with pagination
         add link for every project
@@ -169,15 +301,43 @@ class ProjectService:
             completed=completed,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count=count,
         )
 
         return projects_dto
 
+    def export_projects(
+        self,
+        format: DataFormatEnum,
+        subdivision_id: int,
+        names: list[str] | None = None,
+        completed: bool | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Returns lazy stream of filtered subdivision's projects serialized to format
+        """
+        return stream_rows(
+            partitions=self.repository.stream_projects(
+                subdivision_id=subdivision_id,
+                names=names,
+                completed=completed,
+            ),
+            columns=PROJECTS_EXPORT_COLUMNS,
+            format=format,
+        )
+
     async def get_project(self, project_id: int) -> ProjectSchema:
         """
         Get project data from db
         """
-        project_dto = await self.repository.get_project(project_id=project_id)
+        project_dto = await self.loader.load(project_id)
+        if project_dto is None:
+            raise DoesNotExistError(
+                message=f"Project with id: {project_id} does not exist",
+                class_name=self.__class__.__name__,
+                method_name=self.get_project.__name__,
+            )
 
         return project_dto
 
@@ -208,6 +368,7 @@ class ProjectService:
             project_id=project_id,
             data=data,
         )
+        self.loader.clear(project_id)
 
         return project_dto
 
@@ -216,6 +377,7 @@ class ProjectService:
         Deletes project by id
         """
         await self.repository.delete_project(project_id=project_id)
+        self.loader.clear(project_id)
 
 
 employee_service = EmployeeService(
@@ -223,5 +385,12 @@ employee_service = EmployeeService(
     subdivision_repository=subdivision_repository,
     user_repository_adapter=user_repository_adapter,
 )
-subdivision_service = SubdivisionService(repository=subdivision_repository)
-project_service = ProjectService(repository=project_repository)
+subdivision_service = SubdivisionService(
+    repository=subdivision_repository,
+    loader=subdivision_loader,
+    department_summary_repository=department_summary_repository,
+)
+project_service = ProjectService(
+    repository=project_repository,
+    loader=project_loader,
+)
@@ -0,0 +1,151 @@
+from asyncio import sleep
+from datetime import datetime, UTC
+from functools import partial
+from logging import getLogger
+from time import monotonic
+from typing import Awaitable, Callable
+
+from config import settings
+
+from files.apps.subdivision.repository import (
+    DepartmentSummaryRepository,
+    PurgeRepository,
+    department_summary_repository,
+    purge_repository,
+)
+from files.apps.subdivision.schemas import PurgeProgressSchema
+
+
+logger = getLogger("common.base_logger")
+
+
+async def refresh_department_summary_periodically(
+    repository: DepartmentSummaryRepository = department_summary_repository,
+) -> None:
+    """
+    Every DEPARTMENT_SUMMARY_REFRESH_INTERVAL seconds refreshes
+    department summary if writes marked it dirty or if it is older
+    than DEPARTMENT_SUMMARY_MAX_AGE (covers writes of other processes).
+    Runs till cancelled
+    """
+    last_refresh_time = None
+    while True:
+        await sleep(settings.DEPARTMENT_SUMMARY_REFRESH_INTERVAL)
+
+        is_outdated = (
+            last_refresh_time is None
+            or monotonic() - last_refresh_time >= settings.DEPARTMENT_SUMMARY_MAX_AGE
+        )
+        if not repository.is_dirty and not is_outdated:
+            continue
+
+        try:
+            await repository.refresh()
+            last_refresh_time = monotonic()
+        except Exception as error:
+            repository.mark_dirty()
+            logger.error(f"Can't refresh department summary: {error}")
+
+
+# Progress of purger of this process, reported by monitoring
+purge_progress = PurgeProgressSchema()
+
+
+async def _delete_in_batches(
+    delete_batch: Callable[..., Awaitable[int]],
+    table_name: str,
+    progress: PurgeProgressSchema,
+) -> None:
+    """
+    Calls delete_batch till it deletes less than PURGE_BATCH_SIZE rows,
+    pausing PURGE_BATCH_PAUSE seconds between batches
+    """
+    while True:
+        deleted_count = await delete_batch(batch_size=settings.PURGE_BATCH_SIZE)
+        progress.deleted_rows[table_name] = (
+            progress.deleted_rows.get(table_name, 0) + deleted_count
+        )
+        progress.last_batch_at = datetime.now(UTC)
+        if deleted_count < settings.PURGE_BATCH_SIZE:
+            return
+
+        await sleep(settings.PURGE_BATCH_PAUSE)
+
+
+async def purge_soft_deleted(
+    repository: PurgeRepository = purge_repository,
+    progress: PurgeProgressSchema = purge_progress,
+) -> None:
+    """
+    Removes at most PURGE_BATCH_SIZE soft deleted subdivisions and users
+    (oldest first): dependent projects and employees are deleted
+    in batches, entity's row is deleted last
+    """
+    progress.is_running = True
+    progress.last_run_started_at = datetime.now(UTC)
+    progress.last_error = None
+    try:
+        progress.pending_subdivisions, progress.pending_users = (
+            await repository.count_pending()
+        )
+
+        subdivision_ids = await repository.get_deleted_subdivision_ids(
+            limit=settings.PURGE_BATCH_SIZE
+        )
+        for subdivision_id in subdivision_ids:
+            progress.current_entity = f"subdivision {subdivision_id}"
+            await _delete_in_batches(
+                delete_batch=partial(
+                    repository.delete_projects_batch, subdivision_id=subdivision_id
+                ),
+                table_name="projects",
+                progress=progress,
+            )
+            await _delete_in_batches(
+                delete_batch=partial(
+                    repository.delete_employees_batch, subdivision_id=subdivision_id
+                ),
+                table_name="employees",
+                progress=progress,
+            )
+            if await repository.delete_subdivision(subdivision_id=subdivision_id):
+                progress.purged_subdivisions += 1
+            progress.pending_subdivisions -= 1
+
+        usernames = await repository.get_deleted_usernames(
+            limit=settings.PURGE_BATCH_SIZE
+        )
+        for username in usernames:
+            progress.current_entity = f"user {username}"
+            await _delete_in_batches(
+                delete_batch=partial(
+                    repository.delete_memberships_batch, username=username
+                ),
+                table_name="employees",
+                progress=progress,
+            )
+            if await repository.delete_user(username=username):
+                progress.purged_users += 1
+            progress.pending_users -= 1
+    finally:
+        progress.is_running = False
+        progress.current_entity = None
+
+
+async def purge_soft_deleted_periodically(
+    repository: PurgeRepository = purge_repository,
+    progress: PurgeProgressSchema = purge_progress,
+) -> None:
+    """
+    Every PURGE_INTERVAL seconds purges soft deleted subdivisions
+    and users. Failed run is retried on the next interval,
+    already deleted batches are not repeated. Runs till cancelled
+    """
+    while True:
+        await sleep(settings.PURGE_INTERVAL)
+
+        try:
+            await purge_soft_deleted(repository=repository, progress=progress)
+        except Exception as error:
+            progress.last_error = str(error)
+            logger.error(f"Can't purge soft deleted entities: {error}")
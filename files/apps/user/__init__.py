@@ -5,7 +5,11 @@ __all__ = (
     "user_router",
     "user_auth_router",
     "PasswordHandlingUtil",
+    "password_hashing_executor",
     "CreateUserSchema",
+    "auth_status_cache",
+    "verified_tokens_cache",
+    "refresh_token_revocations_periodically",
     # adapters
     "UserModelsAdapter",
     "UserRepositoryAdapter",
@@ -24,7 +28,11 @@ from .router import user_router, user_auth_router
 
 from .schemas import CreateUserSchema
 
-from .utils import PasswordHandlingUtil
+from .caches import auth_status_cache, verified_tokens_cache
+
+from .tasks import refresh_token_revocations_periodically
+
+from .utils import PasswordHandlingUtil, password_hashing_executor
 
 from .adapters import (
     user_models_adapter,
@@ -54,7 +54,7 @@ class UserRepositoryAdapter:
         return users_dto
 
     async def check_user_exists(self, username: str) -> bool:
-        exists = self.repository.check_user_exists(username)
+        exists = await self.repository.check_user_exists(username=username)
 
         return exists
 
@@ -0,0 +1,69 @@
+from time import monotonic, time
+
+from config import settings
+from common import TTLCache
+
+from files.apps.user.schemas import UserSchema
+
+
+# Status (is_active, is_staff) of authenticated users by username,
+# read on every authenticated request
+auth_status_cache: TTLCache[str, UserSchema] = TTLCache(
+    maxsize=settings.AUTH_STATUS_CACHE_SIZE,
+    ttl=settings.AUTH_STATUS_CACHE_TTL,
+)
+
+# Payloads (and verifying key's kid) of verified tokens by token's hash.
+# Entries live till token's exp
+verified_tokens_cache: TTLCache[bytes, tuple[dict, str]] = TTLCache(
+    maxsize=settings.auth_jwt.VERIFIED_TOKENS_CACHE_SIZE,
+    ttl=settings.auth_jwt.ACCESS_TOKEN_EXPIRE_TIME,
+)
+
+
+class TokenRevocationList:
+    """
+    In-memory copy of token_revocations: access tokens of user issued
+    at or before user's timestamp are revoked. Timestamps are whole
+    seconds like tokens' iat, so tokens issued in the second of
+    revocation are revoked too. Reloaded from table by refresh task,
+    revocations made by this process are applied at once
+    """
+
+    def __init__(self):
+        self._revoked_before: dict[str, int] = {}
+        # Monotonic time of the last successful reload
+        self.refreshed_at: float | None = None
+
+    def replace(self, revoked_before: dict[str, int], loaded_since: int) -> None:
+        """
+        Replaces revocations with loaded ones. Local revocations made
+        after loaded_since (load start) may be missing in loaded ones
+        and are kept
+        """
+        for username, timestamp in self._revoked_before.items():
+            if timestamp >= loaded_since and timestamp > revoked_before.get(username, 0):
+                revoked_before[username] = timestamp
+
+        self._revoked_before = revoked_before
+        self.refreshed_at = monotonic()
+
+    def revoke(self, username: str) -> None:
+        self._revoked_before[username] = int(time())
+
+    def is_revoked(self, username: str, issued_at: int) -> bool:
+        revoked_before = self._revoked_before.get(username)
+
+        return revoked_before is not None and issued_at <= revoked_before
+
+    def is_fresh(self, max_age: float) -> bool:
+        return (
+            self.refreshed_at is not None
+            and monotonic() - self.refreshed_at < max_age
+        )
+
+    def __len__(self) -> int:
+        return len(self._revoked_before)
+
+
+token_revocation_list = TokenRevocationList()
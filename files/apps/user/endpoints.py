@@ -1,10 +1,15 @@
 from fastapi import Response, status, Query
 from fastapi.encoders import jsonable_encoder
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from config import settings
-from common import generate_url
+from common import (
+    generate_url,
+    CountStrategyEnum,
+    DataFormatEnum,
+    STREAM_MEDIA_TYPES,
+)
 
 from files.apps.user.services import (
     UserServices,
@@ -12,6 +17,10 @@ from files.apps.user.services import (
     user_services,
     auth_user_services,
 )
+from files.apps.user.utils import (
+    iter_csv_rows,
+    iter_ndjson_rows,
+)
 from files.apps.user.schemas import (
     CreateUserSchema,
     UpdateUserPasswordSchema,
@@ -67,6 +76,17 @@ class UserEndpoints(GenerateURLS):
         is_active: bool = Query(default=None),
         limit: int | None = Query(default=20),
         offset: int | None = Query(default=0),
+        cursor: str | None = Query(
+            default=None,
+            description='Opaque "next_cursor" of previous page. '
+            "Offset is ignored if cursor is provided",
+        ),
+        count: CountStrategyEnum = Query(
+            default=CountStrategyEnum.EXACT,
+            description='"exact" counts filtered rows in the page query, '
+            '"estimated" uses planner statistics for unfiltered list, '
+            '"none" skips total',
+        ),
     ):
         if usernames:
             usernames = usernames.split("|")
@@ -75,7 +95,7 @@ class UserEndpoints(GenerateURLS):
         if emails:
             emails = emails.split("|")
 
-        users_dto = await self.services.list_users(
+        users_page_dto = await self.services.list_users(
             usernames=usernames,
             names=names,
             emails=emails,
@@ -84,18 +104,71 @@ class UserEndpoints(GenerateURLS):
             is_active=is_active,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count=count,
         )
 
         users_list_response = []
-        for user in users_dto:
+        for user in users_page_dto.items:
             urls = self._generate_urls(username=user.username)
             users_list_response.append({**user.model_dump(), "urls": urls})
 
         return JSONResponse(
-            content=jsonable_encoder(users_list_response),
+            content=jsonable_encoder(
+                {
+                    **users_page_dto.model_dump(exclude={"items"}),
+                    "items": users_list_response,
+                }
+            ),
             status_code=status.HTTP_200_OK,
         )
 
+    async def export_users(
+        self,
+        request: Request,
+        format: DataFormatEnum = Query(default=DataFormatEnum.NDJSON),
+        usernames: str | None = Query(
+            default=None,
+            description='string of usernames splitted by "|"',
+            example="username|username",
+        ),
+        names: str | None = Query(
+            default=None,
+            description='string of names splitted by "|"',
+            example="name|name",
+        ),
+        emails: str | None = Query(
+            default=None,
+            description='string of emails splitted by "|"',
+            example="email|email",
+        ),
+        is_superuser: bool = Query(default=None),
+        is_staff: bool = Query(default=None),
+        is_active: bool = Query(default=None),
+    ):
+        if usernames:
+            usernames = usernames.split("|")
+        if names:
+            names = names.split("|")
+        if emails:
+            emails = emails.split("|")
+
+        return StreamingResponse(
+            content=self.services.export_users(
+                format=format,
+                usernames=usernames,
+                names=names,
+                emails=emails,
+                is_superuser=is_superuser,
+                is_staff=is_staff,
+                is_active=is_active,
+            ),
+            media_type=STREAM_MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="users.{format.value}"'
+            },
+        )
+
     async def get_user(
         self,
         request: Request,
@@ -144,6 +217,35 @@ class UserEndpoints(GenerateURLS):
         await self.services.delete_user(username=username)
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
+    async def import_users(
+        self,
+        request: Request,
+        format: DataFormatEnum = Query(
+            default=DataFormatEnum.NDJSON,
+            description="Format of request body. CSV must start with header. "
+            'Every row has "username" and either "password" or bcrypt "password_hash"',
+        ),
+    ):
+        """
+        Streams request body into bulk import without reading it into memory
+        """
+        iter_rows = (
+            iter_csv_rows if format == DataFormatEnum.CSV else iter_ndjson_rows
+        )
+        result_dto = await self.services.import_users(
+            rows=iter_rows(request.stream())
+        )
+
+        # Import which stopped part-way still reports its committed rows
+        return JSONResponse(
+            content=jsonable_encoder(result_dto),
+            status_code=(
+                status.HTTP_200_OK
+                if result_dto.stop_error is None
+                else status.HTTP_500_INTERNAL_SERVER_ERROR
+            ),
+        )
+
 
 class UserAuthEndpoints(GenerateURLS):
     def __init__(self, services: AuthUserServices, base_url: str):
@@ -185,6 +287,20 @@ class UserAuthEndpoints(GenerateURLS):
             status_code=status.HTTP_200_OK,
         )
 
+    async def get_jwks(self) -> JSONResponse:
+        """
+        Returns public keys as JWK set. Clients may cache it
+        till keys directory is rescanned
+        """
+        jwks = self.services.get_jwks()
+        max_age = settings.auth_jwt.KEYS_RELOAD_INTERVAL
+
+        return JSONResponse(
+            content=jwks,
+            status_code=status.HTTP_200_OK,
+            headers={"Cache-Control": f"public, max-age={max_age}"},
+        )
+
 
 user_auth_endpoints = UserAuthEndpoints(
     services=auth_user_services, base_url=settings.BASE_URL
@@ -0,0 +1,21 @@
+from common import BatchLoader
+
+from files.apps.user.repository import UserRepository, user_repository
+from files.apps.user.schemas import UserSchema
+
+
+class UserLoader(BatchLoader[str, UserSchema]):
+    """
+    Loads users by username, batched and memoized per request
+    """
+
+    def __init__(self, repository: UserRepository):
+        self.repository = repository
+
+    async def batch_load(self, keys: list[str]) -> dict[str, UserSchema]:
+        users = await self.repository.get_users(usernames=keys)
+
+        return {user.username: user for user in users}
+
+
+user_loader = UserLoader(repository=user_repository)
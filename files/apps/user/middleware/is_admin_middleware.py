@@ -5,8 +5,21 @@ from config import settings
 
 
 async def check_user_is_authorized_to_use_route(request: Request, call_next):
+    """
+    Admin routes are open only to authenticated admins. Without
+    REQUIRE_AUTH nobody is authenticated, so they are denied unless
+    DEBUG_ADMIN_ROUTES_WITHOUT_AUTH opens them for local development
+    """
+    if not settings.REQUIRE_AUTH and settings.DEBUG_ADMIN_ROUTES_WITHOUT_AUTH:
+        response = await call_next(request)
+        return response
+
     path = request.scope.get("path")
-    if path and path in settings.auth_jwt.ADMIN_ROUTES and not request.state.is_staff:
+    if (
+        path
+        and path in settings.auth_jwt.ADMIN_ROUTES
+        and not getattr(request.state, "is_admin", False)
+    ):
         return JSONResponse(
             content={"error": "User does not have admin rights"},
             status_code=status.HTTP_401_UNAUTHORIZED,
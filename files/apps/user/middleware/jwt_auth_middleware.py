@@ -9,11 +9,13 @@ from config import settings
 
 from files.apps.user.services import verify_user_services
 from files.exceptions import (
+    DoesNotExistError,
     JWTTokenHasNotBeenProvidedError,
     ValidationError,
     UnprocessableEntityError,
     IsNotActiveError,
     InvalidPasswordError,
+    TokenHasBeenRevokedError,
 )
 
 logger = getLogger("common.base_logger")
@@ -39,7 +41,7 @@ async def verify_jwt_access_token(request: Request, call_next):
         )
         request.state.username = user_username_is_main_is_active_dto.username
         request.state.is_active = user_username_is_main_is_active_dto.is_active
-        request.state.is_admin = user_username_is_main_is_active_dto.is_admin
+        request.state.is_admin = user_username_is_main_is_active_dto.is_staff
         # request.state.username = "root"
         # request.state.is_active = True
         # request.state.is_admin = True
@@ -96,6 +98,19 @@ async def verify_jwt_access_token(request: Request, call_next):
             content={"error": "User is not active"},
             status_code=status.HTTP_403_FORBIDDEN,
         )
+    except TokenHasBeenRevokedError as error:
+        logger.error(str(error))
+        return JSONResponse(
+            content={"error": "Token has been revoked. Please log in again."},
+            status_code=status.HTTP_401_UNAUTHORIZED,
+        )
+    except DoesNotExistError as error:
+        # Token of deleted user
+        logger.error(str(error))
+        return JSONResponse(
+            content={"error": "User does not exist"},
+            status_code=status.HTTP_401_UNAUTHORIZED,
+        )
     # Handling db errors
     except NoResultFound as error:
         # If required data does ton exist(override to custom exception to avoid layers bounding
@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, text
+from sqlalchemy import TIMESTAMP, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from config import Base
@@ -17,12 +18,12 @@ class User(Base):
 
     __tablename__ = "users"
 
-    username: Mapped[str] = mapped_column(primary_key=True, index=True)
+    username: Mapped[str] = mapped_column(primary_key=True)
 
     email: Mapped[str | None] = mapped_column(String(255), unique=True, index=True)
     password: Mapped[bytes] = mapped_column()
 
-    name: Mapped[str | None] = mapped_column(String(255))
+    name: Mapped[str | None] = mapped_column(String(255), index=True)
     phone_number: Mapped[str | None]
     avatar: Mapped[str | None] = mapped_column(unique=True)
     about: Mapped[str | None]
@@ -32,9 +33,36 @@ class User(Base):
     is_superuser: Mapped[bool] = mapped_column(
         default=False, server_default=text("FALSE")
     )
+    # Soft delete: user is hidden once set,
+    # purger removes its memberships and row in batches
+    deleted_at: Mapped[datetime | None] = mapped_column(TIMESTAMP(timezone=True))
 
     departments: Mapped[list["Subdivision"]] = relationship(
         back_populates="employees",
         secondary="employees",
         viewonly=True,
     )
+
+    __table_args__ = (
+        # Purger's queue, only deleted rows are indexed
+        Index(
+            "ix_users_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
+
+class TokenRevocation(Base):
+    """
+    Access tokens of user issued at or before revoked_before
+    are revoked. Rows older than access token lifetime are pruned
+    """
+
+    __tablename__ = "token_revocations"
+
+    username: Mapped[str] = mapped_column(primary_key=True)
+    revoked_before: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+    )
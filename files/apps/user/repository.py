@@ -1,23 +1,104 @@
-from sqlalchemy import select, insert, update, delete, or_
-from sqlalchemy.orm import load_only, defer
+from datetime import timedelta
+
+from sqlalchemy import (
+    ARRAY,
+    Select,
+    String,
+    any_,
+    bindparam,
+    func,
+    select,
+    insert,
+    update,
+    delete,
+    exists,
+    or_,
+    table,
+    column,
+    event,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, load_only, defer
 from sqlalchemy.exc import NoResultFound, MultipleResultsFound
-from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from typing import AsyncIterator, Callable, Sequence
 
-from config import async_session
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
-from files.apps.user.models import User
+from config import (
+    settings,
+    async_session,
+    async_read_session,
+    async_stream_session,
+    async_batch_session,
+)
+from common import (
+    STREAM_CHUNK_SIZE,
+    PageSchema,
+    CountStrategyEnum,
+    create_page,
+    encode_cursor,
+    decode_cursor,
+    add_total_count_column,
+    get_estimated_rows_count,
+)
+
+from files.apps.user.models import User, TokenRevocation
 from files.apps.user.schemas import UserSchema
-from files.exceptions import DoesNotExistError, ValidationError
+from files.exceptions import (
+    DoesNotExistError,
+    UnprocessableEntityError,
+    ValidationError,
+)
+
+
+USERS_EXPORT_COLUMNS = (
+    "username",
+    "email",
+    "name",
+    "is_staff",
+    "is_active",
+    "is_superuser",
+)
+
+USERS_IMPORT_STAGING_TABLE = "users_import_staging"
+USERS_IMPORT_COLUMNS = (
+    "username",
+    "email",
+    "password",
+    "name",
+    "phone_number",
+    "about",
+    "is_staff",
+    "is_active",
+    "is_superuser",
+)
+
+users_import_staging = table(
+    USERS_IMPORT_STAGING_TABLE,
+    column("line"),
+    *(column(name) for name in USERS_IMPORT_COLUMNS),
+)
 
 
 class UserRepository:
-    def __init__(self, async_session: async_sessionmaker[AsyncSession]):
+    def __init__(
+        self,
+        async_session: async_sessionmaker[AsyncSession],
+        async_read_session: async_sessionmaker[AsyncSession] | None = None,
+        async_stream_session: async_sessionmaker[AsyncSession] | None = None,
+        async_batch_session: async_sessionmaker[AsyncSession] | None = None,
+    ):
         self.async_session = async_session
+        self.async_read_session = async_read_session or async_session
+        self.async_stream_session = async_stream_session
+        self.async_batch_session = async_batch_session
 
     async def get_user(
         self, username: str = None, email: str = None, load_password: bool = False
     ) -> UserSchema:
-        async with self.async_session() as session:
+        async with self.async_read_session() as session:
             load_list = [
                 User.username,
                 User.email,
@@ -40,6 +121,7 @@ class UserRepository:
                     )
                 )
 
+                query = query.where(User.deleted_at.is_(None))
                 if username is not None or (username is not None and email is not None):
                     query = query.where(User.username == username)
                 if email is not None:
@@ -66,8 +148,8 @@ class UserRepository:
                 return user_dto
 
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required user doesn't exist",
                     class_name=self.__class__.__name__,
                     method_name=self.get_user.__name__,
                     error_text=str(error),
@@ -75,6 +157,103 @@ class UserRepository:
             except MultipleResultsFound as error:
                 pass
 
+    async def get_users(self, usernames: list[str]) -> list[UserSchema]:
+        """
+        Fetches users (without password) by usernames
+        with one "= ANY" query. Missing users are skipped
+        """
+        async with self.async_read_session() as session:
+            query = select(
+                User.username,
+                User.email,
+                User.name,
+                User.phone_number,
+                User.avatar,
+                User.about,
+                User.is_staff,
+                User.is_active,
+                User.is_superuser,
+            ).where(
+                User.username
+                == any_(bindparam("usernames", value=usernames, type_=ARRAY(String))),
+                User.deleted_at.is_(None),
+            )
+            query_result = await session.execute(statement=query)
+
+            return [UserSchema(**user._asdict()) for user in query_result.all()]
+
+    def build_list_users_query(
+        self,
+        usernames: list[str] | None = None,
+        names: list[str] | None = None,
+        emails: list[str] | None = None,
+        is_superuser: bool = None,
+        is_staff: bool = None,
+        is_active: bool = None,
+        cursor: str | None = None,
+        with_total_count: bool = False,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Select:
+        """
+        Builds filtered users query ordered by username (primary key).
+        If cursor is provided, seeks to rows after cursor's username.
+        with_total_count adds "total_count" column of all filtered rows.
+        limit fetches one extra row, which tells if there is a next page
+        """
+        query = select(
+            User.username,
+            User.email,
+            User.name,
+            User.is_staff,
+            User.is_active,
+            User.is_superuser,
+        ).order_by(User.username)
+
+        # Soft deleted users are hidden
+        conditions = [User.deleted_at.is_(None)]
+        if usernames is not None and len(usernames) > 0:
+            conditions.append(User.username.in_(usernames))
+        if names is not None and len(names) > 0:
+            conditions.append(User.name.in_(names))
+        if emails is not None and len(emails) > 0:
+            conditions.append(User.email.in_(emails))
+        if is_superuser is not None:
+            conditions.append(User.is_superuser == is_superuser)
+        if is_staff is not None:
+            conditions.append(User.is_staff == is_staff)
+        if is_active is not None:
+            conditions.append(User.is_active == is_active)
+
+        seek_conditions = []
+        if cursor is not None:
+            try:
+                cursor_values = decode_cursor(cursor=cursor, keys=("username",))
+            except ValueError as error:
+                raise UnprocessableEntityError(
+                    message="Cursor is not valid",
+                    class_name=self.__class__.__name__,
+                    method_name=self.build_list_users_query.__name__,
+                    error_text=str(error),
+                )
+            seek_conditions.append(User.username > cursor_values["username"])
+
+        if with_total_count:
+            query = add_total_count_column(
+                query=query,
+                table=User,
+                conditions=conditions,
+                seek_conditions=seek_conditions,
+            )
+        if len(conditions) > 0 or len(seek_conditions) > 0:
+            query = query.where(*conditions, *seek_conditions)
+        if limit is not None:
+            query = query.limit(limit=limit + 1)
+        if offset is not None:
+            query = query.offset(offset=offset)
+
+        return query
+
     async def list_users(
         self,
         usernames: list[str] | None = None,
@@ -85,41 +264,54 @@ class UserRepository:
         is_active: bool = None,
         limit: int | None = None,
         offset: int | None = None,
-    ):
-        async with self.async_session() as session:
-            query = select(
-                User.username,
-                User.email,
-                User.name,
-                User.is_staff,
-                User.is_active,
-                User.is_superuser,
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> PageSchema[UserSchema]:
+        async with self.async_read_session() as session:
+            if cursor is not None:
+                offset = None
+
+            is_filtered = any((usernames, names, emails)) or any(
+                value is not None for value in (is_superuser, is_staff, is_active)
+            )
+
+            # Estimate is only meaningful for the whole table
+            total = None
+            if count == CountStrategyEnum.ESTIMATED and not is_filtered:
+                total = await get_estimated_rows_count(
+                    session=session, table_name=User.__tablename__
+                )
+            with_total_count = count == CountStrategyEnum.EXACT or (
+                count == CountStrategyEnum.ESTIMATED and total is None
             )
 
-            conditions = []
-            if usernames is not None and len(usernames) > 0:
-                conditions.append(User.username.in_(usernames))
-            if names is not None and len(names) > 0:
-                conditions.append(User.name.in_(names))
-            if emails is not None and len(emails) > 0:
-                conditions.append(User.email.in_(emails))
-            if is_superuser is not None:
-                conditions.append(User.is_superuser == is_superuser)
-            if is_staff is not None:
-                conditions.append(User.is_staff == is_staff)
-            if is_active is not None:
-                conditions.append(User.is_active == is_active)
-            if len(conditions) > 0:
-                query = query.where(*conditions)
-
-            if limit is not None:
-                query = query.limit(limit=limit)
-            if offset is not None:
-                query = query.offset(offset=offset)
+            query = self.build_list_users_query(
+                usernames=usernames,
+                names=names,
+                emails=emails,
+                is_superuser=is_superuser,
+                is_staff=is_staff,
+                is_active=is_active,
+                cursor=cursor,
+                with_total_count=with_total_count,
+                limit=limit,
+                offset=offset,
+            )
 
             query_rows = await session.execute(statement=query)
             query_rows_result = query_rows.all()
 
+            if with_total_count:
+                if len(query_rows_result) > 0:
+                    total = query_rows_result[0].total_count
+                elif not offset and cursor is None:
+                    total = 0
+
+            next_cursor = None
+            if limit is not None and len(query_rows_result) > limit:
+                query_rows_result = query_rows_result[:limit]
+                next_cursor = encode_cursor({"username": query_rows_result[-1].username})
+
             users_dto = [
                 UserSchema(
                     username=user.username,
@@ -132,7 +324,45 @@ class UserRepository:
                 for user in query_rows_result
             ]
 
-            return users_dto
+            return create_page(
+                items=users_dto,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                next_cursor=next_cursor,
+                total=total,
+                total_is_exact=with_total_count,
+            )
+
+    async def stream_users(
+        self,
+        usernames: list[str] | None = None,
+        names: list[str] | None = None,
+        emails: list[str] | None = None,
+        is_superuser: bool = None,
+        is_staff: bool = None,
+        is_active: bool = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yields filtered users (USERS_EXPORT_COLUMNS) in chunks fetched
+        from server-side cursor. Uses own session, so it can be consumed
+        after request's unit of work is closed
+        """
+        async with self.async_stream_session() as session:
+            query = self.build_list_users_query(
+                usernames=usernames,
+                names=names,
+                emails=emails,
+                is_superuser=is_superuser,
+                is_staff=is_staff,
+                is_active=is_active,
+            )
+            query_result = await session.stream(
+                statement=query.execution_options(yield_per=chunk_size)
+            )
+            async for rows in query_result.partitions(chunk_size):
+                yield rows
 
     async def create_user(self, data: UserSchema):
         async with self.async_session() as session:
@@ -174,22 +404,77 @@ class UserRepository:
                 is_superuser=user.is_superuser,
             )
 
-            await session.commit()
-
             return user_dto
 
+    async def import_users(self, records: list[tuple]) -> set[int]:
+        """
+        Loads (line, *USERS_IMPORT_COLUMNS) records into temporary staging
+        table with COPY and merges them into users, skipping rows that
+        conflict with existing users. Returns lines of inserted rows.
+        Usernames must be unique within records. Every call is committed
+        in its own transaction, so large imports hold locks for one batch
+        and batches loaded before a failure are kept
+        """
+        async with self.async_batch_session() as session, session.begin():
+            await session.execute(
+                text(
+                    f"""
+                    CREATE TEMP TABLE IF NOT EXISTS {USERS_IMPORT_STAGING_TABLE} (
+                        line bigint NOT NULL,
+                        username varchar NOT NULL,
+                        email varchar(255),
+                        password bytea NOT NULL,
+                        name varchar(255),
+                        phone_number varchar,
+                        about varchar,
+                        is_staff boolean NOT NULL,
+                        is_active boolean NOT NULL,
+                        is_superuser boolean NOT NULL
+                    ) ON COMMIT DROP
+                    """
+                )
+            )
+            await session.execute(text(f"TRUNCATE {USERS_IMPORT_STAGING_TABLE}"))
+
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                USERS_IMPORT_STAGING_TABLE,
+                records=records,
+                columns=("line", *USERS_IMPORT_COLUMNS),
+            )
+
+            inserted = (
+                pg_insert(User)
+                .from_select(
+                    list(USERS_IMPORT_COLUMNS),
+                    select(
+                        *(users_import_staging.c[name] for name in USERS_IMPORT_COLUMNS)
+                    ).order_by(users_import_staging.c.line),
+                )
+                .on_conflict_do_nothing()
+                .returning(User.username)
+                .cte("inserted")
+            )
+            query = select(users_import_staging.c.line).join(
+                inserted,
+                inserted.c.username == users_import_staging.c.username,
+            )
+            query_result = await session.execute(statement=query)
+
+            return set(query_result.scalars().all())
+
     async def update_user(self, data: UserSchema) -> None:
         async with async_session() as session:
             try:
+                values = data.model_dump(
+                    exclude_defaults=True,
+                    exclude={"username"},
+                )
                 stmt = (
                     update(User)
-                    .where(User.username == data.username)
-                    .values(
-                        **data.model_dump(
-                            exclude_defaults=True,
-                            exclude={"username"},
-                        )
-                    )
+                    .where(User.username == data.username, User.deleted_at.is_(None))
+                    .values(**values)
                     .returning(
                         User.username,
                         User.email,
@@ -220,12 +505,10 @@ class UserRepository:
                     is_superuser=user.is_superuser,
                 )
 
-                await session.commit()
-
                 return user_dto
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required user doesn't exist",
                     class_name=self.__class__.__name__,
                     method_name=self.update_user.__name__,
                     error_text=str(error),
@@ -241,14 +524,13 @@ class UserRepository:
                 stmt_password = (
                     update(User)
                     .values(password=new_password)
-                    .where(User.username == username)
+                    .where(User.username == username, User.deleted_at.is_(None))
                 )
 
                 await session.execute(stmt_password)
-                await session.commit()
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required user doesn't exist",
                     class_name=self.__class__.__name__,
                     method_name=self.update_user_password.__name__,
                     error_text=str(error),
@@ -257,36 +539,96 @@ class UserRepository:
     async def get_user_password(self, username: str) -> bytes:
         async with async_session() as session:
             try:
-                stmt = select(User.password).where(User.username == username)
+                stmt = select(User.password).where(
+                    User.username == username, User.deleted_at.is_(None)
+                )
                 stmt_result = await session.execute(stmt)
                 user_password = stmt_result.scalar_one()
 
                 return user_password
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required user doesn't exist",
                     class_name=self.__class__.__name__,
                     method_name=self.get_user_password.__name__,
                     error_text=str(error),
                 )
 
-    async def delete_user(self, username: str) -> None:
+    async def delete_user(
+        self,
+        username: str,
+        after_commit: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        Soft deletes user: user is hidden at once, its memberships
+        and row are removed by purger in small batches, so deletion
+        doesn't hold locks on employees for the whole cascade.
+        after_commit is called when deletion is committed
+        """
         async with self.async_session() as session:
             if not username:
                 raise ValidationError()
 
-            stmt = delete(User).where(User.username == username)
+            if after_commit is not None:
+                self._call_after_commit(session=session, callback=after_commit)
 
-            await session.execute(stmt)
-            await session.commit()
+            stmt = (
+                update(User)
+                .where(User.username == username, User.deleted_at.is_(None))
+                .values(deleted_at=func.now())
+            )
 
-    async def check_user_exists(self, username: str) -> None:
-        async with self.async_session() as session:
-            query = select(User).where(User.username == username).exists()
+            await session.execute(stmt)
+            await self._revoke_tokens(session=session, username=username)
+
+    @staticmethod
+    def _call_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+        """
+        Calls callback when session's transaction is committed. Caches
+        invalidated before commit would be refilled with old rows
+        by requests running till commit
+        """
+
+        def call_on_commit(sync_session: Session) -> None:
+            callback()
+
+        # Rolled back session is closed unused, its listener never fires
+        event.listen(session.sync_session, "after_commit", call_on_commit, once=True)
+
+    @staticmethod
+    async def _revoke_tokens(session: AsyncSession, username: str) -> None:
+        """
+        Revokes user's access tokens issued till now in caller's
+        transaction. Called by delete_user: status fields are not
+        updated through API (update_user rejects them), a new status
+        update path must revoke tokens too. Revocations of already
+        expired tokens are pruned on the way, so the table stays small
+        """
+        await session.execute(
+            delete(TokenRevocation).where(
+                TokenRevocation.revoked_before
+                < func.now()
+                - timedelta(seconds=settings.auth_jwt.ACCESS_TOKEN_EXPIRE_TIME)
+            )
+        )
+        stmt = (
+            pg_insert(TokenRevocation)
+            .values(username=username)
+            .on_conflict_do_update(
+                index_elements=[TokenRevocation.username],
+                set_={"revoked_before": func.now()},
+            )
+        )
+        await session.execute(stmt)
 
-            exists = await session.execute(statement=query)
+    async def check_user_exists(self, username: str) -> bool:
+        async with self.async_read_session() as session:
+            query = select(
+                exists().where(User.username == username, User.deleted_at.is_(None))
+            )
+            query_result = await session.execute(statement=query)
 
-            return exists
+            return query_result.scalar_one()
 
 
 class UserAuthRepository:
@@ -297,25 +639,62 @@ class UserAuthRepository:
         async with self.async_session() as session:
             try:
                 query = select(
+                    User.username,
                     User.is_active,
                     User.is_staff,
-                ).where(User.username == username)
+                ).where(User.username == username, User.deleted_at.is_(None))
                 query_result = await session.execute(statement=query)
-                query_result_row: User = query_result.one_or_none()
+                query_result_row: User = query_result.one()
 
                 return UserSchema(
                     username=query_result_row.username,
                     is_active=query_result_row.is_active,
-                    is_admin=query_result_row.is_staff,
+                    is_staff=query_result_row.is_staff,
                 )
             except NoResultFound as error:
-                DoesNotExistError(
-                    message="Required user doesn't exits",
+                raise DoesNotExistError(
+                    message="Required user doesn't exist",
                     class_name=self.__class__.__name__,
                     method_name=self.get_user_id_and_status.__name__,
                     error_text=str(error),
                 )
 
 
+class TokenRevocationRepository:
+    def __init__(self, async_session: async_sessionmaker[AsyncSession]):
+        self.async_session = async_session
+
+    async def get_revocations(self) -> dict[str, int]:
+        """
+        Returns revocations of tokens which may be not expired yet,
+        as username -> revoked_before unix timestamp in whole seconds
+        (precision of tokens' iat)
+        """
+        async with self.async_session() as session:
+            query = select(
+                TokenRevocation.username,
+                func.floor(func.extract("epoch", TokenRevocation.revoked_before)),
+            ).where(
+                TokenRevocation.revoked_before
+                >= func.now()
+                - timedelta(seconds=settings.auth_jwt.ACCESS_TOKEN_EXPIRE_TIME)
+            )
+            query_result = await session.execute(statement=query)
+
+            return {
+                username: int(revoked_before)
+                for username, revoked_before in query_result.tuples()
+            }
+
+
+# Auth status is read from primary (in request's unit of work): on lagging
+# replica deactivated or deleted user would pass auth and be cached so
 user_auth_repository = UserAuthRepository(async_session=async_session)
-user_repository = UserRepository(async_session=async_session)
+user_repository = UserRepository(
+    async_session=async_session,
+    async_read_session=async_read_session,
+    async_stream_session=async_stream_session,
+    async_batch_session=async_batch_session,
+)
+# Revocations are read from primary, replica may lag behind them
+token_revocation_repository = TokenRevocationRepository(async_session=async_session)
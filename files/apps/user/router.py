@@ -1,9 +1,13 @@
 from fastapi import APIRouter
 
+from common import PageSchema
+
 from files.apps.user.schemas import (
+    JWKSSchema,
     UserLoginResponseSchema,
     UserResponseSchema,
     UserSchema,
+    UsersImportResultSchema,
 )
 from files.apps.user.endpoints import user_endpoints, user_auth_endpoints
 
@@ -34,16 +38,42 @@ user_auth_router.add_api_route(
     summary="Generate access",
     description="Generates new access token by valid refresh token",
 )
+user_auth_router.add_api_route(
+    path="/jwks",
+    methods=["GET"],
+    endpoint=user_auth_endpoints.get_jwks,
+    response_model=JWKSSchema,
+    summary="JWKS",
+    description="Returns public keys (by kid) access tokens are verified with",
+)
 
 
 user_router.add_api_route(
     methods=["GET"],
     endpoint=user_endpoints.list_users,
     path="",
-    response_model=list[UserResponseSchema],
+    response_model=PageSchema[UserResponseSchema],
     summary="Get user",
     description="Lists users, with or without offset/limit/filter params",
 )
+user_router.add_api_route(
+    methods=["POST"],
+    endpoint=user_endpoints.import_users,
+    path=":import",
+    response_model=UsersImportResultSchema,
+    summary="Import users",
+    description="Bulk imports users from CSV or NDJSON body "
+    "and reports rows that have been skipped. If import stops part-way, "
+    "responds 500 with report of committed rows and the line it stopped at",
+)
+user_router.add_api_route(
+    methods=["GET"],
+    endpoint=user_endpoints.export_users,
+    path=":export",
+    response_model=None,
+    summary="Export users",
+    description="Streams filtered users as NDJSON or CSV",
+)
 user_router.add_api_route(
     methods=["GET"],
     endpoint=user_endpoints.get_user,
@@ -1,6 +1,8 @@
+from typing import Any
 from typing_extensions import Annotated
-from pydantic import BaseModel, AfterValidator, ConfigDict
+from pydantic import BaseModel, AfterValidator, ConfigDict, model_validator
 
+from common import validators as common_validators
 from files.apps.user.validators import validate_email, validate_string_is_not_empty
 
 
@@ -24,13 +26,18 @@ class UserSchema(BaseModel):
     phone_number: Annotated[
         str | None, AfterValidator(validate_string_is_not_empty)
     ] = None
-    is_supeuser: bool | None = None
+    is_superuser: bool | None = None
     is_staff: bool | None = None
     is_active: bool | None = None
 
     # model_config = ConfigDict(extra="allow")
 
 
+class JWKSSchema(BaseModel):
+    # Public JWKs with kid, use and alg
+    keys: list[dict[str, Any]]
+
+
 class TokenDataSchema(BaseModel):
     access_token: Annotated[str, AfterValidator(validate_string_is_not_empty)]
     refresh_token: Annotated[str, AfterValidator(validate_string_is_not_empty)]
@@ -47,3 +54,57 @@ class UserUrlsSchema(BaseModel):
 
 class UserResponseSchema(UserSchema):
     urls: UserUrlsSchema
+
+
+# Bulk import
+class ImportUserSchema(BaseModel):
+    """
+    Row of users import. Either plain password (hashed on import)
+    or bcrypt password_hash (stored as is) must be provided
+    """
+
+    username: Annotated[str, AfterValidator(common_validators.validate_string_is_not_empty)]
+    password: Annotated[
+        str | None, AfterValidator(common_validators.validate_string_is_not_empty)
+    ] = None
+    password_hash: str | None = None
+    email: Annotated[str | None, AfterValidator(common_validators.validate_email)] = None
+    name: Annotated[
+        str | None, AfterValidator(common_validators.validate_string_is_not_empty)
+    ] = None
+    phone_number: Annotated[
+        str | None, AfterValidator(common_validators.validate_phone_number)
+    ] = None
+    about: str | None = None
+    is_staff: bool = False
+    is_active: bool = True
+    is_superuser: bool = False
+
+    @model_validator(mode="after")
+    def check_password(self) -> "ImportUserSchema":
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError('Exactly one of "password", "password_hash" is required')
+        # bcrypt ignores (4.x) or rejects (5.x) longer passwords
+        if self.password is not None and len(self.password.encode()) > 72:
+            raise ValueError("Password must be at most 72 bytes long")
+        if self.password_hash is not None and not self.password_hash.startswith(
+            ("$2a$", "$2b$", "$2y$")
+        ):
+            raise ValueError('"password_hash" must be bcrypt hash')
+        return self
+
+
+class UserImportErrorSchema(BaseModel):
+    line: int
+    username: str | None = None
+    error: str
+
+
+class UsersImportResultSchema(BaseModel):
+    imported: int = 0
+    errors: list[UserImportErrorSchema] = []
+    # Set if import stopped part-way: rows of batches before stopped_at_line
+    # are committed and reported above, rows from it on are not imported.
+    # stopped_at_line is None if no batch was being imported
+    stopped_at_line: int | None = None
+    stop_error: str | None = None
@@ -1,18 +1,39 @@
+from logging import getLogger
+from typing import AsyncIterable, AsyncIterator
+
 from config import settings
+from common import (
+    PageSchema,
+    CountStrategyEnum,
+    DataFormatEnum,
+    TTLCache,
+    stream_rows,
+)
 
 from fastapi import Request
+from pydantic import ValidationError as PydanticValidationError
 
 from files.apps.user.schemas import (
     UpdateUserPasswordSchema,
     UserSchema,
     CreateUserSchema,
+    ImportUserSchema,
+    UserImportErrorSchema,
+    UsersImportResultSchema,
 )
 from files.apps.user.repository import (
+    USERS_EXPORT_COLUMNS,
     UserRepository,
     UserAuthRepository,
     user_repository,
     user_auth_repository,
 )
+from files.apps.user.loaders import UserLoader, user_loader
+from files.apps.user.caches import (
+    TokenRevocationList,
+    auth_status_cache,
+    token_revocation_list,
+)
 from files.apps.user.utils import (
     PasswordHandlingUtil,
     JWTCreatorUtil,
@@ -27,10 +48,14 @@ from files.exceptions import (
     DoesNotExistError,
     JWTTokenHasNotBeenProvidedError,
     InvalidPasswordError,
+    TokenHasBeenRevokedError,
     UnprocessableEntityError,
 )
 
 
+logger = getLogger("common.base_logger")
+
+
 class AuthUserServices:
     def __init__(
         self,
@@ -62,7 +87,7 @@ class AuthUserServices:
             username=username
         )
 
-        password_is_valid = PasswordHandlingUtil.validate_password(
+        password_is_valid = await PasswordHandlingUtil.validate_password_in_executor(
             password=password, hashed_password=user_data_dto.password
         )
 
@@ -73,6 +98,8 @@ class AuthUserServices:
             username=user_data_dto.username,
             access_token_expire_time=settings.auth_jwt.ACCESS_TOKEN_EXPIRE_TIME,
             refresh_token_expire_time=settings.auth_jwt.REFRESH_TOKEN_EXPIRE_TIME,
+            is_active=user_data_dto.is_active,
+            is_staff=user_data_dto.is_staff,
         )
 
         return {
@@ -87,6 +114,12 @@ class AuthUserServices:
             },
         }
 
+    def get_jwks(self) -> dict:
+        """
+        Returns public keys tokens are verified with
+        """
+        return jwt_actions_util.key_ring.get_jwks()
+
     async def issue_new_access_if_refresh_is_valid(self, token: bytes) -> bytes:
         token_data = jwt_actions_util.decode_jwt(token=token)
         token_type = token_data.get("token_type")
@@ -103,14 +136,23 @@ class AuthUserServices:
             username=user_dto.username,
             access_token_expire_time=settings.auth_jwt.ACCESS_TOKEN_EXPIRE_TIME,
             refresh_token_expire_time=settings.auth_jwt.REFRESH_TOKEN_EXPIRE_TIME,
+            is_active=user_dto.is_active,
+            is_staff=user_dto.is_staff,
         )
 
         return jwt_creator.create_access_token()
 
 
 class VerifyUserServices:
-    def __init__(self, repository: UserAuthRepository):
+    def __init__(
+        self,
+        repository: UserAuthRepository,
+        auth_status_cache: TTLCache[str, UserSchema],
+        token_revocation_list: TokenRevocationList,
+    ):
         self.repository = repository
+        self.auth_status_cache = auth_status_cache
+        self.token_revocation_list = token_revocation_list
 
     def get_token_and_check_if_it_is_not_none(self, request: Request = None) -> str:
         authorization_header = request.headers.get("authorization")
@@ -132,13 +174,46 @@ class VerifyUserServices:
         return payload
 
     async def get_user_from_db(self, payload: dict):
+        """
+        Returns user's status from auth status cache,
+        reads it from db on cache miss
+        """
         username: str | None = payload.get("sub")
+        user_id_is_main_is_active_dto = self.auth_status_cache.get(username)
+        if user_id_is_main_is_active_dto is not None:
+            return user_id_is_main_is_active_dto
+
+        # Status read before concurrent invalidation is not cached
+        cache_version = self.auth_status_cache.version
         user_id_is_main_is_active_dto = await self.repository.get_user_id_and_status(
             username=username
         )
+        self.auth_status_cache.set(
+            username, user_id_is_main_is_active_dto, version=cache_version
+        )
 
         return user_id_is_main_is_active_dto
 
+    def get_user_from_claims(self, payload: dict) -> UserSchema:
+        """
+        Returns user's status from token's claims,
+        raises TokenHasBeenRevokedError if token is revoked
+        """
+        username: str | None = payload.get("sub")
+        if self.token_revocation_list.is_revoked(
+            username=username, issued_at=payload.get("iat", 0)
+        ):
+            raise TokenHasBeenRevokedError(
+                class_name=self.__class__.__name__,
+                method_name=self.get_user_from_claims.__name__,
+            )
+
+        return UserSchema(
+            username=username,
+            is_active=payload["is_active"],
+            is_staff=payload.get("is_staff", False),
+        )
+
     async def verify_user_access_token_and_get_username_is_active_is_admin(
         self, contain_token_data: Request | str
     ):
@@ -155,9 +230,22 @@ class VerifyUserServices:
         payload = jwt_actions_util.decode_jwt(token=jwt_access_token)
         payload = self.check_payload_type(payload=payload)
 
-        user_username_is_main_is_active_dto = await self.get_user_from_db(
-            payload=payload
-        )
+        # Tokens without claims (issued before stateless mode was on)
+        # and stale revocations fall back to db lookup
+        if (
+            settings.STATELESS_AUTH
+            and "is_active" in payload
+            and self.token_revocation_list.is_fresh(
+                max_age=settings.TOKEN_REVOCATIONS_MAX_AGE
+            )
+        ):
+            user_username_is_main_is_active_dto = self.get_user_from_claims(
+                payload=payload
+            )
+        else:
+            user_username_is_main_is_active_dto = await self.get_user_from_db(
+                payload=payload
+            )
 
         if not user_username_is_main_is_active_dto.is_active:
             raise IsNotActiveError()
@@ -165,17 +253,37 @@ class VerifyUserServices:
         return user_username_is_main_is_active_dto
 
 
+USERS_IMPORT_BATCH_SIZE = 5000
+
+
 class UserServices:
-    def __init__(self, repository: UserRepository):
+    def __init__(
+        self,
+        repository: UserRepository,
+        loader: UserLoader,
+        auth_status_cache: TTLCache[str, UserSchema],
+        token_revocation_list: TokenRevocationList,
+    ):
         self.repository = repository
+        self.loader = loader
+        self.auth_status_cache = auth_status_cache
+        self.token_revocation_list = token_revocation_list
 
     @staticmethod
-    def _hash_user_password(password: str) -> bytes:
-        hashed_password: bytes = PasswordHandlingUtil.hash_password(password=password)
+    async def _hash_user_password(password: str) -> bytes:
+        hashed_password: bytes = await PasswordHandlingUtil.hash_password_in_executor(
+            password=password
+        )
         return hashed_password
 
     async def get_user(self, username: str) -> UserSchema:
-        user = await self.repository.get_user(username=username)
+        user = await self.loader.load(username)
+        if user is None:
+            raise DoesNotExistError(
+                message=f"User with username: {username} does not exist",
+                class_name=self.__class__.__name__,
+                method_name=self.get_user.__name__,
+            )
         return user
 
     async def list_users(
@@ -188,8 +296,10 @@ class UserServices:
         is_active: bool = None,
         limit: int | None = None,
         offset: int | None = None,
-    ) -> list[UserSchema]:
-        users_dto = await self.repository.list_users(
+        cursor: str | None = None,
+        count: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> PageSchema[UserSchema]:
+        users_page_dto = await self.repository.list_users(
             usernames=usernames,
             names=names,
             emails=emails,
@@ -198,9 +308,37 @@ class UserServices:
             is_active=is_active,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count=count,
         )
 
-        return users_dto
+        return users_page_dto
+
+    def export_users(
+        self,
+        format: DataFormatEnum,
+        usernames: list[str] | None = None,
+        names: list[str] | None = None,
+        emails: list[str] | None = None,
+        is_superuser: bool = None,
+        is_staff: bool = None,
+        is_active: bool = None,
+    ) -> AsyncIterator[str]:
+        """
+        Returns lazy stream of filtered users serialized to format
+        """
+        return stream_rows(
+            partitions=self.repository.stream_users(
+                usernames=usernames,
+                names=names,
+                emails=emails,
+                is_superuser=is_superuser,
+                is_staff=is_staff,
+                is_active=is_active,
+            ),
+            columns=USERS_EXPORT_COLUMNS,
+            format=format,
+        )
 
     async def create_user(
         self,
@@ -222,7 +360,7 @@ class UserServices:
                 method_name=self.create_user.__name__,
             )
 
-        hashed_password = self._hash_user_password(password=password)
+        hashed_password = await self._hash_user_password(password=password)
         data.password = hashed_password
 
         user_dto = await self.repository.create_user(data=data)
@@ -237,10 +375,10 @@ class UserServices:
         if (
             data.is_staff is not None
             or data.is_active is not None
-            or data.is_supeuser is not None
+            or data.is_superuser is not None
         ):
             raise UnprocessableEntityError(
-                message="is_staff/is_active/is_supeuser field can't be updated by this method. Please use appropriate \
+                message="is_staff/is_active/is_superuser field can't be updated by this method. Please use appropriate \
                 method to update this data",
                 class_name=self.__class__.__name__,
                 method_name=self.update_user.__name__,
@@ -261,6 +399,8 @@ class UserServices:
             )
 
         user_dto = await self.repository.update_user(data=data)
+        # Status fields are rejected above, auth status cache stays valid
+        self.loader.clear(data.username)
         return user_dto
 
     async def update_user_password(
@@ -277,14 +417,16 @@ class UserServices:
             username=username
         )
 
-        current_password_is_valid = PasswordHandlingUtil.validate_password(
-            password=data.current_password,
-            hashed_password=hashed_current_password,
+        current_password_is_valid = (
+            await PasswordHandlingUtil.validate_password_in_executor(
+                password=data.current_password,
+                hashed_password=hashed_current_password,
+            )
         )
         if not current_password_is_valid:
             raise InvalidPasswordError()
 
-        hashed_password = self._hash_user_password(password=data.new_password)
+        hashed_password = await self._hash_user_password(password=data.new_password)
 
         await self.repository.update_user_password(
             username=username,
@@ -295,9 +437,154 @@ class UserServices:
         self,
         username: int,
     ) -> None:
-        await self.repository.delete_user(username=username)
+        def forget_deleted_user() -> None:
+            self.auth_status_cache.invalidate(username)
+            # Repository has revoked user's tokens
+            self.token_revocation_list.revoke(username)
+
+        await self.repository.delete_user(
+            username=username, after_commit=forget_deleted_user
+        )
+        # Loader memoizes for current request only
+        self.loader.clear(username)
+
+    async def import_users(
+        self,
+        rows: AsyncIterable[tuple[int, dict | None, str | None]],
+        batch_size: int = USERS_IMPORT_BATCH_SIZE,
+    ) -> UsersImportResultSchema:
+        """
+        Imports stream of (line, row, parse error) in batches.
+        Passwords are hashed by shared password hashing executor,
+        rows are loaded with COPY and committed batch by batch.
+        Invalid and conflicting rows are skipped and reported.
+        If a batch fails, import stops and reports committed batches
+        with the first line of the failed one
+        """
+        result = UsersImportResultSchema()
+
+        batch = []
+        try:
+            async for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    await self._import_users_batch(batch=batch, result=result)
+                    batch = []
+            if batch:
+                await self._import_users_batch(batch=batch, result=result)
+        except Exception as error:
+            if isinstance(error, ExceptionGroup):
+                error = error.exceptions[0]
+            logger.error(f"Users import has stopped: {error}")
+
+            result.stopped_at_line = batch[0][0] if batch else None
+            result.stop_error = str(error)
+            if result.stopped_at_line is not None:
+                result.errors = [
+                    import_error
+                    for import_error in result.errors
+                    if import_error.line < result.stopped_at_line
+                ]
+
+        return result
+
+    async def _import_users_batch(
+        self,
+        batch: list[tuple[int, dict | None, str | None]],
+        result: UsersImportResultSchema,
+    ) -> None:
+        users: dict[str, tuple[int, ImportUserSchema]] = {}
+        for line, row, error in batch:
+            if error is not None:
+                result.errors.append(UserImportErrorSchema(line=line, error=error))
+                continue
+
+            username = row.get("username")
+            if not isinstance(username, str):
+                username = None
+            try:
+                user = ImportUserSchema.model_validate(row)
+            except PydanticValidationError as validation_error:
+                result.errors.append(
+                    UserImportErrorSchema(
+                        line=line,
+                        username=username,
+                        error="; ".join(
+                            " ".join(
+                                (".".join(map(str, error["loc"])), error["msg"])
+                            ).strip()
+                            for error in validation_error.errors()
+                        ),
+                    )
+                )
+                continue
+
+            if user.username in users:
+                result.errors.append(
+                    UserImportErrorSchema(
+                        line=line,
+                        username=username,
+                        error="Username is duplicated in import",
+                    )
+                )
+                continue
+            users[user.username] = (line, user)
+
+        if len(users) == 0:
+            return
+
+        hashed_passwords = iter(
+            await PasswordHandlingUtil.hash_passwords_in_executor(
+                passwords=[
+                    user.password
+                    for _, user in users.values()
+                    if user.password is not None
+                ],
+            )
+        )
+        records = [
+            (
+                line,
+                user.username,
+                user.email,
+                (
+                    next(hashed_passwords)
+                    if user.password is not None
+                    else user.password_hash.encode()
+                ),
+                user.name,
+                user.phone_number,
+                user.about,
+                user.is_staff,
+                user.is_active,
+                user.is_superuser,
+            )
+            for line, user in users.values()
+        ]
+
+        inserted_lines = await self.repository.import_users(records=records)
+
+        result.imported += len(inserted_lines)
+        for line, user in users.values():
+            if line not in inserted_lines:
+                result.errors.append(
+                    UserImportErrorSchema(
+                        line=line,
+                        username=user.username,
+                        error="User with this username or email already exists",
+                    )
+                )
 
 
 auth_user_services = AuthUserServices(repository=user_repository)
-verify_user_services = VerifyUserServices(repository=user_auth_repository)
-user_services = UserServices(repository=user_repository)
+verify_user_services = VerifyUserServices(
+    repository=user_auth_repository,
+    auth_status_cache=auth_status_cache,
+    token_revocation_list=token_revocation_list,
+)
+user_services = UserServices(
+    repository=user_repository,
+    loader=user_loader,
+    auth_status_cache=auth_status_cache,
+    token_revocation_list=token_revocation_list,
+)
@@ -0,0 +1,35 @@
+from asyncio import sleep
+from logging import getLogger
+from time import time
+
+from config import settings
+
+from files.apps.user.caches import TokenRevocationList, token_revocation_list
+from files.apps.user.repository import (
+    TokenRevocationRepository,
+    token_revocation_repository,
+)
+
+
+logger = getLogger("common.base_logger")
+
+
+async def refresh_token_revocations_periodically(
+    repository: TokenRevocationRepository = token_revocation_repository,
+    revocation_list: TokenRevocationList = token_revocation_list,
+) -> None:
+    """
+    Reloads revocations of access tokens at start and then every
+    TOKEN_REVOCATIONS_REFRESH_INTERVAL seconds. Runs till cancelled
+    """
+    while True:
+        try:
+            loaded_since = int(time())
+            revocations = await repository.get_revocations()
+            revocation_list.replace(
+                revoked_before=revocations, loaded_since=loaded_since
+            )
+        except Exception as error:
+            logger.error(f"Can't refresh token revocations: {error}")
+
+        await sleep(settings.TOKEN_REVOCATIONS_REFRESH_INTERVAL)
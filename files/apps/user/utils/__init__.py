@@ -1,6 +1,7 @@
 __all__ = (
     "jwt_actions_util",
     "PasswordHandlingUtil",
+    "password_hashing_executor",
     "JWTCreatorUtil",
     "check_string_is_not_empty",
     "generate_image_url",
@@ -8,10 +9,12 @@ __all__ = (
     "generate_uuid_using_uuid_and_time",
     "save_base64_image_to_fs",
     "convert_query_result_to_dto",
+    "iter_csv_rows",
+    "iter_ndjson_rows",
 )
 
 from .jwt_actions_util import jwt_actions_util
-from .password_handling_util import PasswordHandlingUtil
+from .password_handling_util import PasswordHandlingUtil, password_hashing_executor
 from .jwt_creator_util import JWTCreatorUtil
 from .check_string_is_not_empty import check_string_is_not_empty
 from .generate_image_url import generate_image_url
@@ -19,3 +22,7 @@ from .generate_image_uuid_name import generate_image_uuid_name
 from .generate_uuid_using_timestamp import generate_uuid_using_uuid_and_time
 from .save_base64_image_to_fs import save_base64_image_to_fs
 from .convert_query_result_to_dto import convert_query_result_to_dto
+from .users_import_util import (
+    iter_csv_rows,
+    iter_ndjson_rows,
+)
@@ -1,20 +1,218 @@
+from dataclasses import dataclass
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+from time import monotonic, time
+
 import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+
 from config import settings
+from common import TTLCache
 
+from files.apps.user.caches import verified_tokens_cache
+
+
+logger = getLogger("common.base_logger")
+
+PRIVATE_KEY_SUFFIX = "-private.pem"
+PUBLIC_KEY_SUFFIX = "-public.pem"
+# Rescans of unknown kid are rate limited, so tokens with made up kid
+# can't make every request read keys directory
+UNKNOWN_KEY_RELOAD_INTERVAL = 1
+
+EC_CURVES_ALGORITHMS = {
+    "secp256r1": "ES256",
+    "secp384r1": "ES384",
+    "secp521r1": "ES512",
+}
+ALGORITHMS_JWK_CONVERTERS = {
+    "RS256": RSAAlgorithm,
+    "ES256": ECAlgorithm,
+    "ES384": ECAlgorithm,
+    "ES512": ECAlgorithm,
+    "EdDSA": OKPAlgorithm,
+}
+
+
+def get_key_algorithm(public_key) -> str:
+    """
+    Returns JWT algorithm of key's type. Every key verifies only
+    tokens of its algorithm, so RS256 and EdDSA/ES256 keys can be
+    in the ring at the same time
+    """
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        algorithm = EC_CURVES_ALGORITHMS.get(public_key.curve.name)
+        if algorithm is not None:
+            return algorithm
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+
+    raise ValueError(f"Unsupported JWT key type: {type(public_key).__name__}")
+
+
+@dataclass
+class JWTKey:
+    kid: str
+    algorithm: str
+    public_key: object
+    # None if only public key is published (retiring key of other instance)
+    private_key: object | None
+    modified_at: float
+
+
+class JWTKeyRing:
+    """
+    Parsed keys of keys_dir by kid: "<kid>-public.pem" verifies tokens
+    with the kid, "<kid>-private.pem" lets sign with it. Key's algorithm
+    follows from its type (RSA, EC or Ed25519). Tokens are signed with
+    signing_kid or, if it is None, newest private key of algorithm.
+    Directory is rescanned at most every reload_interval seconds and
+    on unknown kid, so keys are added and retired without restart
+    """
 
-class JWTActionsUtil:
     def __init__(
         self,
-        private_key: str,
-        public_key: str,
+        keys_dir: Path,
         algorithm: str,
+        signing_kid: str | None = None,
+        reload_interval: float = 30,
     ):
-        self.private_key = private_key
+        self.keys_dir = keys_dir
         self.algorithm = algorithm
-        self.public_key = public_key
+        self.signing_kid = signing_kid
+        self.reload_interval = reload_interval
+
+        self.keys: dict[str, JWTKey] = {}
+        self.jwks: dict = {"keys": []}
+        self._files_modified_at: dict[Path, float] = {}
+        self._loaded_at: float | None = None
+
+    def reload(self) -> None:
+        """
+        Parses keys if any key file is added, changed or removed.
+        Key which can't be parsed (e.g. is being written) keeps
+        its previous version
+        """
+        files_modified_at = {
+            path: path.stat().st_mtime for path in self.keys_dir.glob("*.pem")
+        }
+        self._loaded_at = monotonic()
+        if files_modified_at == self._files_modified_at:
+            return
+
+        keys = {}
+        for public_key_path in sorted(self.keys_dir.glob(f"*{PUBLIC_KEY_SUFFIX}")):
+            kid = public_key_path.name.removesuffix(PUBLIC_KEY_SUFFIX)
+            private_key_path = self.keys_dir / f"{kid}{PRIVATE_KEY_SUFFIX}"
+            try:
+                public_key = load_pem_public_key(public_key_path.read_bytes())
+                algorithm = get_key_algorithm(public_key=public_key)
+                private_key = None
+                if private_key_path.exists():
+                    private_key = load_pem_private_key(
+                        private_key_path.read_bytes(), password=None
+                    )
+            except (OSError, ValueError) as error:
+                logger.error(f"Can't load JWT key {kid}: {error}")
+                if kid in self.keys:
+                    keys[kid] = self.keys[kid]
+                continue
+
+            keys[kid] = JWTKey(
+                kid=kid,
+                algorithm=algorithm,
+                public_key=public_key,
+                private_key=private_key,
+                modified_at=files_modified_at.get(
+                    private_key_path, files_modified_at[public_key_path]
+                ),
+            )
+
+        self.keys = keys
+        self.jwks = {"keys": [self._to_jwk(key=key) for key in keys.values()]}
+        self._files_modified_at = files_modified_at
+
+    def _reload_if_outdated(self, interval: float) -> None:
+        if self._loaded_at is None or monotonic() - self._loaded_at >= interval:
+            self.reload()
+
+    def _to_jwk(self, key: JWTKey) -> dict:
+        jwk = ALGORITHMS_JWK_CONVERTERS[key.algorithm].to_jwk(
+            key.public_key, as_dict=True
+        )
+        jwk.update(kid=key.kid, use="sig", alg=key.algorithm)
+
+        return jwk
+
+    def get_signing_key(self) -> JWTKey:
+        self._reload_if_outdated(interval=self.reload_interval)
+
+        if self.signing_kid is not None:
+            key = self.keys.get(self.signing_kid)
+        else:
+            signing_keys = [
+                key
+                for key in self.keys.values()
+                if key.private_key is not None and key.algorithm == self.algorithm
+            ]
+            key = max(signing_keys, key=lambda key: key.modified_at, default=None)
+
+        if key is None or key.private_key is None:
+            raise RuntimeError(
+                f"No {self.algorithm} JWT signing key in {self.keys_dir}"
+            )
+
+        return key
+
+    def get_verification_key(self, kid: str) -> JWTKey | None:
+        self._reload_if_outdated(interval=self.reload_interval)
+
+        key = self.keys.get(kid)
+        if key is None:
+            self._reload_if_outdated(interval=UNKNOWN_KEY_RELOAD_INTERVAL)
+            key = self.keys.get(kid)
+
+        return key
+
+    def get_verification_keys(self) -> list[JWTKey]:
+        self._reload_if_outdated(interval=self.reload_interval)
+
+        return list(self.keys.values())
+
+    def get_jwks(self) -> dict:
+        """
+        Returns public keys as JWK set, built once per keys reload
+        """
+        self._reload_if_outdated(interval=self.reload_interval)
+
+        return self.jwks
+
+
+class JWTActionsUtil:
+    def __init__(
+        self,
+        key_ring: JWTKeyRing,
+        verified_tokens_cache: TTLCache[bytes, tuple[dict, str]] | None = None,
+    ):
+        self.key_ring = key_ring
+        self.verified_tokens_cache = verified_tokens_cache
 
     def encode_jwt(self, payload: dict):
-        encoded = jwt.encode(payload, self.private_key, algorithm=self.algorithm)
+        key = self.key_ring.get_signing_key()
+        encoded = jwt.encode(
+            payload,
+            key.private_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+        )
 
         return encoded
 
@@ -22,19 +220,90 @@ class JWTActionsUtil:
         self,
         token: str | bytes,
     ) -> dict[str, str]:
-        decoded = jwt.decode(
-            token,
-            self.public_key,
-            algorithms=[
-                self.algorithm,
-            ],
+        """
+        Verifies token and returns its payload. Payloads of verified
+        tokens are cached till their exp, cached token is accepted
+        while it is not expired and its key is not retired
+        """
+        if self.verified_tokens_cache is None:
+            decoded, _ = self._verify_jwt(token=token)
+            return decoded
+
+        token_hash = sha256(
+            token.encode() if isinstance(token, str) else token
+        ).digest()
+        cached = self.verified_tokens_cache.get(token_hash)
+        if cached is not None:
+            decoded, kid = cached
+            # Same check as PyJWT's, cache ttl is measured by another clock
+            exp = decoded.get("exp")
+            if exp is not None and exp <= time():
+                self.verified_tokens_cache.invalidate(token_hash)
+                raise jwt.ExpiredSignatureError("Signature has expired")
+            if self.key_ring.get_verification_key(kid=kid) is not None:
+                return dict(decoded)
+
+            self.verified_tokens_cache.invalidate(token_hash)
+
+        decoded, kid = self._verify_jwt(token=token)
+        exp = decoded.get("exp")
+        self.verified_tokens_cache.set(
+            token_hash,
+            (decoded, kid),
+            ttl=exp - time() if exp is not None else None,
         )
 
-        return decoded
+        return dict(decoded)
+
+    def _verify_jwt(self, token: str | bytes) -> tuple[dict, str]:
+        """
+        Verifies token's signature and claims, returns
+        its payload and kid of the key which verified it
+        """
+        header = jwt.get_unverified_header(token)
+        kid = header.get("kid")
+        if kid is None:
+            # Tokens issued before key ring have no kid
+            keys = [
+                key
+                for key in self.key_ring.get_verification_keys()
+                if key.algorithm == header.get("alg")
+            ]
+        else:
+            key = self.key_ring.get_verification_key(kid=kid)
+            if key is None:
+                raise jwt.InvalidSignatureError(f"Unknown key id: {kid}")
+            if key.algorithm != header.get("alg"):
+                raise jwt.InvalidSignatureError(
+                    f"Algorithm {header.get('alg')} doesn't match key {kid}"
+                )
+            keys = [key]
+
+        error = jwt.InvalidSignatureError("No JWT verification keys")
+        for key in keys:
+            try:
+                decoded = jwt.decode(
+                    token,
+                    key.public_key,
+                    algorithms=[
+                        key.algorithm,
+                    ],
+                )
+            except jwt.InvalidSignatureError as key_error:
+                error = key_error
+                continue
+
+            return decoded, key.kid
+
+        raise error
 
 
 jwt_actions_util = JWTActionsUtil(
-    private_key=settings.auth_jwt.PRIVATE_KEY_PATH.read_text(),
-    public_key=settings.auth_jwt.PUBLIC_KEY_PATH.read_text(),
-    algorithm=settings.auth_jwt.ALGORITHM,
+    key_ring=JWTKeyRing(
+        keys_dir=settings.auth_jwt.KEYS_DIR,
+        algorithm=settings.auth_jwt.ALGORITHM,
+        signing_kid=settings.auth_jwt.SIGNING_KEY_ID,
+        reload_interval=settings.auth_jwt.KEYS_RELOAD_INTERVAL,
+    ),
+    verified_tokens_cache=verified_tokens_cache,
 )
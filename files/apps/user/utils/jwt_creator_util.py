@@ -11,11 +11,15 @@ class JWTCreatorUtil:
         access_token_expire_time: int,
         refresh_token_expire_time: int,
         # is_admin: bool,
+        is_active: bool | None = None,
+        is_staff: bool | None = None,
     ):
         self.username = username
         self.access_token_expire_time = access_token_expire_time
         self.refresh_token_expire_time = refresh_token_expire_time
         # self.is_admin = is_admin
+        self.is_active = is_active
+        self.is_staff = is_staff
 
     def create_access_token(self) -> bytes:
         timestamp = int(time())
@@ -25,6 +29,10 @@ class JWTCreatorUtil:
             "iat": timestamp,
             "exp": timestamp + self.access_token_expire_time,
         }
+        # Status claims let middleware skip db lookup
+        if settings.STATELESS_AUTH and self.is_active is not None:
+            payload["is_active"] = self.is_active
+            payload["is_staff"] = bool(self.is_staff)
 
         return jwt_actions_util.encode_jwt(payload)
 
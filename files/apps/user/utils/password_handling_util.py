@@ -1,5 +1,21 @@
+from asyncio import TaskGroup
+
 import bcrypt
 
+from config import settings
+from common import BoundedExecutor, ExecutorKindEnum, ExecutorIsSaturatedError
+
+from files.exceptions import ServiceIsOverloadedError
+
+
+# bcrypt takes hundreds of milliseconds per call, request handlers run it
+# here so that login bursts don't block event loop for other requests
+password_hashing_executor = BoundedExecutor(
+    kind=ExecutorKindEnum(settings.PASSWORD_HASHING_EXECUTOR),
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    max_queue_size=settings.PASSWORD_HASHING_QUEUE_SIZE,
+)
+
 
 class PasswordHandlingUtil:
     @classmethod
@@ -13,3 +29,55 @@ class PasswordHandlingUtil:
         return bcrypt.checkpw(
             password=password.encode("utf-8"), hashed_password=hashed_password
         )
+
+    @classmethod
+    async def hash_password_in_executor(cls, password: str) -> bytes:
+        try:
+            return await password_hashing_executor.run(cls.hash_password, password)
+        except ExecutorIsSaturatedError as error:
+            raise ServiceIsOverloadedError(
+                class_name=cls.__name__,
+                method_name=cls.hash_password_in_executor.__name__,
+                error_text=str(error),
+            )
+
+    @classmethod
+    async def validate_password_in_executor(
+        cls, password: str, hashed_password: bytes
+    ) -> bool:
+        try:
+            return await password_hashing_executor.run(
+                cls.validate_password, password, hashed_password
+            )
+        except ExecutorIsSaturatedError as error:
+            raise ServiceIsOverloadedError(
+                class_name=cls.__name__,
+                method_name=cls.validate_password_in_executor.__name__,
+                error_text=str(error),
+            )
+
+    @classmethod
+    async def hash_passwords_in_executor(cls, passwords: list[str]) -> list[bytes]:
+        """
+        Hashes passwords of bulk operation in order. Hashes wait for
+        a free worker instead of being rejected and take no queue slots,
+        so request handlers wait for one hash per worker at most.
+        If any hash fails, the others are cancelled
+        """
+        hashed_passwords: list[bytes | None] = [None] * len(passwords)
+        indexes = iter(range(len(passwords)))
+
+        async def hash_next_passwords() -> None:
+            for index in indexes:
+                hashed_passwords[index] = (
+                    await password_hashing_executor.run_when_worker_is_free(
+                        cls.hash_password, passwords[index]
+                    )
+                )
+
+        workers_count = min(password_hashing_executor.max_workers, len(passwords))
+        async with TaskGroup() as task_group:
+            for _ in range(workers_count):
+                task_group.create_task(hash_next_passwords())
+
+        return hashed_passwords
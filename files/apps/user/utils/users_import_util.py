@@ -0,0 +1,88 @@
+import csv
+from codecs import getincrementaldecoder
+from json import JSONDecodeError, loads
+from typing import AsyncIterable, AsyncIterator
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """
+    Splits stream of utf-8 byte chunks into lines
+    without reading whole stream into memory
+    """
+    decoder = getincrementaldecoder("utf-8")()
+    tail = ""
+    async for chunk in chunks:
+        tail += decoder.decode(chunk)
+        *lines, tail = tail.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail.rstrip("\r")
+
+
+async def iter_ndjson_rows(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """
+    Yields (line number, row, parse error) for every non-empty NDJSON line
+    """
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            row = loads(line)
+        except JSONDecodeError as error:
+            yield line_number, None, f"Invalid JSON: {error}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Row must be JSON object"
+            continue
+        yield line_number, row, None
+
+
+async def iter_csv_rows(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[tuple[int, dict | None, str | None]]:
+    """
+    Yields (line number, row, parse error) for every CSV record.
+    First record is header. Empty values are treated as missing
+    """
+    header = None
+    line_number = 0
+    record_line_number = 0
+    record = ""
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not record:
+            record_line_number = line_number
+            record = line
+        else:
+            record += "\n" + line
+        # Odd number of quotes means quoted value continues on next line
+        if record.count('"') % 2 == 1:
+            continue
+
+        current_record, record = record, ""
+        if not current_record.strip():
+            continue
+
+        values = next(csv.reader([current_record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_line_number, None, (
+                f"Expected {len(header)} values, got {len(values)}"
+            )
+            continue
+
+        yield record_line_number, {
+            name: value for name, value in zip(header, values) if value != ""
+        }, None
+
+    if record:
+        yield record_line_number, None, "Unterminated quoted value"
@@ -6,6 +6,7 @@ from files.apps import (
     subdivision_router,
     project_router,
     employee_router,
+    monitoring_router,
 )
 
 
@@ -16,3 +17,4 @@ api_v1_router.include_router(router=user_router)
 api_v1_router.include_router(router=subdivision_router)
 api_v1_router.include_router(router=project_router)
 api_v1_router.include_router(router=employee_router)
+api_v1_router.include_router(router=monitoring_router)
@@ -6,6 +6,8 @@ __all__ = (
     "IsNotActiveError",
     "ValidationError",
     "InvalidPasswordError",
+    "TokenHasBeenRevokedError",
+    "ServiceIsOverloadedError",
 )
 
 from .does_not_exist_exception import DoesNotExistError
@@ -15,3 +17,5 @@ from .unprocessable_entity_exception import UnprocessableEntityError
 from .user_is_not_active_exception import IsNotActiveError
 from .validation_exception import ValidationError
 from .password_not_valid_exception import InvalidPasswordError
+from .token_has_been_revoked_exception import TokenHasBeenRevokedError
+from .service_is_overloaded_exception import ServiceIsOverloadedError
@@ -1,4 +1,14 @@
 import os
+from argparse import ArgumentParser
+from datetime import datetime, UTC
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+
+KEYS_DIR = Path(__file__).parent / "config" / "certs"
+JWT_ALGORITHMS = ("RS256", "ES256", "EdDSA")
 
 
 def get_data():
@@ -25,6 +35,72 @@ def generate_env_file(data, filename=".env_local"):
     print(f"{filename} file has been created successfully.")
 
 
+def generate_jwt_private_key(algorithm: str):
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+
+    raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+
+
+def generate_jwt_keys(algorithm: str, kid: str, keys_dir: Path = KEYS_DIR):
+    """
+    Writes "<kid>-private.pem"/"<kid>-public.pem" pair of algorithm
+    to keys_dir. Private key is written first: key ring finds keys
+    by public key file
+    """
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    private_key_path = keys_dir / f"{kid}-private.pem"
+    public_key_path = keys_dir / f"{kid}-public.pem"
+    if private_key_path.exists() or public_key_path.exists():
+        raise FileExistsError(f"JWT key {kid} already exists in {keys_dir}")
+
+    private_key = generate_jwt_private_key(algorithm=algorithm)
+    private_key_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_key_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+    file_descriptor = os.open(
+        private_key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600
+    )
+    with os.fdopen(file_descriptor, "wb") as f:
+        f.write(private_key_pem)
+    public_key_path.write_bytes(public_key_pem)
+    print(f"{algorithm} JWT key {kid} has been created in {keys_dir}.")
+
+
 if __name__ == "__main__":
-    data = get_data()
-    generate_env_file(data)
+    parser = ArgumentParser(description="Generate env file and JWT keys")
+    parser.add_argument(
+        "--jwt-keys-only",
+        action="store_true",
+        help="Only add JWT key pair, e.g. to rotate keys or change algorithm",
+    )
+    parser.add_argument("--jwt-algorithm", choices=JWT_ALGORITHMS, default="RS256")
+    parser.add_argument(
+        "--kid",
+        default=None,
+        help='Key id, default is "<algorithm>-<UTC timestamp>"',
+    )
+    args = parser.parse_args()
+
+    if not args.jwt_keys_only:
+        data = get_data()
+        data["AUTH_JWT__ALGORITHM"] = args.jwt_algorithm
+        generate_env_file(data)
+
+    # Keys of existing setup are kept, new pair is added on demand
+    if args.jwt_keys_only or not any(KEYS_DIR.glob("*-public.pem")):
+        kid = args.kid or (
+            f"{args.jwt_algorithm.lower()}-{datetime.now(UTC):%Y%m%d%H%M%S}"
+        )
+        generate_jwt_keys(algorithm=args.jwt_algorithm, kid=kid)
@@ -0,0 +1,60 @@
+from argparse import ArgumentParser
+from asyncio import run
+from json import dumps
+from logging import getLogger
+from time import perf_counter
+
+import aiofiles
+
+from common import DataFormatEnum
+from files.apps.user.services import user_services
+from files.apps.user.utils import iter_csv_rows, iter_ndjson_rows
+
+
+logger = getLogger("logger")
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+async def read_file_chunks(path: str):
+    async with aiofiles.open(path, "rb") as file:
+        while chunk := await file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def import_users(path: str, format: DataFormatEnum, errors_path: str):
+    iter_rows = iter_csv_rows if format == DataFormatEnum.CSV else iter_ndjson_rows
+
+    started_at = perf_counter()
+    result = await user_services.import_users(rows=iter_rows(read_file_chunks(path)))
+
+    async with aiofiles.open(errors_path, "w") as errors_file:
+        for error in result.errors:
+            await errors_file.write(dumps(error.model_dump()) + "\n")
+
+    print(
+        f"Imported {result.imported} users, skipped {len(result.errors)} rows "
+        f"in {perf_counter() - started_at:.1f}s. Errors are written to {errors_path}"
+    )
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Bulk import users from CSV or NDJSON file")
+    parser.add_argument("path")
+    parser.add_argument(
+        "--format",
+        type=DataFormatEnum,
+        choices=list(DataFormatEnum),
+        default=None,
+        help="Defaults to file extension",
+    )
+    parser.add_argument("--errors", default="import_users_errors.ndjson")
+    args = parser.parse_args()
+
+    format = args.format or (
+        DataFormatEnum.CSV
+        if args.path.endswith(".csv")
+        else DataFormatEnum.NDJSON
+    )
+
+    run(import_users(path=args.path, format=format, errors_path=args.errors))
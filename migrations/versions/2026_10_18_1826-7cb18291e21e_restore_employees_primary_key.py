@@ -0,0 +1,39 @@
+"""restore employees primary key
+
+Revision ID: 7cb18291e21e
+Revises: 4c24f65f3ae7
+Create Date: 2026-10-18 18:26:30.830819
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7cb18291e21e'
+down_revision: Union[str, Sequence[str], None] = '4c24f65f3ae7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Previous revision dropped employees primary key, remove duplicated
+    # pairs before restoring it (ON CONFLICT relies on it)
+    op.execute(
+        """
+        DELETE FROM employees a
+        USING employees b
+        WHERE a.ctid < b.ctid
+          AND a."user" = b."user"
+          AND a.subdivision = b.subdivision
+        """
+    )
+    op.create_primary_key("employees_pkey", "employees", ["user", "subdivision"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("employees_pkey", "employees", type_="primary")
@@ -0,0 +1,81 @@
+"""add indexes for list filters and joins
+
+Revision ID: 4350f7493d03
+Revises: 7cb18291e21e
+Create Date: 2026-10-18 18:32:07.249169
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4350f7493d03'
+down_revision: Union[str, Sequence[str], None] = '7cb18291e21e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns), matched to repositories' filters and orderings
+INDEXES = (
+    # list_projects: subdivision filter, optional completed filter, project_id order
+    ("ix_projects_subdivision_id_project_id", "projects", ["subdivision_id", "project_id"]),
+    (
+        "ix_projects_subdivision_id_completed_project_id",
+        "projects",
+        ["subdivision_id", "completed", "project_id"],
+    ),
+    # list_employees and roster sync; primary key (user, subdivision) serves user side
+    ("ix_employees_subdivision_user", "employees", ["subdivision", "user"]),
+    # list_subdivisions filters, department filter ordered by subdivision_id
+    ("ix_subdivisions_name", "subdivisions", ["name"]),
+    (
+        "ix_subdivisions_department_subdivision_id",
+        "subdivisions",
+        ["department", "subdivision_id"],
+    ),
+    # list_users names filter
+    ("ix_users_name", "users", ["name"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can't run inside transaction and doesn't block writes
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        # Duplicates users_pkey
+        op.drop_index(
+            "ix_users_username",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_username",
+            "users",
+            ["username"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for index_name, table_name, _ in reversed(INDEXES):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,71 @@
+"""add department summary view
+
+Revision ID: c0ab6970a077
+Revises: 4350f7493d03
+Create Date: 2026-10-18 18:43:12.408153
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0ab6970a077'
+down_revision: Union[str, Sequence[str], None] = '4350f7493d03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Subdivisions, employees and projects are aggregated by department
+# separately, so counts are not multiplied by each other.
+# refreshed_at is evaluated on every refresh
+DEPARTMENT_SUMMARY_QUERY = """
+SELECT
+    subdivisions_stats.department,
+    subdivisions_stats.subdivisions_count,
+    coalesce(employees_stats.headcount, 0) AS headcount,
+    coalesce(projects_stats.projects_count, 0) AS projects_count,
+    coalesce(projects_stats.completed_projects_count, 0) AS completed_projects_count,
+    now() AS refreshed_at
+FROM (
+    SELECT department, count(*) AS subdivisions_count
+    FROM subdivisions
+    GROUP BY department
+) AS subdivisions_stats
+LEFT JOIN (
+    SELECT subdivisions.department, count(DISTINCT employees."user") AS headcount
+    FROM employees
+    JOIN subdivisions ON subdivisions.subdivision_id = employees.subdivision
+    GROUP BY subdivisions.department
+) AS employees_stats USING (department)
+LEFT JOIN (
+    SELECT
+        subdivisions.department,
+        count(*) AS projects_count,
+        count(*) FILTER (WHERE projects.completed) AS completed_projects_count
+    FROM projects
+    JOIN subdivisions ON subdivisions.subdivision_id = projects.subdivision_id
+    GROUP BY subdivisions.department
+) AS projects_stats USING (department)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        f"CREATE MATERIALIZED VIEW department_summary AS {DEPARTMENT_SUMMARY_QUERY}"
+    )
+    # REFRESH ... CONCURRENTLY requires unique index
+    op.create_index(
+        "ux_department_summary_department",
+        "department_summary",
+        ["department"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS department_summary")
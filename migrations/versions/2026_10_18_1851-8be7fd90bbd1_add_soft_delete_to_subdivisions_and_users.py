@@ -0,0 +1,142 @@
+"""add soft delete to subdivisions and users
+
+Revision ID: 8be7fd90bbd1
+Revises: c0ab6970a077
+Create Date: 2026-10-18 18:51:40.118264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8be7fd90bbd1'
+down_revision: Union[str, Sequence[str], None] = 'c0ab6970a077'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Soft deleted subdivisions and users are excluded from summary
+DEPARTMENT_SUMMARY_QUERY = """
+SELECT
+    subdivisions_stats.department,
+    subdivisions_stats.subdivisions_count,
+    coalesce(employees_stats.headcount, 0) AS headcount,
+    coalesce(projects_stats.projects_count, 0) AS projects_count,
+    coalesce(projects_stats.completed_projects_count, 0) AS completed_projects_count,
+    now() AS refreshed_at
+FROM (
+    SELECT department, count(*) AS subdivisions_count
+    FROM subdivisions
+    WHERE deleted_at IS NULL
+    GROUP BY department
+) AS subdivisions_stats
+LEFT JOIN (
+    SELECT subdivisions.department, count(DISTINCT employees."user") AS headcount
+    FROM employees
+    JOIN subdivisions ON subdivisions.subdivision_id = employees.subdivision
+    JOIN users ON users.username = employees."user"
+    WHERE subdivisions.deleted_at IS NULL AND users.deleted_at IS NULL
+    GROUP BY subdivisions.department
+) AS employees_stats USING (department)
+LEFT JOIN (
+    SELECT
+        subdivisions.department,
+        count(*) AS projects_count,
+        count(*) FILTER (WHERE projects.completed) AS completed_projects_count
+    FROM projects
+    JOIN subdivisions ON subdivisions.subdivision_id = projects.subdivision_id
+    WHERE subdivisions.deleted_at IS NULL
+    GROUP BY subdivisions.department
+) AS projects_stats USING (department)
+"""
+
+PREVIOUS_DEPARTMENT_SUMMARY_QUERY = """
+SELECT
+    subdivisions_stats.department,
+    subdivisions_stats.subdivisions_count,
+    coalesce(employees_stats.headcount, 0) AS headcount,
+    coalesce(projects_stats.projects_count, 0) AS projects_count,
+    coalesce(projects_stats.completed_projects_count, 0) AS completed_projects_count,
+    now() AS refreshed_at
+FROM (
+    SELECT department, count(*) AS subdivisions_count
+    FROM subdivisions
+    GROUP BY department
+) AS subdivisions_stats
+LEFT JOIN (
+    SELECT subdivisions.department, count(DISTINCT employees."user") AS headcount
+    FROM employees
+    JOIN subdivisions ON subdivisions.subdivision_id = employees.subdivision
+    GROUP BY subdivisions.department
+) AS employees_stats USING (department)
+LEFT JOIN (
+    SELECT
+        subdivisions.department,
+        count(*) AS projects_count,
+        count(*) FILTER (WHERE projects.completed) AS completed_projects_count
+    FROM projects
+    JOIN subdivisions ON subdivisions.subdivision_id = projects.subdivision_id
+    GROUP BY subdivisions.department
+) AS projects_stats USING (department)
+"""
+
+
+def recreate_department_summary(query: str) -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS department_summary")
+    op.execute(f"CREATE MATERIALIZED VIEW department_summary AS {query}")
+    op.create_index(
+        "ux_department_summary_department",
+        "department_summary",
+        ["department"],
+        unique=True,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable columns without default don't rewrite tables
+    op.add_column(
+        "subdivisions",
+        sa.Column("deleted_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "users",
+        sa.Column("deleted_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    recreate_department_summary(DEPARTMENT_SUMMARY_QUERY)
+
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ("ix_subdivisions_deleted_at", "subdivisions"),
+            ("ix_users_deleted_at", "users"),
+        ):
+            op.create_index(
+                index_name,
+                table_name,
+                ["deleted_at"],
+                postgresql_where=sa.text("deleted_at IS NOT NULL"),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, table_name in (
+            ("ix_users_deleted_at", "users"),
+            ("ix_subdivisions_deleted_at", "subdivisions"),
+        ):
+            op.drop_index(
+                index_name,
+                table_name=table_name,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    recreate_department_summary(PREVIOUS_DEPARTMENT_SUMMARY_QUERY)
+    op.drop_column("users", "deleted_at")
+    op.drop_column("subdivisions", "deleted_at")
@@ -0,0 +1,38 @@
+"""add token revocations
+
+Revision ID: 3f1d6c2b9a47
+Revises: 8be7fd90bbd1
+Create Date: 2026-10-18 19:20:05.512036
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1d6c2b9a47'
+down_revision: Union[str, Sequence[str], None] = '8be7fd90bbd1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "token_revocations",
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column(
+            "revoked_before",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("username"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("token_revocations")
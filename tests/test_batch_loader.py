@@ -0,0 +1,77 @@
+import asyncio
+
+from common.utils.batch_loader import (
+    BatchLoader,
+    BatchLoaderScope,
+    request_batch_loader_scope,
+)
+
+
+class CountingLoader(BatchLoader[int, str]):
+    def __init__(self):
+        self.batches: list[list[int]] = []
+
+    async def batch_load(self, keys: list[int]) -> dict[int, str]:
+        self.batches.append(keys)
+        return {key: f"value {key} of batch {len(self.batches)}" for key in keys}
+
+
+async def run_in_request(coroutine_function):
+    context_token = request_batch_loader_scope.set(BatchLoaderScope())
+    try:
+        return await coroutine_function()
+    finally:
+        request_batch_loader_scope.reset(context_token)
+
+
+def test_concurrent_loads_are_batched_into_one_batch_load():
+    loader = CountingLoader()
+
+    async def load_concurrently():
+        return await asyncio.gather(
+            loader.load(1), loader.load(2), loader.load(1), loader.load(3)
+        )
+
+    values = asyncio.run(run_in_request(load_concurrently))
+
+    assert loader.batches == [[1, 2, 3]]
+    assert values == [
+        "value 1 of batch 1",
+        "value 2 of batch 1",
+        "value 1 of batch 1",
+        "value 3 of batch 1",
+    ]
+
+
+def test_loaded_value_is_memoized_till_clear():
+    loader = CountingLoader()
+
+    async def load_clear_and_reload():
+        first = await loader.load(1)
+        memoized = await loader.load(1)
+        loader.clear(1)
+        reloaded = await loader.load(1)
+        return first, memoized, reloaded
+
+    first, memoized, reloaded = asyncio.run(run_in_request(load_clear_and_reload))
+
+    assert loader.batches == [[1], [1]]
+    assert first == memoized == "value 1 of batch 1"
+    assert reloaded == "value 1 of batch 2"
+
+
+def test_clear_drops_pending_key():
+    loader = CountingLoader()
+
+    async def clear_while_pending():
+        pending_load = asyncio.ensure_future(loader.load(1))
+        # Let load register key, batch isn't dispatched yet
+        await asyncio.sleep(0)
+        loader.clear(1)
+        return await pending_load, await loader.load(1)
+
+    pending, reloaded = asyncio.run(run_in_request(clear_while_pending))
+
+    assert pending == "value 1 of batch 1"
+    assert reloaded == "value 1 of batch 2"
+    assert loader.batches == [[1], [1]]